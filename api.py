@@ -0,0 +1,322 @@
+"""
+Local HTTP API for the financial model.
+
+    python api.py [--host 127.0.0.1] [--port 8600]
+
+Serves the same numbers as the dashboard: unit cost, monthly P&L, cost
+ratios, break-even, and runway/payback from the month-by-month projection
+(ramp-up, seasonality and escalations at the sidebar defaults unless a
+request overrides them). Endpoints:
+
+    GET  /v1/schema     input defaults and bounds, metric names
+    POST /v1/scenario   {"inputs": {"cups": 150, ...}, "mtype": "Oat", "projection": {...}}
+    POST /v1/batch      {"scenarios": [{...}, ...]} or {"columns": {"cups": [...], ...}},
+                        with optional "mtype" and "projection" as above
+
+Inputs are keyed as model.DEFAULTS; missing keys take their default and
+values outside model.BOUNDS (the sidebar's limits) are rejected with 400.
+"projection" may set months and any monthly_factors() argument, or be null
+for steady-state runway/payback. Non-finite results (infinite runway,
+break-even when price does not cover unit cost) are returned as null.
+
+A batch is evaluated in one vectorized call, off the event loop. The
+server is plain asyncio with HTTP/1.1 keep-alive, so spreadsheet and
+script clients can reuse one connection for many requests.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import sys
+from functools import partial
+
+import numpy as np
+
+import model
+import projection
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+MAX_BODY = 64 * 2**20
+MAX_BATCH = 100_000
+KEEPALIVE_TIMEOUT = 30.0
+
+# Allowed projection settings, as fractions like monthly_factors() takes them
+PROJECTION_BOUNDS = {
+    'months': (1, 120), 'ramp_months': (0, 24), 'ramp_start': (0.10, 1.00), 'start_month': (1, 12),
+    'rent_escalation': (0.0, 0.10), 'wage_growth': (0.0, 0.15), 'cogs_inflation': (0.0, 0.15),
+}
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+            411: 'Length Required', 413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+class RequestError(ValueError):
+    """A request the API rejects with status 400."""
+
+
+def _dumps(obj):
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode()
+
+
+def _loads(body):
+    try:
+        return orjson.loads(body) if orjson is not None else json.loads(body)
+    except ValueError as e:
+        raise RequestError(f"Body is not valid JSON: {e}") from None
+
+
+def _check(name, values, bounds, n=None):
+    """`values` as a float array within `bounds`, else RequestError naming the first bad entry."""
+    try:
+        arr = np.asarray(values, dtype=float)
+    except (TypeError, ValueError):
+        raise RequestError(f"{name}: expected numbers") from None
+    if arr.ndim > 1 or (n is not None and arr.ndim == 1 and len(arr) != n):
+        raise RequestError(f"{name}: expected a number or a list of {n} numbers")
+    lo, hi = bounds
+    bad = ~np.isfinite(arr) | (arr < lo) | (arr > hi)
+    whole = isinstance(lo, int) and isinstance(hi, int)
+    if whole:
+        bad |= arr != np.round(arr)
+    if bad.any():
+        i = int(np.argmax(bad)) if arr.ndim else None
+        where = f"[{i}]" if i is not None else ""
+        value = arr[i] if i is not None else arr
+        kind = "a whole number" if whole else "a number"
+        raise RequestError(f"{name}{where} = {value.item()!r} must be {kind} between {lo} and {hi}")
+    # Whole-number inputs stay integers, as the sidebar passes them to the model
+    return arr.astype(np.int64) if whole else arr
+
+
+def _milk_type(mtype, n=None):
+    arr = np.asarray(mtype if mtype is not None else 'Dairy')
+    if arr.ndim > 1 or (n is not None and arr.ndim == 1 and len(arr) != n):
+        raise RequestError(f"mtype: expected 'Dairy', 'Oat' or a list of {n} of them")
+    ok = (arr == 'Dairy') | (arr == 'Oat')
+    if not np.all(ok):
+        raise RequestError("mtype must be 'Dairy' or 'Oat'")
+    return arr
+
+
+def parse_inputs(values, mtype=None, n=None):
+    """Validate DEFAULTS-keyed scalars or length-`n` lists and resolve them to model inputs."""
+    if not isinstance(values, dict):
+        raise RequestError("inputs: expected an object")
+    unknown = set(values) - set(model.DEFAULTS)
+    if unknown:
+        raise RequestError(f"Unknown inputs: {', '.join(sorted(unknown))}")
+    checked = {k: _check(k, v, model.BOUNDS[k], n) for k, v in values.items()}
+    return model.resolve_inputs(checked, _milk_type(mtype, n))
+
+
+def parse_projection(spec):
+    """monthly_factors() arguments and horizon from a request's "projection" (None: steady state)."""
+    if spec is None:
+        return None
+    if not isinstance(spec, dict):
+        raise RequestError("projection: expected an object or null")
+    spec = dict(spec)
+    seasonal = spec.pop('seasonal', True)
+    if not isinstance(seasonal, bool):
+        raise RequestError("projection.seasonal must be true or false")
+    unknown = set(spec) - set(PROJECTION_BOUNDS)
+    if unknown:
+        raise RequestError(f"Unknown projection settings: {', '.join(sorted(unknown))}")
+    out = {k: _check(f"projection.{k}", v, PROJECTION_BOUNDS[k]).item() for k, v in spec.items()}
+    for k in ('months', 'ramp_months', 'start_month'):
+        if k in out:
+            out[k] = int(out[k])
+    out['seasonality'] = projection.SEASONALITY if seasonal else None
+    return out
+
+
+def evaluate(inputs, assumptions):
+    """Model metrics, with runway/payback from the projection when `assumptions` is given."""
+    res = model.evaluate(**inputs)
+    if assumptions is not None:
+        assumptions = dict(assumptions)
+        proj = projection.project(inputs, assumptions.pop('months', 60), base=res, **assumptions)
+        shape = np.shape(res['cash'])
+        res['runway'] = np.broadcast_to(proj['runway'], shape)
+        res['payback'] = np.broadcast_to(proj['payback'], shape)
+    return res
+
+
+def _finite_or_none(x):
+    return x if math.isfinite(x) else None
+
+
+def _column(arr):
+    values = np.asarray(arr).tolist()
+    if np.issubdtype(np.asarray(arr).dtype, np.floating) and not np.isfinite(arr).all():
+        values = [_finite_or_none(v) for v in values]
+    return values
+
+
+def scenario(body):
+    inputs = parse_inputs(body.get('inputs', {}), body.get('mtype'))
+    res = model.scalar(evaluate(inputs, parse_projection(body.get('projection', {}))))
+    return {'metrics': {k: _finite_or_none(v) if isinstance(v, float) else v for k, v in res.items()}}
+
+
+def _batch_columns(body):
+    if 'columns' in body:
+        columns = body['columns']
+        if not isinstance(columns, dict):
+            raise RequestError("columns: expected an object of lists")
+        lengths = {len(v) for v in columns.values() if isinstance(v, list)}
+        if len(lengths) > 1:
+            raise RequestError("columns: every list must have the same length")
+        n = lengths.pop() if lengths else 1
+        return columns, body.get('mtype'), n
+    scenarios = body.get('scenarios')
+    if not isinstance(scenarios, list) or not all(isinstance(s, dict) for s in scenarios):
+        raise RequestError("Expected \"scenarios\": [{...}, ...] or \"columns\": {...}")
+    keys = set().union(*scenarios) if scenarios else set()
+    mtype = [s.pop('mtype', 'Dairy') for s in scenarios] if 'mtype' in keys else body.get('mtype')
+    keys.discard('mtype')
+    columns = {k: [s.get(k, model.DEFAULTS.get(k)) for s in scenarios] for k in keys}
+    return columns, mtype, len(scenarios)
+
+
+def batch(body):
+    columns, mtype, n = _batch_columns(body)
+    if n > MAX_BATCH:
+        raise RequestError(f"At most {MAX_BATCH:,} scenarios per request, got {n:,}")
+    if n == 0:
+        return {'count': 0, 'metrics': {k: [] for k in model.METRICS}}
+    inputs = parse_inputs(columns, mtype, n)
+    # Every input broadcast to n, so scalar-only columns still return n rows
+    inputs = {k: np.broadcast_to(v, (n,)) for k, v in inputs.items()}
+    res = evaluate(inputs, parse_projection(body.get('projection', {})))
+    return {'count': n, 'metrics': {k: _column(v) for k, v in res.items()}}
+
+
+def schema():
+    return {
+        'inputs': {k: {'default': model.DEFAULTS[k], 'min': lo, 'max': hi} for k, (lo, hi) in model.BOUNDS.items()},
+        'mtype': ['Dairy', 'Oat'],
+        'projection': {**{k: {'min': lo, 'max': hi} for k, (lo, hi) in PROJECTION_BOUNDS.items()},
+                       'seasonal': {'default': True}},
+        'metrics': list(model.METRICS),
+        'max_batch': MAX_BATCH,
+    }
+
+
+ROUTES = {
+    ('GET', '/v1/schema'): schema,
+    ('POST', '/v1/scenario'): scenario,
+    ('POST', '/v1/batch'): batch,
+}
+
+
+async def dispatch(method, path, body):
+    """(status, payload) for one request."""
+    handler = ROUTES.get((method, path))
+    if handler is None:
+        known = any(p == path for _, p in ROUTES)
+        return (405, {'error': f"{method} not allowed"}) if known else (404, {'error': f"No route {path}"})
+    try:
+        if method == 'GET':
+            return 200, handler()
+        payload = _loads(body) if body else {}
+        if not isinstance(payload, dict):
+            raise RequestError("Body must be a JSON object")
+        if handler is batch:
+            # Large batches take tens of milliseconds; keep the loop serving
+            return 200, await asyncio.get_running_loop().run_in_executor(None, partial(handler, payload))
+        return 200, handler(payload)
+    except RequestError as e:
+        return 400, {'error': str(e)}
+
+
+def _response(status, payload, keep_alive):
+    body = _dumps(payload)
+    head = (f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode('latin-1') + body
+
+
+async def handle_connection(reader, writer):
+    """Serve HTTP/1.1 requests on one connection until it closes or idles out."""
+    try:
+        while True:
+            try:
+                head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), KEEPALIVE_TIMEOUT)
+            except (asyncio.IncompleteReadError, asyncio.TimeoutError, asyncio.LimitOverrunError, ConnectionError):
+                break
+            request_line, *header_lines = head.decode('latin-1').split('\r\n')
+            try:
+                method, target, version = request_line.split(' ', 2)
+            except ValueError:
+                writer.write(_response(400, {'error': "Malformed request line"}, False))
+                break
+            headers = {}
+            for line in header_lines:
+                name, sep, value = line.partition(':')
+                if sep:
+                    headers[name.strip().lower()] = value.strip()
+            connection = headers.get('connection', '').lower()
+            keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+
+            if 'chunked' in headers.get('transfer-encoding', '').lower():
+                writer.write(_response(411, {'error': "Send a Content-Length body"}, False))
+                break
+            try:
+                length = int(headers.get('content-length', 0))
+            except ValueError:
+                length = -1
+            if not 0 <= length <= MAX_BODY:
+                writer.write(_response(413, {'error': f"Body must be at most {MAX_BODY:,} bytes"}, False))
+                break
+            try:
+                body = await reader.readexactly(length) if length else b''
+            except (asyncio.IncompleteReadError, ConnectionError):
+                break
+
+            try:
+                status, payload = await dispatch(method, target.split('?', 1)[0], body)
+            except Exception as e:   # never drop the connection on a model error
+                status, payload = 500, {'error': f"{type(e).__name__}: {e}"}
+            writer.write(_response(status, payload, keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    finally:
+        writer.close()
+
+
+async def serve(host='127.0.0.1', port=8600, ready=None):
+    """Run the API until cancelled; `ready(server)`, if given, is called once the server is listening."""
+    server = await asyncio.start_server(handle_connection, host, port, limit=2**16)
+    if ready is not None:
+        ready(server)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the financial model over local HTTP.")
+    parser.add_argument('--host', default='127.0.0.1', help="interface to bind (default: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8600, help="port to listen on (default: 8600)")
+    args = parser.parse_args(argv)
+
+    print(f"Model API on http://{args.host}:{args.port}/v1/ (Ctrl+C to stop)", file=sys.stderr)
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
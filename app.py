@@ -5,55 +5,41 @@ Based on Q1/2026 US Market Research
 """
 
 import streamlit as st
-import streamlit.components.v1 as components
-import plotly.graph_objects as go
-import numpy as np
-from fpdf import FPDF
-import base64
+import os
+import sys
+import uuid
+from datetime import datetime, timedelta
 
-# ============================================================================
-# COLOR PALETTE
-# ============================================================================
-COLORS = {
-    'primary': '#1A3C40',
-    'accent': '#C38D56',
-    'teal': '#4A9B9B',
-    'navy': '#2C3E50',
-    'terracotta': '#C97B63',
-    'gold': '#D4A855',
-    'sage': '#87A889',
-    'background': '#F9F9F7',
-    'sidebar': '#F8F9FA',
-    'card': '#FFFFFF',
-    'text': '#1A3C40',
-    'muted': '#6C757D',
-    'border': '#DEE2E6',
-    'success': '#2D6A4F',
-    'warning': '#D4A855',
-    'error': '#C97B63'
-}
+import metrics
+import profiling
+import theme
+
+# Per-section timings of this rerun; optionally the whole rerun under a profiler
+timer = profiling.RerunTimer()
+profiler = profiling.RerunProfiler() if st.session_state.pop("profile_next", False) else None
+if profiler is not None:
+    profiler.start()
+
+@st.cache_resource
+def get_metrics():
+    """Process metrics registry, served for Prometheus on METRICS_PORT when set."""
+    registry = metrics.process_metrics(metrics.Registry())
+    port = os.environ.get("METRICS_PORT")
+    if port:
+        try:
+            metrics.serve(registry, int(port), os.environ.get("METRICS_ADDR", "127.0.0.1"))
+        except OSError as e:
+            print(f"Metrics endpoint not started on port {port}: {e}", file=sys.stderr)
+    return registry
+
+telemetry = get_metrics()
+reruns = telemetry.counter('app_reruns_total', "Script reruns by page reached.", ('page',))
 
 # ============================================================================
-# DATA BREAKDOWNS (FOR PDF EXPORT)
+# COLOR PALETTE
 # ============================================================================
-RENOVATION_BREAKDOWN = [
-    ("Design & Permits (Architect/MEP/Fire)", 22000),
-    ("Demolition & Site Prep", 10000),
-    ("Plumbing (Floor Drains/Grease Trap)", 45000),
-    ("Electrical (Panel/Circuits/LED)", 35000),
-    ("Flooring, Walls & Ceiling", 30000),
-    ("Millwork & Custom Bar Build", 28000),
-]
-
-EQUIPMENT_BREAKDOWN = [
-    ("Espresso Machine (2-3 Group)", 24000),
-    ("Grinders (2 Espresso + 1 Bulk)", 8000),
-    ("Water Filtration + Ice Machine", 9000),
-    ("Refrigeration (Under-counter/Walk-in)", 15000),
-    ("Oven, Blender & Prep Equipment", 12000),
-    ("Commercial Dishwasher", 8000),
-    ("POS System & Technology", 10000),
-]
+timer.section("COLOR PALETTE")
+COLORS = theme.COLORS
 
 # Help text for trust signals
 HELP_TEXT = "Based on our exclusive Q1/2026 Coffee Market Research (US Region). Updated quarterly."
@@ -61,6 +47,7 @@ HELP_TEXT = "Based on our exclusive Q1/2026 Coffee Market Research (US Region).
 # ============================================================================
 # PAGE CONFIG
 # ============================================================================
+timer.section("PAGE CONFIG")
 st.set_page_config(
     page_title="Coffee Shop Survival Simulator 2026",
     page_icon="☕",
@@ -71,6 +58,7 @@ st.set_page_config(
 # ============================================================================
 # PASSWORD PROTECTION (Persistent via Query Params)
 # ============================================================================
+timer.section("PASSWORD PROTECTION")
 def check_password():
     """Returns `True` if the user had the correct password."""
     
@@ -81,7 +69,10 @@ def check_password():
     
     def password_entered():
         """Checks whether a password entered by the user is correct."""
-        if st.session_state["password"] == "save150k":
+        ok = st.session_state["password"] == "save150k"
+        telemetry.counter('app_login_attempts_total', "Access code attempts at the gate.", ('result',)).inc(
+            result="success" if ok else "failure")
+        if ok:
             st.session_state["password_correct"] = True
             # Set query param to persist across refreshes
             st.query_params["auth"] = "verified"
@@ -137,510 +128,49 @@ def check_password():
         return True
 
 if not check_password():
+    reruns.inc(page="gate")
     st.stop()
+reruns.inc(page="dashboard")
 
-# ============================================================================
-# CSS STYLING
-# ============================================================================
-st.markdown(f"""
-<style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap');
-    
-    .stApp {{
-        background-color: {COLORS['background']};
-        font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif;
-    }}
-    
-    .block-container {{
-        padding: 1.5rem 1rem !important;
-        max-width: 900px !important;
-    }}
-    
-    /* SIDEBAR */
-    section[data-testid="stSidebar"] {{
-        background: {COLORS['sidebar']} !important;
-        border-right: 1px solid {COLORS['border']};
-    }}
-    
-    section[data-testid="stSidebar"] .stMarkdown p,
-    section[data-testid="stSidebar"] .stMarkdown li,
-    section[data-testid="stSidebar"] h1, h2, h3 {{
-        color: {COLORS['text']} !important;
-        font-weight: 600 !important;
-    }}
-    
-    section[data-testid="stSidebar"] label {{
-        color: {COLORS['text']} !important;
-        font-weight: 600 !important;
-        font-size: 0.9rem !important;
-    }}
-    
-    /* Radio button labels styling for visibility */
-    section[data-testid="stSidebar"] .stRadio label {{
-        color: {COLORS['primary']} !important;
-        font-weight: 700 !important;
-        font-size: 0.9rem !important;
-    }}
-    
-    section[data-testid="stSidebar"] .stRadio div[role="radiogroup"] label {{
-        background: {COLORS['card']} !important;
-        border: 2px solid {COLORS['primary']} !important;
-        border-radius: 8px !important;
-        padding: 8px 16px !important;
-        margin: 2px !important;
-        color: {COLORS['primary']} !important;
-        font-weight: 700 !important;
-    }}
-    
-    section[data-testid="stSidebar"] .stRadio div[role="radiogroup"] label[data-checked="true"] {{
-        background: {COLORS['primary']} !important;
-        color: white !important;
-    }}
-    
-    section[data-testid="stSidebar"] .stNumberInput > div > div > input {{
-        background: {COLORS['card']} !important;
-        border: 2px solid {COLORS['border']} !important;
-        border-radius: 8px !important;
-        color: {COLORS['text']} !important;
-        font-weight: 600 !important;
-        font-size: 1rem !important;
-    }}
-    
-    section[data-testid="stSidebar"] .stNumberInput > div > div > input:focus {{
-        border-color: {COLORS['primary']} !important;
-        box-shadow: 0 0 0 3px rgba(26, 60, 64, 0.15) !important;
-    }}
-    
-    section[data-testid="stSidebar"] .stExpander {{
-        background: {COLORS['card']} !important;
-        border: 2px solid {COLORS['border']} !important;
-        border-radius: 10px !important;
-        margin-bottom: 0.5rem !important;
-    }}
-    
-    /* Main expander header (collapsed state) - improved visibility */
-    section[data-testid="stSidebar"] .stExpander > details > summary {{
-        background: linear-gradient(135deg, {COLORS['primary']} 0%, #2D5A5A 100%) !important;
-        border-radius: 8px !important;
-        padding: 0.75rem 1rem !important;
-    }}
-    
-    section[data-testid="stSidebar"] .stExpander > details > summary p {{
-        color: white !important;
-        font-weight: 700 !important;
-        font-size: 0.95rem !important;
-    }}
-    
-    section[data-testid="stSidebar"] .stExpander > details > summary svg {{
-        color: white !important;
-    }}
-    
-    /* When expanded - lighter background */
-    section[data-testid="stSidebar"] .stExpander > details[open] > summary {{
-        background: {COLORS['primary']} !important;
-        border-radius: 8px 8px 0 0 !important;
-    }}
-    
-    /* Enhanced visibility for nested expanders */
-    section[data-testid="stSidebar"] .stExpander .stExpander {{
-        background: #E8F4F4 !important;
-        border: 2px solid {COLORS['primary']} !important;
-    }}
-    
-    section[data-testid="stSidebar"] .stExpander .stExpander > details > summary {{
-        background: #E8F4F4 !important;
-    }}
-    
-    section[data-testid="stSidebar"] .stExpander .stExpander > details > summary p {{
-        color: {COLORS['primary']} !important;
-        font-weight: 700 !important;
-        font-size: 0.9rem !important;
-    }}
-    
-    section[data-testid="stSidebar"] .stExpander .stExpander > details > summary svg {{
-        color: {COLORS['primary']} !important;
-    }}
-    
-    /* Nested expander styling */
-    .breakdown-expander {{
-        background: rgba(26, 60, 64, 0.03);
-        border-radius: 8px;
-        padding: 0.5rem;
-        margin-top: 0.5rem;
-        font-size: 0.85rem;
-    }}
-    
-    /* HEADER */
-    .header-container {{
-        display: flex;
-        justify-content: space-between;
-        align-items: center;
-        background: linear-gradient(135deg, {COLORS['primary']} 0%, #2D5A5A 100%);
-        padding: 1.25rem 1.5rem;
-        border-radius: 16px;
-        margin-bottom: 1.5rem;
-        box-shadow: 0 4px 20px rgba(26, 60, 64, 0.15);
-        flex-wrap: wrap;
-        gap: 1rem;
-    }}
-    
-    .header-text h1 {{
-        color: white;
-        font-size: 1.4rem;
-        font-weight: 700;
-        margin: 0;
-    }}
-    
-    .header-text p {{
-        color: rgba(255,255,255,0.8);
-        font-size: 0.85rem;
-        margin: 0.25rem 0 0 0;
-    }}
-    
-    /* METRIC CARDS */
-    .metric-card {{
-        background: {COLORS['card']};
-        border-radius: 12px;
-        padding: 1.25rem;
-        box-shadow: 0 2px 12px rgba(0,0,0,0.05);
-        border: 1px solid {COLORS['border']};
-        margin-bottom: 0.75rem;
-    }}
-    
-    .metric-label {{
-        color: {COLORS['muted']};
-        font-size: 0.75rem;
-        font-weight: 600;
-        text-transform: uppercase;
-        letter-spacing: 0.08em;
-        margin-bottom: 0.5rem;
-    }}
-    
-    .metric-value {{
-        color: {COLORS['primary']};
-        font-size: 1.75rem;
-        font-weight: 700;
-        line-height: 1.2;
-    }}
-    
-    .metric-value.gold {{ color: {COLORS['accent']}; }}
-    .metric-value.success {{ color: {COLORS['success']}; }}
-    .metric-value.error {{ color: {COLORS['error']}; }}
-    
-    .metric-delta {{ font-size: 0.8rem; margin-top: 0.35rem; font-weight: 500; }}
-    .metric-delta.positive {{ color: {COLORS['success']}; }}
-    .metric-delta.negative {{ color: {COLORS['error']}; }}
-    
-    .ai-insight {{
-        font-size: 0.85rem;
-        padding: 0.5rem 0.75rem;
-        border-radius: 8px;
-        margin-top: 0.5rem;
-        display: inline-block;
-        font-weight: 600;
-    }}
-    
-    .ai-insight.excellent {{ background: rgba(45,106,79,0.15); color: #1B5E3F; border: 1px solid #2D6A4F; }}
-    .ai-insight.good {{ background: rgba(74,155,155,0.15); color: #2B7A78; border: 1px solid #4A9B9B; }}
-    .ai-insight.warning {{ background: rgba(212,168,85,0.2); color: #8B6914; border: 1px solid #D4A855; }}
-    .ai-insight.danger {{ background: rgba(201,123,99,0.15); color: #A84832; border: 1px solid #C97B63; }}
-    
-    .section-header {{
-        color: {COLORS['primary']};
-        font-size: 1.1rem;
-        font-weight: 700;
-        margin: 1.75rem 0 1rem 0;
-        padding-bottom: 0.5rem;
-        border-bottom: 3px solid {COLORS['accent']};
-        display: inline-block;
-    }}
-    
-    .alert {{
-        padding: 1rem 1.25rem;
-        border-radius: 10px;
-        margin: 0.75rem 0;
-    }}
-    
-    .alert-success {{
-        background: linear-gradient(135deg, rgba(45,106,79,0.12) 0%, rgba(45,106,79,0.05) 100%);
-        border-left: 5px solid {COLORS['success']};
-    }}
-    
-    .alert-warning {{
-        background: linear-gradient(135deg, rgba(212,168,85,0.15) 0%, rgba(212,168,85,0.05) 100%);
-        border-left: 5px solid {COLORS['warning']};
-    }}
-    
-    .alert-error {{
-        background: linear-gradient(135deg, rgba(201,123,99,0.12) 0%, rgba(201,123,99,0.05) 100%);
-        border-left: 5px solid {COLORS['error']};
-    }}
-    
-    .alert-title {{ font-weight: 700; font-size: 1rem; margin-bottom: 0.4rem; color: {COLORS['primary']}; }}
-    .alert-text {{ font-size: 0.9rem; color: {COLORS['text']}; line-height: 1.5; }}
-    
-    #MainMenu {{visibility: hidden;}}
-    footer {{visibility: hidden;}}
-    
-    /* Hide Streamlit branding and GitHub link */
-    .viewerBadge_container__r5tak {{display: none !important;}}
-    .stDeployButton {{display: none !important;}}
-    #stDecoration {{display: none !important;}}
-    a[href="https://streamlit.io/cloud"] {{display: none !important;}}
-    [data-testid="manage-app-button"] {{display: none !important;}}
-    ._profileContainer_gzau3_53 {{display: none !important;}}
-    .st-emotion-cache-czk5ss {{display: none !important;}}
-    [data-testid="stStatusWidget"] {{display: none !important;}}
-    
-    hr {{ border: none; height: 1px; background: {COLORS['border']}; margin: 1.5rem 0; }}
-    
-    @media (max-width: 768px) {{
-        .header-container {{ flex-direction: column; text-align: center; }}
-        .metric-value {{ font-size: 1.5rem; }}
-        .block-container {{ padding: 1rem 0.5rem !important; }}
-        .ai-insight {{ font-size: 0.8rem; padding: 0.4rem 0.6rem; }}
-        .alert-title {{ font-size: 0.95rem; }}
-        .alert-text {{ font-size: 0.85rem; }}
-    }}
-</style>
-""", unsafe_allow_html=True)
+# NumPy, Plotly and the model load only once the access code is accepted, so
+# the gate paints without waiting for them; fpdf loads on the first export
+import numpy as np
+
+import cache
+import capacity
+import figures
+import financing
+import graph
+import inventory
+import jobs
+import memory
+import menu
+import model
+import optimize
+import projection
+import report
+import schedule
+import sensitivity
+import simulation
+import surface
+from report import EQUIPMENT_BREAKDOWN, RENOVATION_BREAKDOWN
 
 # ============================================================================
-# PDF GENERATION (INCLUDES FULL BREAKDOWNS)
+# CSS STYLING
 # ============================================================================
-class BusinessPlanPDF(FPDF):
-    def header(self):
-        # Header with colored background
-        self.set_fill_color(26, 60, 64)
-        self.rect(0, 0, 210, 25, 'F')
-        self.set_font('Helvetica', 'B', 18)
-        self.set_text_color(255, 255, 255)
-        self.set_y(8)
-        self.cell(0, 10, 'Coffee Shop Business Plan 2026', ln=True, align='C')
-        self.ln(15)
-    
-    def footer(self):
-        self.set_y(-15)
-        self.set_font('Helvetica', 'I', 8)
-        self.set_text_color(128, 128, 128)
-        self.cell(0, 10, f'Page {self.page_no()} | Coffee Shop Survival Simulator - Commercial Edition | Q1/2026 Data', align='C')
-    
-    def section_title(self, title):
-        self.set_font('Helvetica', 'B', 12)
-        self.set_text_color(26, 60, 64)
-        self.set_fill_color(249, 249, 247)
-        self.cell(0, 8, f'  {title}', ln=True, fill=True)
-        self.ln(2)
-    
-    def key_metric(self, label, value, status=""):
-        self.set_font('Helvetica', '', 10)
-        self.set_text_color(108, 117, 125)
-        self.cell(60, 6, label, ln=False)
-        self.set_font('Helvetica', 'B', 10)
-        self.set_text_color(26, 60, 64)
-        self.cell(50, 6, str(value), ln=False)
-        if status:
-            if "OK" in status or "Healthy" in status:
-                self.set_text_color(45, 106, 79)
-            elif "DANGER" in status or "High" in status:
-                self.set_text_color(201, 123, 99)
-            else:
-                self.set_text_color(212, 168, 85)
-            self.set_font('Helvetica', 'I', 9)
-            self.cell(0, 6, status, ln=True)
-        else:
-            self.ln()
-
-def create_pdf(data):
-    pdf = BusinessPlanPDF()
-    pdf.add_page()
-    pdf.set_auto_page_break(auto=True, margin=15)
-    
-    # ==================== PAGE 1: EXECUTIVE SUMMARY ====================
-    pdf.section_title("EXECUTIVE SUMMARY")
-    
-    runway_text = "Infinite" if data['runway'] > 999 else f"{data['runway']:.1f} months"
-    payback_text = "N/A" if data['payback'] > 999 else f"{data['payback']:.1f} months"
-    profit_status = "Profitable" if data['profit'] >= 0 else "Loss"
-    
-    pdf.key_metric("Monthly Revenue:", f"${data['revenue']:,.0f}")
-    pdf.key_metric("Monthly Expenses:", f"${data['expenses']:,.0f}")
-    pdf.key_metric("Net Profit/Loss:", f"${data['profit']:,.0f}", f"({data['margin']:.1f}% margin) - {profit_status}")
-    pdf.key_metric("Cash Runway:", runway_text)
-    pdf.key_metric("Payback Period:", payback_text)
-    pdf.ln(5)
-    
-    # ==================== INPUT PARAMETERS ====================
-    pdf.section_title("INPUT PARAMETERS - CAPITAL & INVESTMENT")
-    pdf.key_metric("Total Capital:", f"${data['total_capital']:,.0f}")
-    pdf.key_metric("Renovation Budget:", f"${data['renovation']:,.0f}")
-    pdf.key_metric("Equipment Budget:", f"${data['equipment']:,.0f}")
-    pdf.key_metric("Operating Cash:", f"${data['remaining_cash']:,.0f}", 
-                   "OK" if data['remaining_cash'] >= 0 else "SHORTFALL!")
-    pdf.ln(3)
-    
-    pdf.section_title("INPUT PARAMETERS - LOCATION & REAL ESTATE")
-    pdf.key_metric("Shop Size:", f"{data['sqft']:,} sqft")
-    pdf.key_metric("Base Rent:", f"${data['base_rent']:.2f}/sqft/year")
-    pdf.key_metric("NNN Charges:", f"${data['nnn']:.2f}/sqft/year")
-    pdf.key_metric("Monthly Rent Total:", f"${data['monthly_rent']:,.0f}")
-    pdf.key_metric("Utilities:", f"${data['utilities']:,.0f}/month")
-    pdf.ln(3)
-    
-    pdf.section_title("INPUT PARAMETERS - STAFFING")
-    pdf.key_metric("Number of Employees:", f"{data['employees']}")
-    pdf.key_metric("Hours/Employee/Day:", f"{data['hours_per_day']:.1f}")
-    pdf.key_metric("Hourly Wage:", f"${data['hourly_wage']:.2f}")
-    pdf.key_metric("Labor Burden:", f"{data['labor_burden']:.0f}%")
-    pdf.key_metric("Monthly Labor Cost:", f"${data['monthly_labor']:,.0f}")
-    pdf.ln(3)
-    
-    pdf.section_title("INPUT PARAMETERS - COST OF GOODS SOLD")
-    pdf.key_metric("Milk Price:", f"${data['milk_price']:.2f}/gallon")
-    pdf.key_metric("Coffee Beans:", f"${data['bean_price']:.2f}/lb")
-    pdf.key_metric("Packaging:", f"${data['packaging']:.2f}/cup")
-    pdf.key_metric("Unit Cost per Cup:", f"${data['unit_cost']:.2f}")
-    pdf.key_metric("Monthly COGS:", f"${data['monthly_cogs']:,.0f}")
-    pdf.ln(3)
-    
-    pdf.section_title("INPUT PARAMETERS - SALES PROJECTIONS")
-    pdf.key_metric("Average Price/Cup:", f"${data['avg_price']:.2f}")
-    pdf.key_metric("Cups Sold/Day:", f"{data['cups_per_day']}")
-    pdf.key_metric("Operating Days/Month:", f"{data['operating_days']}")
-    pdf.key_metric("Monthly Cups Sold:", f"{data['monthly_cups']:,}")
-    pdf.ln(5)
-    
-    # ==================== PAGE 2: CAPEX BREAKDOWN ====================
-    pdf.add_page()
-    
-    pdf.section_title(f"RENOVATION INVESTMENT: ${data['renovation']:,.0f}")
-    pdf.set_font('Helvetica', '', 10)
-    pdf.set_text_color(60, 60, 60)
-    for item, cost in RENOVATION_BREAKDOWN:
-        pdf.cell(120, 6, f"  - {item}", ln=False)
-        pdf.cell(0, 6, f"${cost:,.0f}", ln=True)
-    total_reno = sum(c for _, c in RENOVATION_BREAKDOWN)
-    pdf.set_font('Helvetica', 'I', 9)
-    pdf.set_text_color(108, 117, 125)
-    pdf.cell(0, 6, f"  Standard total: ${total_reno:,.0f} | Your budget: ${data['renovation']:,.0f}", ln=True)
-    pdf.ln(5)
-    
-    pdf.section_title(f"EQUIPMENT INVESTMENT: ${data['equipment']:,.0f}")
-    pdf.set_font('Helvetica', '', 10)
-    pdf.set_text_color(60, 60, 60)
-    for item, cost in EQUIPMENT_BREAKDOWN:
-        pdf.cell(120, 6, f"  - {item}", ln=False)
-        pdf.cell(0, 6, f"${cost:,.0f}", ln=True)
-    total_equip = sum(c for _, c in EQUIPMENT_BREAKDOWN)
-    pdf.set_font('Helvetica', 'I', 9)
-    pdf.set_text_color(108, 117, 125)
-    pdf.cell(0, 6, f"  Standard total: ${total_equip:,.0f} | Your budget: ${data['equipment']:,.0f}", ln=True)
-    pdf.ln(8)
-    
-    # ==================== RISK ANALYSIS ====================
-    pdf.section_title("RISK ANALYSIS")
-    
-    rent_status = "[DANGER: >15%]" if data['rent_r'] > 15 else "[WARNING: >10%]" if data['rent_r'] >= 10 else "[OK: Healthy]"
-    labor_status = "[DANGER: >35%]" if data['labor_r'] > 35 else "[OK: Controlled]"
-    cogs_status = "[WARNING: >30%]" if data['cogs_r'] > 30 else "[OK: Good]"
-    
-    pdf.key_metric("Rent Ratio:", f"{data['rent_r']:.1f}% of Revenue", rent_status)
-    pdf.key_metric("Labor Ratio:", f"{data['labor_r']:.1f}% of Revenue", labor_status)
-    pdf.key_metric("COGS Ratio:", f"{data['cogs_r']:.1f}% of Revenue", cogs_status)
-    pdf.ln(8)
-    
-    # ==================== BREAK-EVEN ANALYSIS ====================
-    pdf.section_title("BREAK-EVEN ANALYSIS")
-    
-    # Calculate break-even
-    if data['avg_price'] > data['unit_cost']:
-        fixed_costs = data['monthly_labor'] + data['monthly_rent'] + data['utilities']
-        be_cups_monthly = fixed_costs / (data['avg_price'] - data['unit_cost'])
-        be_cups_daily = be_cups_monthly / data['operating_days']
-        cups_surplus = data['cups_per_day'] - be_cups_daily
-        
-        pdf.key_metric("Fixed Costs/Month:", f"${fixed_costs:,.0f}")
-        pdf.key_metric("Contribution Margin/Cup:", f"${data['avg_price'] - data['unit_cost']:.2f}")
-        pdf.key_metric("Break-even Point:", f"{be_cups_daily:.0f} cups/day ({be_cups_monthly:,.0f}/month)")
-        pdf.key_metric("Your Projection:", f"{data['cups_per_day']} cups/day", 
-                       f"+{cups_surplus:.0f} above BE" if cups_surplus > 0 else f"{cups_surplus:.0f} below BE!")
-        
-        if data['profit'] > 0:
-            payback_mo = (data['renovation'] + data['equipment']) / data['profit']
-            pdf.key_metric("Payback Period:", f"{payback_mo:.1f} months ({payback_mo/12:.1f} years)")
-    else:
-        pdf.key_metric("Status:", "INVALID - Price below unit cost!", "[CRITICAL]")
-    pdf.ln(8)
-    
-    # ==================== FINANCIAL SUMMARY TABLE ====================
-    pdf.section_title("MONTHLY PROFIT & LOSS STATEMENT")
-    
-    pdf.set_font('Helvetica', '', 10)
-    pdf.set_text_color(26, 60, 64)
-    
-    # Revenue
-    pdf.cell(100, 6, "  REVENUE", ln=False)
-    pdf.cell(0, 6, f"${data['revenue']:,.0f}", ln=True, align='R')
-    
-    # Expenses
-    pdf.set_text_color(80, 80, 80)
-    pdf.cell(100, 6, "    (-) Cost of Goods Sold", ln=False)
-    pdf.cell(0, 6, f"${data['monthly_cogs']:,.0f}", ln=True, align='R')
-    
-    pdf.cell(100, 6, "    (-) Labor", ln=False)
-    pdf.cell(0, 6, f"${data['monthly_labor']:,.0f}", ln=True, align='R')
-    
-    pdf.cell(100, 6, "    (-) Rent", ln=False)
-    pdf.cell(0, 6, f"${data['monthly_rent']:,.0f}", ln=True, align='R')
-    
-    pdf.cell(100, 6, "    (-) Utilities", ln=False)
-    pdf.cell(0, 6, f"${data['utilities']:,.0f}", ln=True, align='R')
-    
-    # Total Expenses
-    pdf.set_font('Helvetica', 'B', 10)
-    pdf.set_text_color(26, 60, 64)
-    pdf.cell(100, 6, "  TOTAL EXPENSES", ln=False)
-    pdf.cell(0, 6, f"${data['expenses']:,.0f}", ln=True, align='R')
-    
-    # Profit line
-    pdf.ln(2)
-    pdf.set_draw_color(26, 60, 64)
-    pdf.line(10, pdf.get_y(), 200, pdf.get_y())
-    pdf.ln(2)
-    
-    profit_color = (45, 106, 79) if data['profit'] >= 0 else (201, 123, 99)
-    pdf.set_text_color(*profit_color)
-    pdf.set_font('Helvetica', 'B', 12)
-    pdf.cell(100, 8, "  NET PROFIT/LOSS", ln=False)
-    pdf.cell(0, 8, f"${data['profit']:,.0f}", ln=True, align='R')
-    
-    pdf.set_font('Helvetica', 'I', 10)
-    pdf.cell(100, 6, "  Net Margin", ln=False)
-    pdf.cell(0, 6, f"{data['margin']:.1f}%", ln=True, align='R')
-    
-    # ==================== FOOTER NOTE ====================
-    pdf.ln(15)
-    pdf.set_font('Helvetica', 'I', 9)
-    pdf.set_text_color(128, 128, 128)
-    pdf.cell(0, 5, 'This report was generated by Coffee Shop Survival Simulator 2026.', ln=True)
-    pdf.cell(0, 5, 'All default values are based on Q1/2026 US Coffee Market Research.', ln=True)
-    pdf.cell(0, 5, 'For investment purposes only. Consult a financial advisor before making decisions.', ln=True)
-    
-    return pdf.output()
+timer.section("CSS STYLING")
+st.markdown(theme.CSS, unsafe_allow_html=True)
 
 # ============================================================================
 # DEFAULTS
 # ============================================================================
-D = {
-    'cap': 350000, 'reno': 185000, 'equip': 85000,
-    'milk': 4.48, 'oat': 5.20, 'bean': 14.50, 'pkg': 0.17,
-    'wage': 15.0, 'burden': 0.18, 'rent': 45.0, 'nnn': 12.0, 'util': 1200,
-    'sqft': 800, 'staff': 3, 'hrs': 8.0, 'price': 5.50, 'cups': 120, 'days': 30
-}
+timer.section("DEFAULTS")
+D = model.DEFAULTS
 
 # ============================================================================
 # HEADER
 # ============================================================================
+timer.section("HEADER")
 st.markdown("""
 <div class="header-container">
     <div class="header-text">
@@ -651,75 +181,12 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # Floating indicator pointing to sidebar toggle
-st.markdown("""
-<style>
-    /* Floating indicator near sidebar toggle */
-    .sidebar-hint {
-        position: fixed;
-        top: 10px;
-        left: 48px;
-        z-index: 999999;
-        background: linear-gradient(135deg, #1A3C40 0%, #2D5A5A 100%);
-        color: white;
-        padding: 6px 12px;
-        border-radius: 15px;
-        font-size: 0.75rem;
-        font-weight: 600;
-        box-shadow: 0 2px 10px rgba(26, 60, 64, 0.3);
-        animation: bounceHint 1.5s ease-in-out infinite;
-        font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
-        white-space: nowrap;
-        pointer-events: none;
-    }
-    
-    @keyframes bounceHint {
-        0%, 100% { 
-            transform: translateX(0);
-            opacity: 1;
-        }
-        50% { 
-            transform: translateX(5px);
-            opacity: 0.7;
-        }
-    }
-    
-    /* Mobile adjustments */
-    @media (max-width: 768px) {
-        .sidebar-hint {
-            top: 6px;
-            left: 42px;
-            padding: 5px 10px;
-            font-size: 0.7rem;
-        }
-    }
-    
-    /* Style the REAL sidebar toggle button for visibility */
-    [data-testid="collapsedControl"],
-    [data-testid="stSidebarCollapseButton"] button,
-    section[data-testid="stSidebar"] button[kind="header"] {
-        background: linear-gradient(135deg, #1A3C40 0%, #2D5A5A 100%) !important;
-        border: 2px solid #C38D56 !important;
-        border-radius: 8px !important;
-        padding: 6px !important;
-        box-shadow: 0 2px 8px rgba(26, 60, 64, 0.4) !important;
-    }
-    
-    [data-testid="collapsedControl"] svg,
-    [data-testid="stSidebarCollapseButton"] svg,
-    section[data-testid="stSidebar"] button[kind="header"] svg {
-        color: white !important;
-        width: 20px !important;
-        height: 20px !important;
-    }
-</style>
-<div class="sidebar-hint">
-    ← Your Scenario
-</div>
-""", unsafe_allow_html=True)
+st.markdown(theme.SIDEBAR_HINT, unsafe_allow_html=True)
 
 # ============================================================================
 # SIDEBAR - CLEAN WITH NESTED EXPANDERS
 # ============================================================================
+timer.section("SIDEBAR")
 with st.sidebar:
     st.markdown("### ⚙️ Configuration")
     
@@ -746,10 +213,31 @@ with st.sidebar:
             st.caption("💡 Tip: Save 30-50% buying used equipment.")
         
         cash = cap - reno - equip
-        if cash >= 0:
-            st.success(f"✅ Operating Cash: **${cash:,.0f}**")
-        else:
-            st.error(f"❌ Shortfall: **${abs(cash):,.0f}**")
+        # Filled in below the financing inputs: loans can cover a shortfall
+        cash_status = st.empty()
+    
+    # ===== FINANCING (COLLAPSED) =====
+    with st.expander("🏦 Financing", expanded=False):
+        fin_on = st.toggle("Finance with debt", value=False,
+                           help="Loan proceeds add to the opening cash; monthly debt service comes out of profit.")
+        loan_amt = st.number_input("Term Loan ($)", 0, 2000000, 250000, 10000)
+        loan_rate = st.number_input("Loan Rate (%/year)", 0.0, 30.0, 10.5, 0.25) / 100
+        loan_term = st.select_slider("Loan Term (years)", [3, 5, 7, 10, 15, 20, 25], 10) * 12
+        loan_io = st.number_input("Interest-Only Period (months)", 0, 24, 6,
+                                  help="Months of interest-only payments before the loan amortizes.")
+        loc_amt = st.number_input("Line of Credit Drawn ($)", 0, 500000, 0, 5000,
+                                  help="Interest only on the drawn balance; repaid at the end of its term.")
+        loc_rate = st.number_input("Line of Credit Rate (%/year)", 0.0, 30.0, 12.0, 0.25) / 100
+        loc_term = st.select_slider("Line of Credit Term (months)", [12, 24, 36, 48, 60], 24)
+        lender = st.selectbox("Lender", list(financing.DSCR_THRESHOLDS),
+                              format_func=lambda k: f"{k} (DSCR ≥ {financing.DSCR_THRESHOLDS[k]:.2f})")
+    
+    borrowed = loan_amt + loc_amt if fin_on else 0
+    before = f" ({'-' if cash < 0 else ''}${abs(cash):,.0f} before ${borrowed:,.0f} financing)" if borrowed else ""
+    if cash + borrowed >= 0:
+        cash_status.success(f"✅ Operating Cash: **${cash + borrowed:,.0f}**{before}")
+    else:
+        cash_status.error(f"❌ Shortfall: **${abs(cash + borrowed):,.0f}**{before}")
     
     # ===== LOCATION (COLLAPSED) =====
     with st.expander("🏪 Location & Real Estate", expanded=False):
@@ -771,86 +259,326 @@ with st.sidebar:
         oat = st.number_input("Oat Milk ($/carton)", 2.0, 12.0, D['oat'], 0.1, help=HELP_TEXT)
         bean = st.number_input("Coffee Beans ($/lb)", 8.0, 30.0, D['bean'], 0.5, help=HELP_TEXT)
         pkg = st.number_input("Packaging ($/cup)", 0.05, 0.50, D['pkg'], 0.01, help=HELP_TEXT)
-        mtype = st.radio("Primary Milk Type", ["Dairy", "Oat"], horizontal=True)
-        milk_p = milk if mtype == "Dairy" else oat
+    
+    # ===== MENU (COLLAPSED) =====
+    with st.expander("🧾 Menu & Recipes", expanded=False):
+        st.caption("Prices, sales mix and what goes into each item. Unit cost and the average "
+                   "price per cup are the mix-weighted menu.")
+        edited = st.data_editor(
+            dict(zip(menu.COLUMNS, map(list, zip(*menu.DEFAULT_MENU)))), key="menu", num_rows="dynamic",
+            hide_index=True, use_container_width=True,
+            column_config={
+                'item': st.column_config.TextColumn("Item", required=True),
+                'price': st.column_config.NumberColumn("Price", min_value=0.0, format="$%.2f", required=True),
+                'mix': st.column_config.NumberColumn("Mix %", min_value=0.0, required=True),
+                'bean': st.column_config.NumberColumn("Beans (g)", min_value=0.0),
+                'milk': st.column_config.NumberColumn("Milk (oz)", min_value=0.0),
+                'oat': st.column_config.NumberColumn("Oat (oz)", min_value=0.0),
+                'food': st.column_config.NumberColumn("Food ($)", min_value=0.0, format="$%.2f"),
+            })
+        rows = [tuple(0.0 if v is None else v for v in row) for row in zip(*(edited[c] for c in menu.COLUMNS))
+                if row[0] and row[1] is not None and row[2] is not None]
+        try:
+            menu_table = menu.table(rows)
+        except ValueError as e:
+            st.error(f"❌ {e}; using the default menu.")
+            menu_table = menu.table()
+        # Filled in once the inventory simulation has set the waste factors
+        menu_costs = st.empty()
+        cup = menu.summarize(menu_table, milk, oat)
+        price, milk_p = cup['price'], cup['milk_p']
     
     # ===== SALES (COLLAPSED) =====
     with st.expander("📈 Sales Projections", expanded=False):
-        price = st.number_input("Average Price per Cup ($)", 3.0, 12.0, D['price'], 0.25, help=HELP_TEXT)
+        st.caption(f"Average price per cup (menu): **${price:.2f}**")
         cups = st.number_input("Cups Sold per Day", 20, 500, D['cups'], 10, help=HELP_TEXT)
         days = st.number_input("Operating Days per Month", 20, 31, D['days'], help=HELP_TEXT)
+    
+    # ===== HOURS & BAR (COLLAPSED) =====
+    with st.expander("⏱️ Opening Hours & Bar", expanded=False):
+        open_hour, close_hour = st.select_slider("Opening Hours", options=range(25), value=(6, 19),
+                                                 format_func=lambda h: f"{h}:00")
+        open_hour = min(open_hour, 23)
+        if close_hour <= open_hour:
+            st.warning("⚠️ Open at least one hour; using one hour from opening.")
+            close_hour = open_hour + 1
+        baristas = st.number_input("Baristas on Bar", 1, 10, 2, help="Staff making drinks at the same time.")
+        groups = st.number_input("Espresso Group Heads", 1, 6, 2, help="A 2-3 group machine; a second machine adds its groups.")
+        max_line = st.number_input("Longest Line Customers Join", 1, 30, 8,
+                                   help="A customer who finds this many people already waiting walks away.")
+        bar_on = st.toggle("Simulate the bar queue", value=False,
+                           help="A year of arrivals, waits and walk-aways at the espresso bar.")
+        cap_sales = st.toggle("Cap sales at bar capacity", value=True, disabled=not bar_on,
+                              help="Deduct the sales the bar loses to walk-aways from every projection.")
+    
+    # ===== INVENTORY (COLLAPSED) =====
+    with st.expander("📦 Inventory & Ordering", expanded=False):
+        inv_on = st.toggle("Simulate spoilage & ordering", value=False,
+                           help="Waste from a year of daily stock and the best ordering policy, "
+                                "instead of a flat 10% on beans and milk.")
+        shelf = {
+            'milk': st.number_input("Dairy Milk Shelf Life (days)", 3, 21, inventory.ITEMS['milk']['shelf']),
+            'oat': st.number_input("Oat Milk Shelf Life (days)", 3, 60, inventory.ITEMS['oat']['shelf']),
+            'bean': st.number_input("Bean Freshness Window (days)", 7, 90, inventory.ITEMS['bean']['shelf']),
+        }
+        fill_target = st.number_input("In-Stock Target (% of demand)", 90.0, 100.0, 99.5, 0.1,
+                                      help="Share of ingredient demand met from stock.") / 100
+    
+    # ===== PROJECTION (COLLAPSED) =====
+    with st.expander("📅 Multi-Year Projection", expanded=False):
+        proj_months = st.select_slider("Projection Horizon (months)", [36, 48, 60, 84, 120], 60)
+        ramp_months = st.number_input("Ramp-up Period (months)", 0, 24, 6, help="Months until cups/day reaches your projection.")
+        ramp_start = st.number_input("Opening Volume (% of projection)", 10.0, 100.0, 60.0, 5.0) / 100
+        seasonal = st.toggle("Seasonality", value=True, help="Holiday peak, summer dip.")
+        start_month = st.selectbox("Opening Month", range(1, 13), format_func=lambda mo: datetime(2026, mo, 1).strftime("%B"))
+        rent_esc = st.number_input("Annual Rent Escalation (%)", 0.0, 10.0, 3.0, 0.5) / 100
+        wage_growth = st.number_input("Annual Wage Growth (%)", 0.0, 15.0, 3.0, 0.5) / 100
+        cogs_infl = st.number_input("COGS Inflation (%/year)", 0.0, 15.0, 2.5, 0.5) / 100
+    
+    # ===== MONTE CARLO (COLLAPSED) =====
+    with st.expander("🎲 Monte Carlo Simulation", expanded=False):
+        mc_on = st.toggle("Simulate uncertainty", value=False,
+                          help="Replace the single runway line with a P10/P50/P90 fan of simulated cash paths.")
+        mc_paths = st.select_slider("Simulated Paths", [10000, 20000, 50000, 100000], 20000)
+        mc_vol = {
+            'cups': st.number_input("Cups/Day Volatility (%)", 0.0, 100.0, 20.0, 1.0),
+            'price': st.number_input("Price Volatility (%)", 0.0, 50.0, 5.0, 1.0),
+            'milk_p': st.number_input("Milk Price Volatility (%)", 0.0, 100.0, 15.0, 1.0),
+            'bean': st.number_input("Bean Price Volatility (%)", 0.0, 100.0, 15.0, 1.0),
+            'wage': st.number_input("Wage Volatility (%)", 0.0, 50.0, 5.0, 1.0),
+        }
+        mc_noise = st.number_input("Month-to-Month Demand Noise (%)", 0.0, 50.0, 10.0, 1.0)
+        mc_seed = st.number_input("Random Seed", 0, 999999, 42, help="Same seed, same paths on every rerun.")
 
 # ============================================================================
 # CALCULATIONS
 # ============================================================================
-bean_c = (bean / 453) * 20 * 1.1
-milk_c = (milk_p / 128) * 10 * 1.1
-unit = bean_c + milk_c + pkg
-
-mo_cups = cups * days
-rev = mo_cups * price
-cogs = mo_cups * unit
-labor = staff * hrs * days * wage * (1 + burden)
-rent_b = (sqft * rent) / 12
-rent_n = (sqft * nnn) / 12
-rent_t = rent_b + rent_n
-exp = cogs + labor + rent_t + util
-profit = rev - exp
-
-rent_r = (rent_t / rev * 100) if rev > 0 else 0
-labor_r = (labor / rev * 100) if rev > 0 else 0
-cogs_r = (cogs / rev * 100) if rev > 0 else 0
-margin = (profit / rev * 100) if rev > 0 else 0
-
-if profit < 0 and cash > 0:
-    burn, runway = abs(profit), cash / abs(profit)
+timer.section("CALCULATIONS")
+inputs = dict(
+    cap=cap, reno=reno, equip=equip, milk_p=milk_p, bean=bean, pkg=pkg,
+    bean_g=cup['bean_g'], milk_oz=cup['milk_oz'], food=cup['food'],
+    wage=wage, burden=burden, rent=rent, nnn=nnn, util=util, sqft=sqft,
+    staff=staff, hrs=hrs, price=price, cups=cups, days=days
+)
+
+@st.cache_resource
+def get_dashboard_graph():
+    """Model nodes plus the multi-year projection, shared by every session."""
+    return graph.Graph({**model.NODES, **projection.NODES})
+
+@st.cache_resource
+def get_result_cache():
+    """Metrics, figures and HTML cards shared by every session of the process."""
+    rc = cache.ResultCache(max_bytes=int(float(os.environ.get("RESULT_CACHE_MB", 64)) * 2**20),
+                           ttl=float(os.environ.get("RESULT_CACHE_TTL", 3600)))
+    telemetry.counter_fn('result_cache_hits_total', "Result cache lookups served from the cache.", lambda: rc.hits)
+    telemetry.counter_fn('result_cache_misses_total', "Result cache lookups that computed.", lambda: rc.misses)
+    telemetry.counter_fn('result_cache_evictions_total', "Entries evicted for space.", lambda: rc.evictions)
+    telemetry.gauge('result_cache_hit_ratio', "Fraction of result cache lookups that hit.", lambda: rc.stats()['hit_rate'])
+    telemetry.gauge('result_cache_bytes', "Approximate bytes held by the result cache.", lambda: rc.bytes)
+    return rc
+
+@st.cache_resource
+def get_session_store():
+    """Large per-session artifacts, dropped after SESSION_IDLE_TTL seconds idle."""
+    sessions = memory.SessionStore(idle_ttl=float(os.environ.get("SESSION_IDLE_TTL", 900)))
+    telemetry.gauge('app_active_sessions', "Sessions that reran in the last 5 minutes.", sessions.active)
+    telemetry.counter_fn('app_idle_sessions_evicted_total', "Sessions whose artifacts were dropped as idle.",
+                         lambda: sessions.evicted)
+    return sessions
+
+results = get_result_cache()
+store = get_session_store()
+sid = st.session_state.setdefault("session_id", uuid.uuid4().hex)
+store.touch(sid, memory.state_bytes(st.session_state))
+store.sweep()
+
+# A year of the espresso bar's queue; shared by every session with the same
+# demand, menu and bar. Opt-in: a year of arrivals takes 30-250 ms for
+# every new cups/day or bar setting
+demand_cups, bar = cups, None
+if bar_on:
+    bar = results.get_or_compute(
+        cache.cache_key('bar', cups, menu_table, baristas, groups, max_line, open_hour, close_hour, start_month),
+        lambda: capacity.simulate(cups, menu_table, baristas, groups, max_line, open_hour=open_hour,
+                                  close_hour=close_hour, start_month=start_month))
+    if cap_sales:
+        inputs['cups'] = cups = int(round(demand_cups * bar['served_share']))
+
+# Waste factors from a year of daily stock under the best ordering policies.
+# Opt-in like the bar: every new cups/day, menu or shelf life costs ~80 ms
+if inv_on:
+    usage = {k: q / inventory.ITEMS[k]['oz'] for k, q in menu.per_cup(menu_table).items() if k in inventory.ITEMS}
+    stock = results.get_or_compute(cache.cache_key('inventory', cups, usage, shelf, fill_target),
+                                   lambda: inventory.plan(cups, usage, shelf, fill_target))
+    waste = {k: v['factor'] for k, v in stock.items()}
 else:
-    burn, runway = 0, float('inf') if profit >= 0 else 0
+    stock, waste = None, dict.fromkeys(inventory.ITEMS, inventory.FLAT_WASTE)
+cup = menu.summarize(menu_table, milk, oat, waste)
+inputs.update(bean_waste=cup['bean_waste'], milk_waste=cup['milk_waste'])
+
+item_cost = menu.item_costs(menu_table, bean, milk, oat, pkg, waste)
+menu_costs.dataframe({'Item': menu_table['item'], 'Cost': item_cost,
+                      'Margin %': (1 - item_cost / np.maximum(menu_table['price'], 1e-9)) * 100},
+                     hide_index=True, use_container_width=True,
+                     column_config={'Cost': st.column_config.NumberColumn(format="$%.2f"),
+                                    'Margin %': st.column_config.NumberColumn(format="%.0f%%")})
+proj_assumptions = dict(
+    ramp_months=ramp_months, ramp_start=ramp_start,
+    seasonality=projection.SEASONALITY if seasonal else None, start_month=start_month,
+    rent_escalation=rent_esc, wage_growth=wage_growth, cogs_inflation=cogs_infl
+)
+
+def evaluate_scenario():
+    # Node values persist per session; only nodes downstream of a changed
+    # input are recomputed, and the UI and PDF read the same values
+    ev = store.get(sid, 'model')
+    if ev is None:
+        ev = store.put(sid, 'model', get_dashboard_graph().evaluation())
+    ev.update(**inputs, proj_months=proj_months, proj_assumptions=proj_assumptions)
+    return model.scalar(ev.get(model.METRICS)), ev['proj']
+
+# Repeat scenarios (the defaults above all) are served from the shared cache
+scenario_key = cache.cache_key('scenario', inputs, proj_months, proj_assumptions)
+m, proj = results.get_or_compute(scenario_key, evaluate_scenario)
+
+bean_c, milk_c, unit = m['bean_c'], m['milk_c'], m['unit']
+food = inputs['food']
+
+mo_cups, rev, cogs, labor = m['mo_cups'], m['rev'], m['cogs'], m['labor']
+rent_b, rent_n, rent_t = m['rent_b'], m['rent_n'], m['rent_t']
+exp, profit = m['exp'], m['profit']
+
+rent_r, labor_r, cogs_r, margin = m['rent_r'], m['labor_r'], m['cogs_r'], m['margin']
+
+burn = m['burn']
+
+# Runway and payback come from the month-by-month projection
+runway, payback = proj['runway'].item(), proj['payback'].item()
 
-payback = (reno + equip) / profit if profit > 0 else float('inf')
+# Debt financing: loans add to the opening cash and their payments come out
+# of every projected month, so runway and payback become levered
+loans = [dict(principal=loan_amt, rate=loan_rate, term=loan_term, io=loan_io)] if fin_on and loan_amt else []
+if fin_on and loc_amt:
+    loans.append(dict(principal=loc_amt, rate=loc_rate, term=loc_term, amort=np.inf))
+debt = sum(loan['principal'] for loan in loans)
+# The CapEx the owner's equity has to pay back
+equity_capex = max(reno + equip - debt, 0)
+unlevered = {'runway': runway, 'payback': payback}
+debt_sched, debt_month = None, 0.0
+if loans:
+    debt_sched = financing.debt_service(loans, max(proj_months, *(loan['term'] for loan in loans)))
+    lev = financing.lever(proj['profit'], cash, debt, debt_sched['payment'][:proj_months], equity_capex)
+    proj = {**proj, 'balance': lev['balance'], 'runway': lev['runway'], 'payback': lev['payback']}
+    runway, payback = lev['runway'].item(), lev['payback'].item()
+    # Regular monthly debt service: the largest scheduled payment, balloons excluded
+    debt_month = float((debt_sched['payment'] - debt_sched['balloon']).max())
+    burn = max(debt_month - profit, 0) if cash + debt > 0 else 0.0
+# Opening cash after CapEx including the loan proceeds: what the survival
+# cards and the Monte Carlo start from
+financed_cash = cash + debt
+net_profit = profit - debt_month
+# Levered break-even: debt service is a fixed cost the cups have to cover
+fixed = m['fixed'] + debt_month
+be_cups_month = fixed / (price - unit) if price > unit else np.nan
+be_cups_day = be_cups_month / days
+
+# Coverage against the lender's threshold, and every rate × term ×
+# interest-only offer for the term loan priced against this projection
+fin = None
+if loans:
+    horizon = {k: v[:proj_months] for k, v in debt_sched.items()}
+    fin = {
+        'lender': lender, 'threshold': financing.DSCR_THRESHOLDS[lender],
+        'loans': [("Line of Credit" if 'amort' in loan else "Term Loan", loan['principal'], loan['rate'] * 100,
+                   loan['term'], loan.get('io', 0)) for loan in loans],
+        'debt': debt, 'debt_service': debt_month, 'profit_after_debt': net_profit,
+        'total_interest': float(debt_sched['interest'].sum()),
+        'dscr': float(financing.dscr(profit, debt_month)),
+        'dscr_min': float(financing.min_annual_dscr(proj['profit'], horizon['payment'], horizon['balloon'])),
+        'unlevered_runway': unlevered['runway'], 'unlevered_payback': unlevered['payback'],
+        'offers': None,
+    }
+    if fin_on and loan_amt:
+        other = financing.debt_service(loans[1:], proj_months)['payment']
+        fin['offers'] = results.get_or_compute(
+            cache.cache_key('offers', scenario_key, loans, cash, equity_capex),
+            lambda: financing.offers(loan_amt, proj['profit'] - other, cash + debt - loan_amt,
+                                     equity_capex, profit))
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def run_monte_carlo(inputs, paths, volatility, monthly_noise, seed, debt=0.0, debt_service=None):
+    dists = {k: (simulation.DISTRIBUTIONS[k][0], v / 100) for k, v in volatility.items()}
+    return simulation.simulate_survival(inputs, paths=paths, months=36, distributions=dists,
+                                        monthly_noise=monthly_noise / 100, seed=seed,
+                                        debt=debt, debt_service=debt_service)
 
 # ============================================================================
 # EXPORT PDF BUTTON (Simplified - No Charts)
 # ============================================================================
+timer.section("EXPORT PDF BUTTON")
 
-pdf_data = {
-    # Executive Summary
-    'revenue': rev, 'expenses': exp, 'profit': profit, 'margin': margin,
-    'runway': runway if runway < 1000 else 9999, 'payback': payback if payback < 1000 else 9999,
-    
-    # Capital & Investment
-    'total_capital': cap, 'renovation': reno, 'equipment': equip, 'remaining_cash': cash,
-    
-    # Location
-    'sqft': sqft, 'base_rent': rent, 'nnn': nnn, 'utilities': util, 'monthly_rent': rent_t,
-    
-    # Staffing
-    'employees': staff, 'hours_per_day': hrs, 'hourly_wage': wage, 
-    'labor_burden': burden * 100, 'monthly_labor': labor,
-    
-    # COGS
-    'milk_price': milk_p, 'bean_price': bean, 'packaging': pkg,
-    'unit_cost': unit, 'monthly_cogs': cogs,
-    
-    # Sales
-    'avg_price': price, 'cups_per_day': cups, 'operating_days': days, 'monthly_cups': mo_cups,
-    
-    # Risk Ratios
-    'rent_r': rent_r, 'labor_r': labor_r, 'cogs_r': cogs_r
-}
+pdf_data = report.report_data(inputs, {**m, 'runway': runway, 'payback': payback, 'fixed': fixed,
+                                        'be_cups_month': be_cups_month, 'be_cups_day': be_cups_day}, fin)
 
+@st.cache_resource
+def get_pdf_queue():
+    """One render pool per server process, shared by every session."""
+    renders = telemetry.counter('pdf_renders_total', "Finished create_pdf renders by outcome.", ('state',))
+    render_seconds = telemetry.histogram('pdf_render_seconds', "create_pdf render time.")
+    render_bytes = telemetry.histogram('pdf_render_bytes', "Size of rendered reports.",
+                                       buckets=(2**12, 2**13, 2**14, 2**15, 2**16, 2**18, 2**20))
+
+    def finished(job):
+        renders.inc(state=job.state)
+        if job.state == 'done':
+            render_seconds.observe(job.finished - job.started)
+            render_bytes.observe(len(job.result))
+
+    return jobs.PDFJobQueue(max_workers=int(os.environ.get("PDF_MAX_CONCURRENT", 2)), on_finished=finished)
+
+def pdf_export_status():
+    job = get_pdf_queue().get(st.session_state.get("pdf_job"))
+    if job is None:
+        return
+    if job.pending:
+        st.progress(job.progress, text=f"⏳ {job.stage}...")
+    elif job.state == 'done':
+        st.download_button(
+            "📄 Download PDF", data=lambda j=job: j.result,
+            file_name="Coffee_Shop_Business_Plan_2026.pdf", mime="application/pdf",
+            on_click="ignore", use_container_width=True
+        )
+    else:
+        st.error(f"❌ PDF generation failed: {job.error}")
+    # Stop polling once the render this fragment was started for has finished
+    if not job.pending and st.session_state.get("pdf_polling"):
+        st.session_state["pdf_polling"] = False
+        st.rerun()
+
+pdf_key = cache.canonical_hash(pdf_data.as_dict())
 col_exp1, col_exp2 = st.columns([3, 1])
 with col_exp2:
     if st.button("📥 Export PDF", type="primary", use_container_width=True):
-        pdf_bytes = create_pdf(pdf_data)
-        b64 = base64.b64encode(pdf_bytes).decode()
-        href = f'<a href="data:application/pdf;base64,{b64}" download="Coffee_Shop_Business_Plan_2026.pdf">📄 Click to Download PDF</a>'
-        st.markdown(href, unsafe_allow_html=True)
-        st.success("✅ Business Plan PDF generated successfully!")
+        exports = telemetry.counter('pdf_exports_total', "Export button clicks by outcome.", ('result',))
+        try:
+            st.session_state["pdf_job"] = get_pdf_queue().submit(pdf_key, pdf_data).id
+            exports.inc(result="queued")
+        except jobs.QueueFull:
+            exports.inc(result="rejected")
+            st.warning("⏳ The server is busy generating reports. Please try again in a moment.")
+
+pdf_job = get_pdf_queue().get(st.session_state.get("pdf_job"))
+if pdf_job is not None and pdf_job.key != pdf_key:
+    # Inputs changed since the export; don't offer a stale report
+    pdf_job = st.session_state["pdf_job"] = None
+st.session_state["pdf_polling"] = pdf_job is not None and pdf_job.pending
+st.fragment(pdf_export_status, run_every=0.5 if st.session_state["pdf_polling"] else None)()
 
 # ============================================================================
 # HELPERS
 # ============================================================================
+timer.section("HELPERS")
 def get_insight(margin):
     if margin >= 20:
         return '<span class="ai-insight excellent">✨ Excellent! Investment ready.</span>'
@@ -869,344 +597,759 @@ def metric(label, value, delta=None, delta_type="", value_class="", insight=None
 def alert(atype, title, text):
     return f'<div class="alert alert-{atype}"><div class="alert-title">{title}</div><div class="alert-text">{text}</div></div>'
 
+def figure(builder, *args):
+    """figures.<builder>(*args), built once per distinct arguments.
+
+    Cached figures are shared across sessions and never modified, so a
+    section whose inputs did not change re-sends its chart without
+    rebuilding it.
+    """
+    return results.get_or_compute(cache.cache_key('figure', builder, args),
+                                  lambda: getattr(figures, builder)(*args))
+
+def cards(name, build, *args):
+    """HTML cards from build(*args), cached like figures."""
+    return results.get_or_compute(cache.cache_key('cards', name, args), lambda: build(*args))
+
+def chart(fig, **kwargs):
+    """st.plotly_chart, timed separately from building the figure."""
+    with timer.span("plotly_chart"):
+        st.plotly_chart(fig, **kwargs)
+
 # ============================================================================
 # SURVIVAL STATUS
 # ============================================================================
-st.markdown('<div class="section-header">⚡ Survival Analysis</div>', unsafe_allow_html=True)
+@st.fragment
+def survival_section(cash, profit, burn, runway, payback, capex, proj, mc_args):
+    """Cash reserve, runway/payback and the runway chart or Monte Carlo fan.
 
-if cash < 0:
-    st.markdown(alert("error", "💥 BANKRUPT BEFORE LAUNCH", 
-        f"You need ${abs(cash):,.0f} more capital to cover initial investment."), unsafe_allow_html=True)
-elif profit < 0:
-    c1, c2 = st.columns(2)
-    with c1:
-        st.markdown(metric("Cash Reserve", f"${cash:,.0f}", f"-${burn:,.0f}/mo", "negative"), unsafe_allow_html=True)
-    with c2:
-        rt = f"{runway:.1f} months" if runway < 100 else "∞"
-        insight = '<span class="ai-insight danger">🚨 Critical runway!</span>' if runway <= 6 else ""
-        st.markdown(metric("Runway", rt, "Until zero cash", "negative", "error", insight), unsafe_allow_html=True)
-    
-    if 0 < runway < 50:
-        x = np.arange(0, int(min(runway + 4, 24)))
-        y = [max(0, cash - burn * i) for i in x]
-        
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(x=x, y=y, mode='lines', line=dict(color=COLORS['terracotta'], width=3, shape='spline'),
-            fill='tozeroy', fillcolor='rgba(201,123,99,0.12)'))
-        fig.add_hline(y=0, line_dash="dot", line_color='#1A3C40', line_width=2)
-        fig.update_layout(
-            title=dict(text=f"💸 Cash Runway: {runway:.1f} months", font=dict(size=16, color='#1A3C40', family='Arial Black')),
-            xaxis=dict(
-                title=dict(text="Months", font=dict(size=14, color='#1A3C40', family='Arial')),
-                showgrid=True, gridcolor='rgba(0,0,0,0.08)', zeroline=False,
-                tickfont=dict(size=13, color='#1A3C40', family='Arial'),
-                fixedrange=True
-            ),
-            yaxis=dict(
-                title=dict(text="Cash ($)", font=dict(size=14, color='#1A3C40', family='Arial')),
-                showgrid=True, gridcolor='rgba(0,0,0,0.08)', zeroline=False,
-                tickfont=dict(size=13, color='#1A3C40', family='Arial'),
-                fixedrange=True
-            ),
-            height=380, template="plotly_white", margin=dict(l=20, r=20, t=60, b=50),
-            plot_bgcolor='rgba(255,255,255,0.95)', paper_bgcolor='rgba(0,0,0,0)',
-            dragmode=False
-        )
-        st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
+    `cash` is the opening cash including any loan proceeds, so a financed
+    build-out is neither bankrupt before launch nor skipped by the Monte Carlo.
+    """
+    st.markdown('<div class="section-header">⚡ Survival Analysis</div>', unsafe_allow_html=True)
+
+    if cash < 0:
+        st.markdown(alert("error", "💥 BANKRUPT BEFORE LAUNCH", 
+            f"You need ${abs(cash):,.0f} more capital to cover initial investment."), unsafe_allow_html=True)
+    elif profit < 0:
+        c1, c2 = st.columns(2)
+        with c1:
+            st.markdown(metric("Cash Reserve", f"${cash:,.0f}", f"-${burn:,.0f}/mo", "negative"), unsafe_allow_html=True)
+        with c2:
+            rt = f"{runway:.1f} months" if np.isfinite(runway) else "∞"
+            insight = '<span class="ai-insight danger">🚨 Critical runway!</span>' if runway <= 6 else ""
+            # Past the projection, runway is extrapolated at the last year's burn
+            until = "Until zero cash" if runway <= proj['months'][-1] else "Past the projection, at the last year's burn"
+            st.markdown(metric("Runway", rt, until, "negative", "error", insight), unsafe_allow_html=True)
+    
+        if 0 < runway < 50 and mc_args is None:
+            chart(figure('runway_figure', proj, runway), use_container_width=True, config={'displayModeBar': False})
+    
+        st.markdown(alert("error", "🔥 BURNING CASH", f"Losing ${burn:,.0f}/month. {rt} until zero cash."), unsafe_allow_html=True)
+    else:
+        c1, c2 = st.columns(2)
+        with c1:
+            st.markdown(metric("Cash Reserve", f"${cash:,.0f}", f"+${profit:,.0f}/mo", "positive"), unsafe_allow_html=True)
+        with c2:
+            pb = f"{int(payback//12)}y {int(payback%12)}m" if payback < 120 else "N/A"
+            st.markdown(metric("Payback Period", pb, f"${capex:,.0f} CapEx", "", "gold"), unsafe_allow_html=True)
+        if np.isfinite(runway):
+            if 0 < runway < 50 and mc_args is None:
+                chart(figure('runway_figure', proj, runway), use_container_width=True, config={'displayModeBar': False})
+            st.markdown(alert("warning", "⚠️ RAMP-UP CASH CRUNCH", f"Net profit ${profit:,.0f}/month at full volume, but the opening months "
+                f"run out of cash after {runway:.1f} months. Add working capital or shorten the ramp-up."), unsafe_allow_html=True)
+        else:
+            st.markdown(alert("success", "✅ SUSTAINABLE MODEL", f"Net profit ${profit:,.0f}/month. Runway: Infinite."), unsafe_allow_html=True)
+
+    if mc_args is not None and cash >= 0:
+        mc = run_monte_carlo(*mc_args)
+    
+        c1, c2, c3 = st.columns(3)
+        for col, h in zip((c1, c2, c3), simulation.HORIZONS):
+            p_bk = mc['p_bankrupt'][h] * 100
+            with col:
+                st.markdown(metric(f"P(Bankrupt ≤ {h}mo)", f"{p_bk:.1f}%", f"{mc['paths']:,} paths",
+                    "negative" if p_bk >= 10 else "positive", "error" if p_bk >= 25 else "success"), unsafe_allow_html=True)
+    
+        rp = {k: (f"{v:.1f} mo" if np.isfinite(v) else "∞") for k, v in mc['runway_pct'].items()}
+        st.markdown(alert("warning" if np.isfinite(mc['runway_pct'][50]) else "success", "🎲 RUNWAY PERCENTILES",
+            f"P10: {rp[10]} • P50: {rp[50]} • P90: {rp[90]}. Pessimistic, median and optimistic months until zero cash."),
+            unsafe_allow_html=True)
     
-    st.markdown(alert("error", "🔥 BURNING CASH", f"Losing ${burn:,.0f}/month. {runway:.1f} months until zero cash."), unsafe_allow_html=True)
-else:
-    c1, c2 = st.columns(2)
-    with c1:
-        st.markdown(metric("Cash Reserve", f"${cash:,.0f}", f"+${profit:,.0f}/mo", "positive"), unsafe_allow_html=True)
-    with c2:
-        pb = f"{int(payback//12)}y {int(payback%12)}m" if payback < 120 else "N/A"
-        st.markdown(metric("Payback Period", pb, f"${reno+equip:,.0f} CapEx", "", "gold"), unsafe_allow_html=True)
-    st.markdown(alert("success", "✅ SUSTAINABLE MODEL", f"Net profit ${profit:,.0f}/month. Runway: Infinite."), unsafe_allow_html=True)
+        chart(figure('fan_figure', mc), use_container_width=True, config={'displayModeBar': False})
+
+timer.section("SURVIVAL STATUS")
+survival_section(financed_cash, net_profit, burn, runway, payback, equity_capex, proj,
+                 (inputs, mc_paths, mc_vol, mc_noise, mc_seed, debt,
+                  None if debt_sched is None else debt_sched['payment'][:36]) if mc_on else None)
 
 st.divider()
 
 # ============================================================================
 # FINANCIAL DASHBOARD
 # ============================================================================
-st.markdown('<div class="section-header">📊 Financial Dashboard</div>', unsafe_allow_html=True)
-
-c1, c2 = st.columns(2)
-with c1:
-    st.markdown(metric("Monthly Revenue", f"${rev:,.0f}", f"{mo_cups:,} cups sold"), unsafe_allow_html=True)
-with c2:
-    st.markdown(metric("Monthly Expenses", f"${exp:,.0f}", f"{(exp/rev*100):.0f}% of revenue" if rev > 0 else ""), unsafe_allow_html=True)
-
-c3, c4 = st.columns(2)
-with c3:
-    val_class = "success" if profit >= 0 else "error"
-    insight = get_insight(margin)
-    st.markdown(metric("Net Profit", f"${profit:,.0f}", f"{margin:.1f}% margin", 
-        "positive" if profit >= 0 else "negative", val_class, insight), unsafe_allow_html=True)
-with c4:
+def dashboard_cards(rev, exp, mo_cups, profit, margin, price, unit):
+    """HTML of the revenue, expenses, net profit and unit economics cards."""
     unit_insight = '<span class="ai-insight good">👍 Healthy unit economics</span>' if (price - unit) / price > 0.65 else ""
-    st.markdown(metric("Unit Economics", f"${unit:.2f}/cup", f"${price - unit:.2f} gross margin", "", "gold", unit_insight), unsafe_allow_html=True)
+    return [
+        metric("Monthly Revenue", f"${rev:,.0f}", f"{mo_cups:,} cups sold"),
+        metric("Monthly Expenses", f"${exp:,.0f}", f"{(exp/rev*100):.0f}% of revenue" if rev > 0 else ""),
+        metric("Net Profit", f"${profit:,.0f}", f"{margin:.1f}% margin",
+            "positive" if profit >= 0 else "negative", "success" if profit >= 0 else "error", get_insight(margin)),
+        metric("Unit Economics", f"${unit:.2f}/cup", f"${price - unit:.2f} gross margin", "", "gold", unit_insight),
+    ]
+
+@st.fragment
+def dashboard_section(rev, exp, mo_cups, profit, margin, price, unit):
+    """Revenue, expenses, net profit and unit economics cards."""
+    st.markdown('<div class="section-header">📊 Financial Dashboard</div>', unsafe_allow_html=True)
+
+    html = cards('dashboard', dashboard_cards, rev, exp, mo_cups, profit, margin, price, unit)
+    for row in (html[:2], html[2:]):
+        for col, card in zip(st.columns(2), row):
+            with col:
+                st.markdown(card, unsafe_allow_html=True)
+
+timer.section("FINANCIAL DASHBOARD")
+dashboard_section(rev, exp, mo_cups, profit, margin, price, unit)
 
 st.divider()
 
 # ============================================================================
 # RISK ANALYSIS
 # ============================================================================
-st.markdown('<div class="section-header">⚠️ Risk Indicators</div>', unsafe_allow_html=True)
+@st.fragment
+def risk_section(rent_r, labor_r, cogs_r):
+    """Rent, labor and COGS ratios against their targets."""
+    st.markdown('<div class="section-header">⚠️ Risk Indicators</div>', unsafe_allow_html=True)
 
-if rent_r > 15:
-    st.markdown(alert("error", f"🏠 Rent Ratio: {rent_r:.1f}%", "DANGER - You're working for the landlord. Target: <15%"), unsafe_allow_html=True)
-elif rent_r >= 10:
-    st.markdown(alert("warning", f"🏠 Rent Ratio: {rent_r:.1f}%", "Elevated. Ideal target: <10%"), unsafe_allow_html=True)
-else:
-    st.markdown(alert("success", f"🏠 Rent Ratio: {rent_r:.1f}%", "Healthy occupancy cost"), unsafe_allow_html=True)
+    if rent_r > 15:
+        st.markdown(alert("error", f"🏠 Rent Ratio: {rent_r:.1f}%", "DANGER - You're working for the landlord. Target: <15%"), unsafe_allow_html=True)
+    elif rent_r >= 10:
+        st.markdown(alert("warning", f"🏠 Rent Ratio: {rent_r:.1f}%", "Elevated. Ideal target: <10%"), unsafe_allow_html=True)
+    else:
+        st.markdown(alert("success", f"🏠 Rent Ratio: {rent_r:.1f}%", "Healthy occupancy cost"), unsafe_allow_html=True)
 
-if labor_r > 35:
-    st.markdown(alert("error", f"👥 Labor Ratio: {labor_r:.1f}%", "Too high. Reduce hours or headcount. Target: <35%"), unsafe_allow_html=True)
-else:
-    st.markdown(alert("success", f"👥 Labor Ratio: {labor_r:.1f}%", "Labor costs controlled"), unsafe_allow_html=True)
+    if labor_r > 35:
+        st.markdown(alert("error", f"👥 Labor Ratio: {labor_r:.1f}%", "Too high. Reduce hours or headcount. Target: <35%"), unsafe_allow_html=True)
+    else:
+        st.markdown(alert("success", f"👥 Labor Ratio: {labor_r:.1f}%", "Labor costs controlled"), unsafe_allow_html=True)
 
-if cogs_r > 30:
-    st.markdown(alert("warning", f"☕ COGS Ratio: {cogs_r:.1f}%", "High. Negotiate better supplier pricing. Target: <30%"), unsafe_allow_html=True)
-else:
-    st.markdown(alert("success", f"☕ COGS Ratio: {cogs_r:.1f}%", "Good cost control"), unsafe_allow_html=True)
+    if cogs_r > 30:
+        st.markdown(alert("warning", f"☕ COGS Ratio: {cogs_r:.1f}%", "High. Negotiate better supplier pricing. Target: <30%"), unsafe_allow_html=True)
+    else:
+        st.markdown(alert("success", f"☕ COGS Ratio: {cogs_r:.1f}%", "Good cost control"), unsafe_allow_html=True)
+
+timer.section("RISK ANALYSIS")
+risk_section(rent_r, labor_r, cogs_r)
 
 st.divider()
 
 # ============================================================================
 # DONUT CHART - Commercial Quality
 # ============================================================================
-st.markdown('<div class="section-header">📈 Cost Structure</div>', unsafe_allow_html=True)
-
-labels = ['COGS', 'Labor', 'Base Rent', 'NNN', 'Utilities']
-values = [cogs, labor, rent_b, rent_n, util]
-# Brighter, vibrant commercial colors
-colors_chart = ['#00A86B', '#E63946', '#1E90FF', '#9B59B6', '#F39C12']
-
-fig_donut = go.Figure(data=[go.Pie(
-    labels=labels, values=values, hole=0.55,
-    marker=dict(colors=colors_chart, line=dict(color='white', width=3)),
-    textinfo='percent+label', textposition='outside',
-    textfont=dict(size=12, family='Arial', color='#1A3C40'),
-    hovertemplate='<b>%{label}</b><br>$%{value:,.0f}<br>%{percent}<extra></extra>',
-    pull=[0.02, 0.02, 0.02, 0.02, 0.02]
-)])
-
-fig_donut.add_annotation(
-    text=f"<b>${exp:,.0f}</b><br><span style='font-size:12px;color:#6C757D'>Total/Month</span>",
-    x=0.5, y=0.5, font=dict(size=24, color='#1A3C40', family='Arial Black'), showarrow=False
-)
+@st.fragment
+def cost_structure_section(cogs, labor, rent_b, rent_n, util, exp):
+    """Monthly cost structure donut."""
+    st.markdown('<div class="section-header">📈 Cost Structure</div>', unsafe_allow_html=True)
 
-fig_donut.update_layout(
-    height=450, showlegend=True,
-    legend=dict(orientation="h", yanchor="bottom", y=-0.12, xanchor="center", x=0.5, 
-                font=dict(size=12, family='Arial')),
-    margin=dict(l=30, r=30, t=30, b=70), 
-    paper_bgcolor='rgba(0,0,0,0)'
-)
-st.plotly_chart(fig_donut, use_container_width=True)
+    chart(figure('donut_figure', cogs, labor, rent_b, rent_n, util, exp), use_container_width=True)
+
+timer.section("DONUT CHART")
+cost_structure_section(cogs, labor, rent_b, rent_n, util, exp)
 
 # ============================================================================
 # BREAK-EVEN & PAYBACK ANALYSIS
 # ============================================================================
-st.markdown('<div class="section-header">📊 Break-even & Payback Analysis</div>', unsafe_allow_html=True)
+@st.fragment
+def breakeven_section(price, unit, cups, days, mo_cups, profit, payback, proj_months, capex,
+                      fixed, be_cups_month, be_cups_day, debt_month=0.0):
+    """Break-even volume, payback period and the revenue vs cost chart."""
+    st.markdown('<div class="section-header">📊 Break-even & Payback Analysis</div>', unsafe_allow_html=True)
 
-if price > unit:
-    fixed = labor + rent_t + util
-    be_cups_month = fixed / (price - unit)
-    be_cups_day = be_cups_month / days
-    
-    # Surplus/Deficit calculation
-    cups_surplus = cups - be_cups_day
-    profit_per_cup = price - unit
+    if price > unit:
+        # Surplus/Deficit calculation
+        cups_surplus = cups - be_cups_day
+        profit_per_cup = price - unit
     
-    # Display metrics in cards
-    col_be1, col_be2 = st.columns(2)
+        # Display metrics in cards
+        col_be1, col_be2 = st.columns(2)
     
-    with col_be1:
-        st.markdown(f"""
-        <div class="metric-card">
-            <div class="metric-label">☕ BREAK-EVEN POINT</div>
-            <div class="metric-value">{be_cups_day:.0f} cups/day</div>
-            <div class="metric-delta">or {be_cups_month:,.0f} cups/month</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col_be2:
-        if cups_surplus > 0:
-            st.markdown(f"""
-            <div class="metric-card">
-                <div class="metric-label">📈 YOUR PROJECTION</div>
-                <div class="metric-value success">{cups} cups/day</div>
-                <div class="metric-delta positive">+{cups_surplus:.0f} cups above break-even ✓</div>
-            </div>
-            """, unsafe_allow_html=True)
-        else:
+        with col_be1:
             st.markdown(f"""
             <div class="metric-card">
-                <div class="metric-label">📉 YOUR PROJECTION</div>
-                <div class="metric-value error">{cups} cups/day</div>
-                <div class="metric-delta negative">{cups_surplus:.0f} cups below break-even ✗</div>
+                <div class="metric-label">☕ BREAK-EVEN POINT</div>
+                <div class="metric-value">{be_cups_day:.0f} cups/day</div>
+                <div class="metric-delta">or {be_cups_month:,.0f} cups/month{f" • incl. ${debt_month:,.0f}/mo debt service" if debt_month else ""}</div>
             </div>
             """, unsafe_allow_html=True)
     
-    # Payback Period with Date
-    col_pb1, col_pb2 = st.columns(2)
-    
-    with col_pb1:
-        if profit > 0:
-            payback_months = (reno + equip) / profit
-            payback_years = int(payback_months // 12)
-            payback_mo = int(payback_months % 12)
+        with col_be2:
+            if cups_surplus > 0:
+                st.markdown(f"""
+                <div class="metric-card">
+                    <div class="metric-label">📈 YOUR PROJECTION</div>
+                    <div class="metric-value success">{cups} cups/day</div>
+                    <div class="metric-delta positive">+{cups_surplus:.0f} cups above break-even ✓</div>
+                </div>
+                """, unsafe_allow_html=True)
+            else:
+                st.markdown(f"""
+                <div class="metric-card">
+                    <div class="metric-label">📉 YOUR PROJECTION</div>
+                    <div class="metric-value error">{cups} cups/day</div>
+                    <div class="metric-delta negative">{cups_surplus:.0f} cups below break-even ✗</div>
+                </div>
+                """, unsafe_allow_html=True)
+    
+        # Payback Period with Date
+        col_pb1, col_pb2 = st.columns(2)
+    
+        # Payback comes from the month-by-month projection (ramp-up, escalations)
+        payback_months = payback
+        with col_pb1:
+            if np.isfinite(payback_months):
+                payback_years = int(payback_months // 12)
+                payback_mo = int(payback_months % 12)
             
-            from datetime import datetime, timedelta
-            today = datetime.now()
-            payback_date = today + timedelta(days=payback_months * 30)
+                today = datetime.now()
+                payback_date = today + timedelta(days=payback_months * 30)
             
-            st.markdown(f"""
-            <div class="metric-card">
-                <div class="metric-label">⏰ PAYBACK PERIOD</div>
-                <div class="metric-value gold">{payback_years}y {payback_mo}m</div>
-                <div class="metric-delta">({payback_months:.1f} months total)</div>
-            </div>
-            """, unsafe_allow_html=True)
-        else:
-            st.markdown(f"""
-            <div class="metric-card">
-                <div class="metric-label">⏰ PAYBACK PERIOD</div>
-                <div class="metric-value error">N/A</div>
-                <div class="metric-delta negative">Not profitable - cannot payback</div>
-            </div>
-            """, unsafe_allow_html=True)
-    
-    with col_pb2:
+                st.markdown(f"""
+                <div class="metric-card">
+                    <div class="metric-label">⏰ PAYBACK PERIOD</div>
+                    <div class="metric-value gold">{payback_years}y {payback_mo}m</div>
+                    <div class="metric-delta">({payback_months:.1f} months total)</div>
+                </div>
+                """, unsafe_allow_html=True)
+            else:
+                st.markdown(f"""
+                <div class="metric-card">
+                    <div class="metric-label">⏰ PAYBACK PERIOD</div>
+                    <div class="metric-value error">N/A</div>
+                    <div class="metric-delta negative">{"Not profitable - cannot payback" if profit <= 0 else f"Not recovered within {proj_months} months"}</div>
+                </div>
+                """, unsafe_allow_html=True)
+    
+        with col_pb2:
+            if np.isfinite(payback_months):
+                st.markdown(f"""
+                <div class="metric-card">
+                    <div class="metric-label">📅 TIME TO PAYBACK</div>
+                    <div class="metric-value gold">In {payback_months:.0f} months</div>
+                    <div class="metric-delta">Based on ${profit:,.0f}/month profit</div>
+                </div>
+                """, unsafe_allow_html=True)
+            else:
+                st.markdown(f"""
+                <div class="metric-card">
+                    <div class="metric-label">📅 TIME TO PAYBACK</div>
+                    <div class="metric-value error">Never</div>
+                    <div class="metric-delta negative">{f"Losing ${abs(profit):,.0f}/month" if profit <= 0 else f"Beyond the {proj_months}-month projection"}</div>
+                </div>
+                """, unsafe_allow_html=True)
+    
+        # Summary Alert
         if profit > 0:
-            st.markdown(f"""
-            <div class="metric-card">
-                <div class="metric-label">📅 TIME TO PAYBACK</div>
-                <div class="metric-value gold">In {payback_months:.0f} months</div>
-                <div class="metric-delta">Based on ${profit:,.0f}/month profit</div>
-            </div>
-            """, unsafe_allow_html=True)
+            monthly_profit_per_cup = profit / mo_cups
+            st.markdown(alert("success", "✅ PROFITABLE MODEL", 
+                f"You're selling {cups_surplus:.0f} cups/day above break-even. Each cup contributes ${profit_per_cup:.2f} to cover fixed costs. "
+                f"Total monthly profit: ${profit:,.0f}. CapEx of ${capex:,.0f} will be recovered in "
+                + (f"{payback_years}y {payback_mo}m ({payback_months:.0f} months)." if np.isfinite(payback_months) else f"more than {proj_months} months.")), 
+                unsafe_allow_html=True)
         else:
+            cups_needed_extra = abs(cups_surplus)
+            st.markdown(alert("error", "❌ NOT PROFITABLE", 
+                f"You need to sell {cups_needed_extra:.0f} more cups/day to break even. "
+                f"Current loss: ${abs(profit):,.0f}/month. Consider: increasing price, reducing costs, or boosting sales."), 
+                unsafe_allow_html=True)
+    
+        # Break-even Chart (always visible) - Commercial quality
+        chart(figure('breakeven_figure', price, unit, cups, days, fixed, be_cups_day), use_container_width=True, config={'displayModeBar': False, 'staticPlot': False})
+    else:
+        st.warning("⚠️ Price is below unit cost - cannot calculate break-even point. Raise your price!")
+
+timer.section("BREAK-EVEN & PAYBACK ANALYSIS")
+breakeven_section(price, unit, cups, days, mo_cups, net_profit, payback, proj_months, equity_capex,
+                  fixed, be_cups_month, be_cups_day, debt_month)
+
+# Price × volume grid - cached on everything except price and cups/day
+@st.cache_data(max_entries=16, show_spinner=False)
+def price_volume_grid(grid_inputs, proj_months, proj_assumptions, loans):
+    return surface.price_volume_grid(grid_inputs, months=proj_months, assumptions=proj_assumptions, loans=loans)
+
+@st.fragment
+def price_volume_section(grid_inputs, price, cups, proj_months, proj_assumptions, loans):
+    """Profit or runway heatmap over price × cups/day; switching the metric reruns only this fragment."""
+    grid = price_volume_grid(grid_inputs, proj_months, proj_assumptions, loans)
+    grid_metric = st.radio("Price × Volume Grid", ["Monthly Profit", "Cash Runway"], horizontal=True)
+
+    # The heatmap is built once per grid and metric; only the plan marker
+    # follows price and cups/day
+    heatmap = figure('price_volume_figure', grid, grid_metric)
+    chart(figures.with_point(heatmap, 'Your Plan', price, cups), use_container_width=True,
+          config={'displayModeBar': False})
+
+price_volume_section({k: v for k, v in inputs.items() if k not in ('price', 'cups')}, price, cups,
+                     proj_months, proj_assumptions, loans)
+
+# ============================================================================
+# SENSITIVITY ANALYSIS
+# ============================================================================
+SENS_METRICS = {
+    'Net Profit ($/mo)': 'profit', 'Net Margin (%)': 'margin',
+    'Cash Runway (months)': 'runway', 'Break-even (cups/day)': 'be_cups_day'
+}
+
+@st.fragment
+def sensitivity_section(inputs, proj_months, proj_assumptions, loans):
+    """Tornado chart and elasticities; changing the metric or nudge reruns only this fragment.
+
+    Runway and break-even match the dashboard's: projected, and after debt service with `loans`.
+    """
+    st.markdown('<div class="section-header">🌪️ Sensitivity Analysis</div>', unsafe_allow_html=True)
+
+    col_s1, col_s2 = st.columns([2, 1])
+    with col_s1:
+        sens_label = st.selectbox("Which metric?", list(SENS_METRICS))
+    with col_s2:
+        sens_pct = st.number_input("Nudge each input by (±%)", 1.0, 50.0, 10.0, 1.0)
+
+    sens = sensitivity.sensitivity(inputs, sens_pct, months=proj_months, assumptions=proj_assumptions,
+                                   loans=loans)[SENS_METRICS[sens_label]]
+
+    if not np.isfinite(sens['base']):
+        st.info(f"ℹ️ {sens_label} is not finite for this scenario, so there is nothing to compare against.")
+    else:
+        # Largest swings at the top; Plotly draws horizontal bars bottom-up
+        order = [i for i in np.argsort(np.nan_to_num(sens['swing'], nan=-1, posinf=np.finfo(float).max))
+                 if sens['swing'][i] > 0][-10:]
+        names = [sensitivity.LABELS[model.INPUTS[i]] for i in order]
+        low = np.where(np.isfinite(sens['low'][order]), sens['low'][order] - sens['base'], np.nan)
+        high = np.where(np.isfinite(sens['high'][order]), sens['high'][order] - sens['base'], np.nan)
+    
+        chart(figure('tornado_figure', names, low, high, sens['base'], sens_label, sens_pct), use_container_width=True, config={'displayModeBar': False})
+    
+        elastic = [(sensitivity.LABELS[model.INPUTS[i]], sens['elasticity'][i]) for i in order[::-1]
+                   if np.isfinite(sens['elasticity'][i])][:6]
+        if elastic:
+            rows = "<br>".join(f"• {name}: 1% higher → {e:+.2f}% {sens_label.split(' (')[0].lower()}" for name, e in elastic)
             st.markdown(f"""
-            <div class="metric-card">
-                <div class="metric-label">📅 TIME TO PAYBACK</div>
-                <div class="metric-value error">Never</div>
-                <div class="metric-delta negative">Losing ${abs(profit):,.0f}/month</div>
-            </div>
+    <div class="metric-card">
+    <div class="metric-label">📐 ELASTICITIES</div>
+    <div style="font-size:0.9rem; color:#2C3E50;">
+    {rows}
+    </div>
+    </div>
             """, unsafe_allow_html=True)
-    
-    # Summary Alert
-    if profit > 0:
-        monthly_profit_per_cup = profit / mo_cups
-        st.markdown(alert("success", "✅ PROFITABLE MODEL", 
-            f"You're selling {cups_surplus:.0f} cups/day above break-even. Each cup contributes ${profit_per_cup:.2f} to cover fixed costs. "
-            f"Total monthly profit: ${profit:,.0f}. CapEx of ${reno+equip:,.0f} will be recovered in {payback_years}y {payback_mo}m ({payback_months:.0f} months)."), 
-            unsafe_allow_html=True)
+
+timer.section("SENSITIVITY ANALYSIS")
+sensitivity_section(inputs, proj_months, proj_assumptions, loans)
+
+# ============================================================================
+# PLAN OPTIMIZER
+# ============================================================================
+OPT_GOALS = {'Max Profit': 'profit', 'Fastest Payback': 'payback'}
+
+@st.fragment
+def optimizer_section(inputs, proj_months, proj_assumptions, loans, net_profit, be_cups_day):
+    """Best price and staffing under the risk limits; only this fragment reruns while tuning it.
+
+    With `loans` the plans are compared after debt service, like `net_profit`
+    and `be_cups_day` of the current plan.
+    """
+    st.markdown('<div class="section-header">🎯 Plan Optimizer</div>', unsafe_allow_html=True)
+
+    if not st.toggle("Find the best price & staffing", value=False,
+                     help="Searches price, employees and hours for the best plan that keeps labor ≤35%, "
+                          "rent ≤15% and COGS ≤30% of revenue."):
+        return
+
+    col_o1, col_o2, col_o3 = st.columns(3)
+    with col_o1:
+        goal = st.radio("Goal", list(OPT_GOALS))
+    with col_o2:
+        elasticity = st.number_input("Price Elasticity", 0.0, 3.0, 1.0, 0.1,
+                                     help="% fewer cups/day for every 1% higher price, from your current plan.")
+    with col_o3:
+        throughput = st.number_input("Cups per Staff-Hour", 2.0, 40.0, 10.0, 1.0,
+                                     help="Most cups one employee serves per hour worked; caps cups/day.")
+
+    opt = results.get_or_compute(
+        cache.cache_key('optimize', inputs, goal, elasticity, throughput, proj_months, proj_assumptions, loans),
+        lambda: optimize.optimize(inputs, OPT_GOALS[goal], elasticity, throughput,
+                                  months=proj_months, assumptions=proj_assumptions, loans=loans))
+    best = opt['best']
+
+    if best is None:
+        c = opt['closest']
+        st.markdown(alert("error", "🚫 NO PLAN MEETS EVERY LIMIT",
+            f"Closest: ${c['price']:.2f}/cup with {c['staff']} staff × {c['hrs']:.1f}h ({c['cups']:.0f} cups/day) → "
+            f"labor {c['labor_r']:.1f}%, rent {c['rent_r']:.1f}%, COGS {c['cogs_r']:.1f}%. "
+            f"Lower rent or costs, or check that your capital and loans cover the CapEx."), unsafe_allow_html=True)
     else:
-        cups_needed_extra = abs(cups_surplus)
-        st.markdown(alert("error", "❌ NOT PROFITABLE", 
-            f"You need to sell {cups_needed_extra:.0f} more cups/day to break even. "
-            f"Current loss: ${abs(profit):,.0f}/month. Consider: increasing price, reducing costs, or boosting sales."), 
+        pb = f"{int(best['payback']//12)}y {int(best['payback']%12)}m" if best['payback'] < 120 else "N/A"
+        c1, c2 = st.columns(2)
+        with c1:
+            st.markdown(metric("Optimized Plan", f"${best['price']:.2f}/cup",
+                f"{best['staff']} staff × {best['hrs']:.1f}h • {best['cups']:.0f} cups/day", "", "gold"), unsafe_allow_html=True)
+        with c2:
+            gain = best['net_profit'] - net_profit
+            st.markdown(metric("Optimized Profit After Debt" if loans else "Optimized Profit", f"${best['net_profit']:,.0f}/mo",
+                f"{'+' if gain >= 0 else '-'}${abs(gain):,.0f} vs your plan • payback {pb}",
+                "positive" if gain >= 0 else "negative", "success" if best['net_profit'] >= 0 else "error"), unsafe_allow_html=True)
+
+    if opt['frontier']:
+        front = opt['frontier']
+        chart(figure('frontier_figure', [p['net_profit'] for p in front], [p['be_cups_day'] for p in front],
+                     (best['net_profit'], best['be_cups_day']) if best else None, (net_profit, be_cups_day)),
+              use_container_width=True, config={'displayModeBar': False})
+    st.caption(f"{opt['evaluated']:,} plans evaluated • {opt['feasible']:,} within the risk limits")
+
+timer.section("PLAN OPTIMIZER")
+optimizer_section(inputs, proj_months, proj_assumptions, loans, net_profit, be_cups_day)
+
+# ============================================================================
+# LABOR SCHEDULE
+# ============================================================================
+def plan_schedule(cups, open_hour, close_hour, rate, min_staff, staff, hrs):
+    """Hourly demand, the optimized roster and the flat plan's roster with their coverage."""
+    demand = schedule.demand(cups, open_hour, close_hour)
+    plan = schedule.optimize(demand, rate, min_staff, open_hour, close_hour)
+    flat = schedule.flat(staff, hrs, open_hour, close_hour)
+    return demand, plan, flat, schedule.coverage(demand, plan['staff'], rate), schedule.coverage(demand, flat, rate)
+
+@st.fragment
+def schedule_section(cups, staff, hrs, days, wage, burden, rev, labor, labor_r, open_hour, close_hour):
+    """Hour-by-hour demand and the fewest-hours shift schedule; only this fragment reruns while tuning it."""
+    st.markdown('<div class="section-header">🗓️ Labor Schedule</div>', unsafe_allow_html=True)
+
+    if not st.toggle("Plan shifts by hour", value=False,
+                     help="Spreads cups/day over the week's busy hours and finds the shift schedule with the "
+                          "fewest labor hours that keeps every barista under the service level."):
+        return
+
+    col_s1, col_s2 = st.columns(2)
+    with col_s1:
+        rate = st.number_input("Max Cups per Barista-Hour", 5.0, 60.0, 25.0, 1.0,
+                               help="Service level: most cups one barista makes in an hour without a queue building.")
+    with col_s2:
+        min_staff = st.number_input("Min Baristas On Duty", 1, 5, 1)
+
+    demand, plan, flat, plan_cov, flat_cov = results.get_or_compute(
+        cache.cache_key('schedule', cups, open_hour, close_hour, rate, min_staff, staff, hrs),
+        lambda: plan_schedule(cups, open_hour, close_hour, rate, min_staff, staff, hrs))
+    sched_labor = schedule.monthly_labor(plan['weekly_hours'], days, wage, burden)
+    sched_r = sched_labor / rev * 100 if rev > 0 else 0.0
+    short = int((flat_cov['under'] > 0).sum())
+
+    c1, c2, c3 = st.columns(3)
+    with c1:
+        st.markdown(metric("Scheduled Hours", f"{plan['weekly_hours']:,}/week",
+            f"vs {int(flat.sum()):,} flat ({staff} × {hrs:.1f}h daily)", "", "gold"), unsafe_allow_html=True)
+    with c2:
+        saving = labor - sched_labor
+        st.markdown(metric("Scheduled Labor", f"{sched_r:.1f}% of revenue",
+            f"{'-' if saving >= 0 else '+'}${abs(saving):,.0f}/mo vs {labor_r:.1f}% flat",
+            "positive" if saving >= 0 else "negative", "success" if sched_r <= 35 else "error"),
             unsafe_allow_html=True)
-    
-    # Break-even Chart (always visible) - Commercial quality
-    x = np.linspace(0, cups * 1.5, 50)
-    rev_l = x * price * days
-    cost_l = (x * unit * days) + fixed
-    
-    fig_be = go.Figure()
-    # Brighter, vibrant colors
-    fig_be.add_trace(go.Scatter(x=x, y=rev_l, name='Revenue', 
-        line=dict(color='#00A86B', width=4),
-        fill='tozeroy', fillcolor='rgba(0, 168, 107, 0.08)'))
-    fig_be.add_trace(go.Scatter(x=x, y=cost_l, name='Total Cost', 
-        line=dict(color='#E63946', width=4)))
-    
-    # Break-even label at top
-    fig_be.add_vline(x=be_cups_day, line_dash="dash", line_color='#D4A855', line_width=2,
-        annotation_text=f"☕ Break-even: {be_cups_day:.0f}/day", 
-        annotation_position="top left",
-        annotation_font=dict(size=12, color='#D4A855', family='Arial'))
-    
-    fig_be.update_layout(
-        title=dict(text="📈 Revenue vs Cost by Daily Sales Volume", font=dict(size=16, color=COLORS['primary'], family='Arial Black')),
-        xaxis=dict(
-            title=dict(text="Cups/Day", font=dict(size=14, color='#1A3C40', family='Arial')),
-            showgrid=True, gridcolor='rgba(0,0,0,0.08)', zeroline=False,
-            tickfont=dict(size=13, color='#1A3C40', family='Arial'),
-            fixedrange=True  # Disable zoom on x-axis
-        ),
-        yaxis=dict(
-            title=dict(text="$/Month", font=dict(size=14, color='#1A3C40', family='Arial')),
-            showgrid=True, gridcolor='rgba(0,0,0,0.08)', zeroline=False,
-            tickfont=dict(size=13, color='#1A3C40', family='Arial'),
-            fixedrange=True  # Disable zoom on y-axis
-        ),
-        height=420, template="plotly_white", 
-        legend=dict(orientation="h", y=1.12, font=dict(size=13, color='#1A3C40', family='Arial')),
-        margin=dict(l=20, r=20, t=70, b=50), 
-        plot_bgcolor='rgba(255,255,255,0.95)', paper_bgcolor='rgba(0,0,0,0)',
-        dragmode=False  # Completely disable drag/zoom
-    )
-    st.plotly_chart(fig_be, use_container_width=True, config={'displayModeBar': False, 'staticPlot': False})
-else:
-    st.warning("⚠️ Price is below unit cost - cannot calculate break-even point. Raise your price!")
+    with c3:
+        st.markdown(metric("Flat Plan Coverage", f"{flat_cov['served'] * 100:.0f}% of cups",
+            f"{short} short-staffed hours/week • {flat_cov['over'].sum():,.0f} idle barista-hours",
+            "negative" if short else "", "error" if short else "success"), unsafe_allow_html=True)
+
+    roster = st.radio("Show", ["Optimized schedule", "Your flat staffing"], horizontal=True)
+    staff_grid = plan['staff'] if roster == "Optimized schedule" else flat
+    chart(figure('schedule_figure', demand, staff_grid, rate, f"🗓️ {roster}: Baristas vs Demand"),
+          use_container_width=True, config={'displayModeBar': False})
+    st.caption("Shifts: " + " • ".join(
+        f"{day} " + ", ".join(f"{s}:00–{s + n}:00" for s, n in shifts)
+        for day, shifts in zip(schedule.DAYS, plan['shifts'])))
+    st.caption(f"{plan['evaluated']:,} shift patterns tested • optimized schedule idles "
+               f"{plan_cov['over'].sum():,.0f} barista-hours/week")
+
+timer.section("LABOR SCHEDULE")
+schedule_section(demand_cups, staff, hrs, days, wage, burden, rev, labor, m['labor_r'], open_hour, close_hour)
+
+# ============================================================================
+# BAR CAPACITY
+# ============================================================================
+@st.fragment
+def bar_section(bar, demand_cups, cups, price, days, cap_sales, open_hour, close_hour):
+    """Throughput, waits and walk-aways from a simulated year of the espresso bar."""
+    st.markdown('<div class="section-header">⏱️ Bar Capacity</div>', unsafe_allow_html=True)
+    if bar is None:
+        st.caption("Sales are not capped by the bar. Turn on the bar queue simulation in the sidebar "
+                   "for waits and walk-aways.")
+        return
+
+    lost = demand_cups * (1 - bar['served_share'])
+    c1, c2, c3 = st.columns(3)
+    with c1:
+        st.markdown(metric("Bar Capacity", f"{bar['capacity']:.0f} cups/hour",
+            f"limited by {bar['bottleneck']} • busiest hour served {bar['peak_served']}", "", "gold"),
+            unsafe_allow_html=True)
+    with c2:
+        st.markdown(metric("Wait in Line", f"{bar['wait_mean']:.1f} min avg",
+            f"P90 {bar['wait_p90']:.1f} min • worst {bar['wait_max']:.0f} min",
+            "negative" if bar['wait_p90'] > 5 else "", "error" if bar['wait_p90'] > 5 else "success"),
+            unsafe_allow_html=True)
+    with c3:
+        st.markdown(metric("Lost to Walk-aways", f"{lost:.1f} cups/day",
+            f"${lost * price * days:,.0f}/mo revenue" + (" • deducted" if cap_sales else " • not deducted"),
+            "negative" if lost >= 0.5 else "", "error" if lost >= 0.5 else "success"), unsafe_allow_html=True)
+
+    if bar['balked']:
+        chart(figure('capacity_figure', bar['hourly_wait'], bar['hourly_lost'], open_hour, close_hour),
+              use_container_width=True, config={'displayModeBar': False})
+    st.caption(f"{bar['arrived']:,} customers simulated over a year • {demand_cups} cups/day demand → "
+               f"{cups} sold/day")
+
+timer.section("BAR CAPACITY")
+bar_section(bar, demand_cups, cups, price, days, cap_sales, open_hour, close_hour)
+
+# ============================================================================
+# INVENTORY & WASTE
+# ============================================================================
+@st.fragment
+def inventory_section(stock, menu_table, bean, milk, oat, pkg, unit, mo_cups):
+    """Chosen ordering policy, spoilage and stock-outs per ingredient."""
+    st.markdown('<div class="section-header">📦 Inventory & Waste</div>', unsafe_allow_html=True)
+    if stock is None:
+        st.caption(f"Flat {inventory.FLAT_WASTE - 1:.0%} waste assumed on beans and milk. "
+                   "Turn on the inventory simulation in the sidebar for true waste.")
+        return
+
+    flat_unit = menu.unit_cost(menu_table, bean, milk, oat, pkg, dict.fromkeys(inventory.ITEMS, inventory.FLAT_WASTE))
+    saving = (flat_unit - unit) * mo_cups
+    waste_cost = sum(v['waste_pct'] for v in stock.values()) / len(stock)
+    c1, c2 = st.columns(2)
+    with c1:
+        st.markdown(metric("Effective COGS", f"${unit:.2f}/cup",
+            f"{'-' if saving >= 0 else '+'}${abs(saving):,.0f}/mo vs flat {inventory.FLAT_WASTE - 1:.0%} waste",
+            "positive" if saving >= 0 else "negative", "gold"), unsafe_allow_html=True)
+    with c2:
+        worst = min(stock.values(), key=lambda v: v['fill'])
+        st.markdown(metric("Average Waste", f"{waste_cost:.1f}% of purchases",
+            f"lowest in-stock rate {worst['fill'] * 100:.1f}% • {sum(v['stockout_days'] for v in stock.values())} "
+            f"stock-out days/year", "", "success" if waste_cost <= 10 else "error"), unsafe_allow_html=True)
+
+    st.dataframe({
+        'Ingredient': [inventory.ITEMS[k]['label'] for k in stock],
+        'Reorder At': [f"{v['reorder']:.1f} {inventory.ITEMS[k]['unit']} ({v['reorder_days']:g} days)" for k, v in stock.items()],
+        'Order Up To': [f"{v['order_up_to']:.1f} {inventory.ITEMS[k]['unit']}" for k, v in stock.items()],
+        'Orders/Month': [v['orders_per_month'] for v in stock.values()],
+        'Waste %': [v['waste_pct'] for v in stock.values()],
+        'In Stock %': [v['fill'] * 100 for v in stock.values()],
+        'Stock-out Days/yr': [v['stockout_days'] for v in stock.values()],
+        'Waste Factor': [v['factor'] for v in stock.values()],
+    }, hide_index=True, use_container_width=True, column_config={
+        'Orders/Month': st.column_config.NumberColumn(format="%.1f"),
+        'Waste %': st.column_config.NumberColumn(format="%.1f%%"),
+        'In Stock %': st.column_config.NumberColumn(format="%.1f%%"),
+        'Waste Factor': st.column_config.NumberColumn(format="×%.3f"),
+    })
+    chart(figure('inventory_figure', {inventory.ITEMS[k]['label']: (v['variants']['fill'], v['variants']['waste_pct'],
+                                                                     v['fill'], v['waste_pct']) for k, v in stock.items()}),
+          use_container_width=True, config={'displayModeBar': False})
+    st.caption(f"{sum(len(v['variants']['fill']) for v in stock.values())} ordering policies simulated "
+               f"over a year of daily demand, spoilage and delivery lead times")
+
+timer.section("INVENTORY & WASTE")
+inventory_section(stock, menu_table, bean, milk, oat, pkg, unit, mo_cups)
+
+# ============================================================================
+# FINANCING
+# ============================================================================
+@st.fragment
+def financing_section(fin, debt_sched, profit, runway, payback, proj_months):
+    """Debt service, coverage, levered runway/payback, the amortization schedule and lender offers."""
+    st.markdown('<div class="section-header">🏦 Financing</div>', unsafe_allow_html=True)
+    if fin is None:
+        st.caption("All-equity plan. Turn on debt financing in the sidebar to add a term loan or line of credit.")
+        return
+
+    def months(x, never):
+        return f"{x:.1f} months" if np.isfinite(x) else never
+
+    covered = fin['dscr'] >= fin['threshold']
+    c1, c2, c3 = st.columns(3)
+    with c1:
+        st.markdown(metric("Debt Service", f"${fin['debt_service']:,.0f}/mo",
+            f"${fin['debt']:,.0f} borrowed • ${fin['total_interest']:,.0f} total interest", "", "gold"),
+            unsafe_allow_html=True)
+    with c2:
+        st.markdown(metric("Profit After Debt", f"${fin['profit_after_debt']:,.0f}/mo",
+            f"${profit:,.0f} before debt service", "positive" if fin['profit_after_debt'] >= 0 else "negative",
+            "success" if fin['profit_after_debt'] >= 0 else "error"), unsafe_allow_html=True)
+    with c3:
+        st.markdown(metric("DSCR", f"{fin['dscr']:.2f}x" if np.isfinite(fin['dscr']) else "∞",
+            f"{fin['lender']} needs ≥ {fin['threshold']:.2f} • lowest year {fin['dscr_min']:.2f}x",
+            "positive" if covered else "negative", "success" if covered else "error"), unsafe_allow_html=True)
+    c1, c2 = st.columns(2)
+    with c1:
+        st.markdown(metric("Levered Runway", months(runway, "∞"),
+            f"{months(fin['unlevered_runway'], '∞')} without debt"), unsafe_allow_html=True)
+    with c2:
+        st.markdown(metric("Levered Payback", months(payback, "N/A"),
+            f"{months(fin['unlevered_payback'], 'N/A')} without debt • equity CapEx only"), unsafe_allow_html=True)
+    if not covered:
+        st.markdown(alert("error", "🚫 BELOW LENDER COVERAGE",
+            f"Operating profit covers debt service {fin['dscr']:.2f}x; {fin['lender']} lenders look for "
+            f"{fin['threshold']:.2f}x. Borrow less, or stretch the term."), unsafe_allow_html=True)
+
+    chart(figure('amortization_figure', debt_sched['interest'], debt_sched['principal'] - debt_sched['balloon'],
+                 debt_sched['balance'], fin['debt']), use_container_width=True, config={'displayModeBar': False})
+
+    o = fin['offers']
+    if o is None:
+        return
+    ok = o['dscr'] >= fin['threshold']
+    only_ok = st.toggle(f"Only offers meeting {fin['lender']} DSCR", value=True)
+    rows = np.flatnonzero(ok) if only_ok else np.arange(len(ok))
+    rows = rows[np.argsort(o['total_interest'][rows], kind='stable')]
+
+    def never(x):
+        return np.where(np.isfinite(x), x, np.nan)[rows]
+
+    st.dataframe({
+        'Rate %': o['rate'][rows] * 100, 'Term (mo)': o['term'][rows].astype(int),
+        'Interest-Only (mo)': o['io'][rows].astype(int), 'Payment': o['payment'][rows],
+        'Total Interest': o['total_interest'][rows], 'DSCR': o['dscr'][rows],
+        'Lowest-Year DSCR': o['dscr_min'][rows], 'Runway (mo)': never(o['runway']),
+        'Payback (mo)': never(o['payback']), 'Meets DSCR': ok[rows],
+    }, hide_index=True, use_container_width=True, height=360, column_config={
+        'Rate %': st.column_config.NumberColumn(format="%.3f%%"),
+        'Payment': st.column_config.NumberColumn(format="$%.0f"),
+        'Total Interest': st.column_config.NumberColumn(format="$%.0f"),
+        'DSCR': st.column_config.NumberColumn(format="%.2fx"),
+        'Lowest-Year DSCR': st.column_config.NumberColumn(format="%.2fx"),
+        'Runway (mo)': st.column_config.NumberColumn(format="%.1f", help="Blank: never runs out of cash."),
+        'Payback (mo)': st.column_config.NumberColumn(format="%.1f", help="Blank: never recovered."),
+    })
+    st.caption(f"{len(ok):,} term-loan offers priced against the {proj_months}-month projection • "
+               f"{int(ok.sum()):,} meet the {fin['threshold']:.2f}x threshold")
+
+timer.section("FINANCING")
+financing_section(fin, debt_sched, profit, runway, payback, proj_months)
 
 # ============================================================================
 # DETAILED BREAKDOWN (always visible)
 # ============================================================================
-st.markdown('<div class="section-header">📋 Full Financial Breakdown</div>', unsafe_allow_html=True)
+def breakdown_cards(rev, mo_cups, price, unit, bean_c, milk_c, food, pkg, exp, cogs, cogs_r, labor, labor_r,
+                    rent_b, rent_n, util, reno, equip, cash, debt=0):
+    """HTML of the revenue, unit cost, expense and CapEx cards; `cash` is before the `debt` proceeds."""
+    return [f"""
+    <div class="metric-card">
+    <div class="metric-label">💰 REVENUE</div>
+    <div style="font-size:0.95rem; color:#2C3E50;">
+    ${rev:,.0f}/month<br>
+    <span style="color:#6C757D;">{mo_cups:,} cups @ ${price:.2f} avg</span>
+    </div>
+    </div>
+        """, f"""
+    <div class="metric-card">
+    <div class="metric-label">☕ UNIT COST: ${unit:.2f}/cup</div>
+    <div style="font-size:0.9rem; color:#2C3E50;">
+    • Coffee beans: ${bean_c:.3f}<br>
+    • Milk: ${milk_c:.3f}<br>
+    • Food: ${food:.3f}<br>
+    • Packaging: ${pkg:.3f}
+    </div>
+    </div>
+        """, f"""
+    <div class="metric-card">
+    <div class="metric-label">📊 EXPENSES: ${exp:,.0f}/mo</div>
+    <div style="font-size:0.9rem; color:#2C3E50;">
+    • COGS: ${cogs:,.0f} ({cogs_r:.1f}%)<br>
+    • Labor: ${labor:,.0f} ({labor_r:.1f}%)<br>
+    • Base Rent: ${rent_b:,.0f}<br>
+    • NNN: ${rent_n:,.0f}<br>
+    • Utilities: ${util:,.0f}
+    </div>
+    </div>
+        """, f"""
+    <div class="metric-card">
+    <div class="metric-label">🏗️ CAPEX: ${reno+equip:,.0f}</div>
+    <div style="font-size:0.9rem; color:#2C3E50;">
+    • Renovation: ${reno:,.0f}<br>
+    • Equipment: ${equip:,.0f}<br>
+    {f"• Loans: ${debt:,.0f}<br>" if debt else ""}
+    • <strong>Cash Reserve: ${cash + debt:,.0f}</strong>
+    </div>
+    </div>
+        """]
 
-col_fin1, col_fin2 = st.columns(2)
+@st.fragment
+def breakdown_section(rev, mo_cups, price, unit, bean_c, milk_c, food, pkg, exp, cogs, cogs_r, labor, labor_r,
+                      rent_b, rent_n, util, reno, equip, cash, debt):
+    """Revenue, unit cost, expense and CapEx cards."""
+    st.markdown('<div class="section-header">📋 Full Financial Breakdown</div>', unsafe_allow_html=True)
 
-with col_fin1:
-    st.markdown(f"""
-<div class="metric-card">
-<div class="metric-label">💰 REVENUE</div>
-<div style="font-size:0.95rem; color:#2C3E50;">
-${rev:,.0f}/month<br>
-<span style="color:#6C757D;">{mo_cups:,} cups @ ${price:.2f} avg</span>
-</div>
-</div>
-    """, unsafe_allow_html=True)
-    
-    st.markdown(f"""
-<div class="metric-card">
-<div class="metric-label">☕ UNIT COST: ${unit:.2f}/cup</div>
-<div style="font-size:0.9rem; color:#2C3E50;">
-• Coffee beans: ${bean_c:.3f}<br>
-• Milk: ${milk_c:.3f}<br>
-• Packaging: ${pkg:.3f}
-</div>
-</div>
-    """, unsafe_allow_html=True)
-
-with col_fin2:
-    st.markdown(f"""
-<div class="metric-card">
-<div class="metric-label">📊 EXPENSES: ${exp:,.0f}/mo</div>
-<div style="font-size:0.9rem; color:#2C3E50;">
-• COGS: ${cogs:,.0f} ({cogs_r:.1f}%)<br>
-• Labor: ${labor:,.0f} ({labor_r:.1f}%)<br>
-• Base Rent: ${rent_b:,.0f}<br>
-• NNN: ${rent_n:,.0f}<br>
-• Utilities: ${util:,.0f}
-</div>
-</div>
-    """, unsafe_allow_html=True)
-    
-    st.markdown(f"""
-<div class="metric-card">
-<div class="metric-label">🏗️ CAPEX: ${reno+equip:,.0f}</div>
-<div style="font-size:0.9rem; color:#2C3E50;">
-• Renovation: ${reno:,.0f}<br>
-• Equipment: ${equip:,.0f}<br>
-• <strong>Cash Reserve: ${cash:,.0f}</strong>
-</div>
-</div>
-    """, unsafe_allow_html=True)
+    html = cards('breakdown', breakdown_cards, rev, mo_cups, price, unit, bean_c, milk_c, food, pkg, exp, cogs, cogs_r,
+                 labor, labor_r, rent_b, rent_n, util, reno, equip, cash, debt)
+    col_fin1, col_fin2 = st.columns(2)
+    with col_fin1:
+        st.markdown(html[0], unsafe_allow_html=True)
+        st.markdown(html[1], unsafe_allow_html=True)
+    with col_fin2:
+        st.markdown(html[2], unsafe_allow_html=True)
+        st.markdown(html[3], unsafe_allow_html=True)
+
+timer.section("DETAILED BREAKDOWN")
+breakdown_section(rev, mo_cups, price, unit, bean_c, milk_c, food, pkg, exp, cogs, cogs_r, labor, labor_r,
+                  rent_b, rent_n, util, reno, equip, cash, debt)
 
 st.divider()
 st.markdown(f'<div style="text-align:center;color:{COLORS["muted"]};font-size:0.8rem;padding:1rem 0;">☕ Coffee Shop Survival Simulator 2026 • Commercial Edition • Q1/2026 US Market Data</div>', unsafe_allow_html=True)
+
+# ============================================================================
+# PERFORMANCE OVERLAY (admin only, via ?admin=<PROFILE_ADMIN_KEY>)
+# ============================================================================
+@st.cache_resource
+def get_rerun_log():
+    """Timings of the last reruns of every session in this process."""
+    return profiling.RerunLog(maxlen=int(os.environ.get("PROFILE_LOG_RERUNS", 50)))
+
+if profiler is not None:
+    store.put(sid, 'profile', profiler.stop())
+record = timer.finish()
+get_rerun_log().add(record)
+telemetry.histogram('app_rerun_seconds', "Full dashboard rerun time.").observe(record['total'])
+section_seconds = telemetry.histogram('app_section_seconds', "Rerun time by script section.", ('section',))
+for name, seconds in record['sections'].items():
+    section_seconds.observe(seconds, section=name)
+
+admin_key = os.environ.get("PROFILE_ADMIN_KEY")
+if admin_key and st.query_params.get("admin") == admin_key:
+    with st.expander("🛠️ Performance", expanded=False):
+        runs = get_rerun_log().runs()
+        st.caption(f"Last {len(runs)} reruns across all sessions • this rerun: {runs[-1]['total'] * 1000:,.0f} ms")
+        st.dataframe(get_rerun_log().summary(), hide_index=True, use_container_width=True,
+                     column_config={k: st.column_config.NumberColumn(format="%.1f") for k in ('mean_ms', 'p95_ms', 'max_ms')})
+        
+        rc = results.stats()
+        st.caption(f"Result cache: {rc['hit_rate']:.0%} hits ({rc['hits']:,}/{rc['hits'] + rc['misses']:,}) • "
+                   f"{rc['entries']:,} entries • {rc['bytes'] / 2**20:,.1f} of {rc['max_bytes'] / 2**20:,.0f} MB • "
+                   f"{rc['evictions']:,} evicted • {rc['expirations']:,} expired")
+        
+        sessions = store.usage()
+        st.caption(f"Session memory: {len(sessions)} sessions • {sum(r['total'] for r in sessions) / 2**20:,.1f} MB held • "
+                   f"{store.evicted:,} idle sessions evicted (after {store.idle_ttl / 60:,.0f} min)")
+        st.dataframe(sessions, hide_index=True, use_container_width=True,
+                     column_config={'idle_s': st.column_config.NumberColumn(format="%.0f")})
+        
+        renders = get_pdf_queue().render_times()
+        if renders:
+            secs = [t for t, _ in renders]
+            st.caption(f"create_pdf: {len(renders)} cached renders • mean {sum(secs) / len(secs) * 1000:,.0f} ms • "
+                       f"max {max(secs) * 1000:,.0f} ms • mean {sum(b for _, b in renders) / len(renders) / 1024:,.0f} KB")
+        
+        if st.button("🔬 Profile next rerun"):
+            st.session_state["profile_next"] = True
+            st.rerun()
+        capture = store.get(sid, 'profile')
+        if capture is not None:
+            name, data, mime, text = capture
+            st.download_button("⬇️ Download rerun profile", data=data, file_name=name, mime=mime, on_click="ignore")
+            st.code(text, language=None)
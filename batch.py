@@ -0,0 +1,157 @@
+"""
+Headless batch evaluation of scenario files.
+
+    python batch.py scenarios.csv results.csv [--workers N] [--chunksize N] [--pdf-dir DIR]
+
+Input columns are the sidebar defaults keys (cap, reno, equip, milk, oat,
+bean, pkg, wage, burden, rent, nnn, util, sqft, staff, hrs, price, cups,
+days) plus an optional 'mtype' column ('Dairy' or 'Oat'). Missing columns
+take their default value; burden is a fraction as in the defaults. Extra
+columns (e.g. a site id) are passed through to the output.
+
+CSV and Parquet are supported in both directions, chosen by file
+extension. Input is streamed in chunks and evaluated on a process pool
+with a bounded number of chunks in flight, so memory stays flat however
+long the file is.
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import model
+
+# Output metrics: column name -> model metric
+OUTPUTS = {
+    'revenue': 'rev', 'expenses': 'exp', 'profit': 'profit', 'margin': 'margin',
+    'runway': 'runway', 'payback': 'payback',
+    'be_cups_day': 'be_cups_day', 'be_cups_month': 'be_cups_month',
+}
+
+
+def _is_parquet(path):
+    return path.lower().endswith(('.parquet', '.pq'))
+
+
+def read_chunks(path, chunksize):
+    """Yield DataFrames of at most `chunksize` rows from a CSV or Parquet file."""
+    if _is_parquet(path):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize)
+
+
+class ResultWriter:
+    """Append encoded result chunks (see _process_chunk) to a CSV or Parquet file."""
+
+    def __init__(self, path):
+        self.path = path
+        self._parquet = None
+        self._csv = None
+
+    def write(self, payload):
+        if _is_parquet(self.path):
+            import pyarrow.parquet as pq
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.path, payload.schema)
+            self._parquet.write_table(payload)
+        else:
+            if self._csv is None:
+                self._csv = open(self.path, 'wb')
+            self._csv.write(payload)
+
+    def close(self):
+        for f in (self._parquet, self._csv):
+            if f is not None:
+                f.close()
+
+
+def evaluate_chunk(df, start=0, pdf_dir=None):
+    """Evaluate one chunk of scenarios; rows are numbered from `start`."""
+    values = {k: df[k].to_numpy() for k in model.DEFAULTS if k in df}
+    milk_type = df['mtype'].to_numpy(dtype=str) if 'mtype' in df else 'Dairy'
+    inputs = model.resolve_inputs(values, milk_type)
+    res = model.evaluate(**inputs)
+
+    out = df.copy()
+    for col, metric in OUTPUTS.items():
+        out[col] = np.asarray(res[metric])
+
+    if pdf_dir is not None:
+        from report import create_pdf, report_data
+        for i in range(len(df)):
+            row_in = {k: np.broadcast_to(v, len(df))[i].item() for k, v in inputs.items()}
+            row_m = {k: np.asarray(v)[i].item() for k, v in res.items()}
+            with open(os.path.join(pdf_dir, f"scenario_{start + i:08d}.pdf"), 'wb') as f:
+                f.write(create_pdf(report_data(row_in, row_m)))
+    return out
+
+
+def _process_chunk(df, start, pdf_dir, parquet):
+    """Worker entry point: evaluate a chunk and encode it for the writer.
+
+    Encoding happens in the worker so the parent process only concatenates
+    bytes; CSV through pyarrow is an order of magnitude faster than pandas.
+    """
+    import pyarrow as pa
+    table = pa.Table.from_pandas(evaluate_chunk(df, start, pdf_dir), preserve_index=False)
+    if parquet:
+        return table
+    import pyarrow.csv as pc
+    buf = pa.BufferOutputStream()
+    pc.write_csv(table, buf, pc.WriteOptions(include_header=start == 0))
+    return buf.getvalue().to_pybytes()
+
+
+def run(src, dst, workers=None, chunksize=100_000, pdf_dir=None, max_inflight=None):
+    """Evaluate every scenario in `src` and write results to `dst`; returns the row count."""
+    workers = workers or os.cpu_count() or 1
+    max_inflight = max_inflight or 2 * workers
+    if pdf_dir is not None:
+        os.makedirs(pdf_dir, exist_ok=True)
+
+    writer = ResultWriter(dst)
+    rows = 0
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            for chunk in read_chunks(src, chunksize):
+                pending.append(pool.submit(_process_chunk, chunk, rows, pdf_dir, _is_parquet(dst)))
+                rows += len(chunk)
+                # Back-pressure: keep at most `max_inflight` chunks in memory
+                # and write results in input order.
+                while len(pending) >= max_inflight:
+                    writer.write(pending.popleft().result())
+            while pending:
+                writer.write(pending.popleft().result())
+    finally:
+        writer.close()
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate a file of coffee shop scenarios.")
+    parser.add_argument('input', help="CSV or Parquet file of scenarios")
+    parser.add_argument('output', help="CSV or Parquet file to write results to")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument('--chunksize', type=int, default=100_000, help="rows per chunk (default: 100000)")
+    parser.add_argument('--pdf-dir', default=None, help="also write one PDF report per row into this directory")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    rows = run(args.input, args.output, args.workers, args.chunksize, args.pdf_dir)
+    elapsed = time.perf_counter() - t0
+    print(f"{rows:,} scenarios in {elapsed:.1f}s ({rows / max(elapsed, 1e-9):,.0f}/s) -> {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,354 @@
+"""
+Benchmark suite.
+
+    python bench.py [--out results.json] [--compare baseline.json] [--threshold 0.10]
+                    [--only model,figures,pdf,api,simulations,rerun,startup] [--repeat N]
+
+Measures the vectorized model (scalar calls vs one batch), the multi-year
+projection, construction of each dashboard figure, create_pdf throughput,
+the model API over a keep-alive connection, the opt-in bar queue and
+inventory simulations, full-script rerun latency through Streamlit's headless AppTest harness (with the
+simulations off and on) and cold start (first paint of the access gate and first dashboard run in a
+fresh interpreter).
+Results are written as JSON together with the interpreter, library
+versions and git commit, so runs from different versions can be compared;
+with --compare, any metric worse than the baseline by more than
+--threshold is reported and the exit status is 1.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from importlib import metadata
+
+import numpy as np
+
+import model
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+
+
+def _best(fn, repeat, number=1):
+    """Best per-call time of `fn` over `repeat` rounds of `number` calls."""
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        times.append((time.perf_counter() - t0) / number)
+    return min(times)
+
+
+def _result(value, unit, better):
+    return {'value': value, 'unit': unit, 'better': better}
+
+
+def _percentile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def _default_inputs(**overrides):
+    return {**model.resolve_inputs({}), **overrides}
+
+
+def bench_model(repeat):
+    import projection
+
+    inputs = _default_inputs()
+    n_scalar, n_batch = 1_000, 1_000_000
+    rng = np.random.default_rng(0)
+    batch = {**inputs, 'cups': rng.uniform(20, 500, n_batch), 'price': rng.uniform(3, 12, n_batch)}
+    proj_batch = {**inputs, 'cups': rng.uniform(20, 500, 10_000)}
+
+    scalar = _best(lambda: [model.scalar(model.evaluate(**inputs)) for _ in range(n_scalar)], repeat) / n_scalar
+    batched = _best(lambda: model.evaluate(**batch), repeat) / n_batch
+    proj = _best(lambda: projection.project(proj_batch, months=120), repeat) / 10_000
+    return {
+        'model.scalar_evaluate': _result(1 / scalar, 'scenarios/s', 'higher'),
+        'model.batch_evaluate': _result(1 / batched, 'scenarios/s', 'higher'),
+        'model.batch_speedup': _result(scalar / batched, 'x', 'higher'),
+        'projection.project_120mo': _result(1 / proj, 'scenarios/s', 'higher'),
+    }
+
+
+def bench_figures(repeat):
+    import figures
+    import projection
+
+    inputs = _default_inputs(cups=60)
+    m = model.scalar(model.evaluate(**inputs))
+    proj = projection.project(inputs)
+    runway = proj['runway'].item()
+    builders = {
+        'runway': lambda: figures.runway_figure(proj, runway),
+        'donut': lambda: figures.donut_figure(m['cogs'], m['labor'], m['rent_b'], m['rent_n'], inputs['util'], m['exp']),
+        'breakeven': lambda: figures.breakeven_figure(inputs['price'], m['unit'], inputs['cups'], inputs['days'],
+                                                      m['fixed'], m['be_cups_day']),
+    }
+    out = {}
+    for name, build in builders.items():
+        out[f'figures.{name}_build'] = _result(_best(build, repeat, 5) * 1000, 'ms', 'lower')
+        fig = build()
+        out[f'figures.{name}_to_json'] = _result(_best(fig.to_json, repeat, 5) * 1000, 'ms', 'lower')
+    return out
+
+
+def bench_pdf(repeat):
+    from report import create_pdf, report_data
+
+    inputs = _default_inputs()
+    data = report_data(inputs, model.scalar(model.evaluate(**inputs)))
+    n = 20
+    per_report = _best(lambda: [create_pdf(data) for _ in range(n)], repeat) / n
+    return {
+        'pdf.create_pdf': _result(1 / per_report, 'reports/s', 'higher'),
+        'pdf.bytes_per_report': _result(len(create_pdf(data)), 'bytes', 'lower'),
+    }
+
+
+def bench_api(repeat):
+    import asyncio
+    import http.client
+    import threading
+
+    import api
+
+    ready = threading.Event()
+    state = {}
+
+    def started(server):
+        state['port'] = server.sockets[0].getsockname()[1]
+        ready.set()
+
+    threading.Thread(target=lambda: asyncio.run(api.serve('127.0.0.1', 0, ready=started)), daemon=True).start()
+    ready.wait()
+    conn = http.client.HTTPConnection('127.0.0.1', state['port'])
+
+    def post(path, body):
+        conn.request('POST', path, body, {'Content-Type': 'application/json'})
+        resp = conn.getresponse()
+        resp.read()
+        if resp.status != 200:
+            raise RuntimeError(f"{path} returned {resp.status}")
+
+    n_single, n_batch = 200, 10_000
+    single = [json.dumps({'inputs': {'cups': 20 + 10 * (i % 48)}}) for i in range(n_single)]
+    rng = np.random.default_rng(0)
+    batch = json.dumps({'columns': {'cups': rng.integers(20, 501, n_batch).tolist(),
+                                    'price': rng.uniform(3, 12, n_batch).round(2).tolist()}})
+    per_request = _best(lambda: [post('/v1/scenario', b) for b in single], repeat) / n_single
+    per_scenario = _best(lambda: post('/v1/batch', batch), repeat) / n_batch
+    conn.close()
+    return {
+        'api.scenario': _result(1 / per_request, 'requests/s', 'higher'),
+        'api.batch': _result(1 / per_scenario, 'scenarios/s', 'higher'),
+    }
+
+
+def bench_simulations(repeat):
+    import capacity
+    import inventory
+    import menu
+
+    table = menu.table()
+    cups = _default_inputs()['cups']
+    usage = {k: q / inventory.ITEMS[k]['oz'] for k, q in menu.per_cup(table).items() if k in inventory.ITEMS}
+    return {
+        'simulations.bar_queue': _result(_best(lambda: capacity.simulate(cups, table), repeat) * 1000, 'ms', 'lower'),
+        'simulations.bar_queue_500_cups': _result(_best(lambda: capacity.simulate(500, table), repeat) * 1000,
+                                                  'ms', 'lower'),
+        'simulations.inventory': _result(_best(lambda: inventory.plan(cups, usage), repeat) * 1000, 'ms', 'lower'),
+    }
+
+
+# Run in a fresh interpreter so nothing the app imports is cached yet
+_STARTUP_SCRIPT = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+baseline = set(sys.modules)
+gate = AppTest.from_file(sys.argv[1], default_timeout=120)
+t0 = time.perf_counter()
+gate.run()
+gate_s = time.perf_counter() - t0
+loaded = set(sys.modules) - baseline
+at = AppTest.from_file(sys.argv[1], default_timeout=120)
+at.query_params['auth'] = 'verified'
+t0 = time.perf_counter()
+at.run()
+print(json.dumps({
+    'gate': gate_s, 'dashboard': time.perf_counter() - t0,
+    'heavy': sorted(m for m in ('numpy', 'fpdf', 'plotly.graph_objects') if m in loaded),
+    'fpdf_after_dashboard': 'fpdf' in sys.modules,
+}))
+"""
+
+
+def bench_startup(repeat):
+    runs = []
+    for _ in range(max(1, min(repeat, 3))):
+        proc = subprocess.run([sys.executable, '-c', _STARTUP_SCRIPT, APP], capture_output=True, text=True,
+                              cwd=os.path.dirname(APP), check=True)
+        runs.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+    return {
+        'startup.gate_first_paint': _result(min(r['gate'] for r in runs) * 1000, 'ms', 'lower'),
+        'startup.dashboard_first_run': _result(min(r['dashboard'] for r in runs) * 1000, 'ms', 'lower'),
+        'startup.heavy_modules_at_gate': _result(len(runs[0]['heavy']), 'modules', 'lower'),
+        'startup.fpdf_loaded_without_export': _result(int(runs[0]['fpdf_after_dashboard']), 'bool', 'lower'),
+    }
+
+
+def bench_rerun(repeat):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP, default_timeout=120)
+    at.query_params['auth'] = 'verified'
+    t0 = time.perf_counter()
+    at.run()
+    first = time.perf_counter() - t0
+    if at.exception:
+        raise RuntimeError(f"app.py raised: {at.exception[0].value}")
+
+    def reruns(values):
+        cups = next(w for w in at.number_input if w.label == "Cups Sold per Day")
+        times = []
+        for value in values:
+            cups.set_value(value)
+            t0 = time.perf_counter()
+            at.run()
+            times.append(time.perf_counter() - t0)
+        return sorted(times)
+
+    n = max(repeat, 1) * 5
+    # Cups/day not used before (above the default 120, within the widget's
+    # 500), so each rerun recomputes instead of hitting the process-wide
+    # result cache. The runs with the simulations on count down from 119:
+    # below the bar's capacity, so sales stay uncapped and every rerun
+    # simulates both the bar and the inventory afresh
+    times = reruns(121 + i % 380 for i in range(n))
+    for toggle in at.toggle:
+        if toggle.label in ("Simulate the bar queue", "Simulate spoilage & ordering"):
+            toggle.set_value(True)
+    sims = reruns(119 - i % 99 for i in range(n))
+    return {
+        'rerun.first_run': _result(first * 1000, 'ms', 'lower'),
+        'rerun.p50': _result(statistics.median(times) * 1000, 'ms', 'lower'),
+        'rerun.p95': _result(_percentile(times, 0.95) * 1000, 'ms', 'lower'),
+        'rerun.simulations_p50': _result(statistics.median(sims) * 1000, 'ms', 'lower'),
+        'rerun.simulations_p95': _result(_percentile(sims, 0.95) * 1000, 'ms', 'lower'),
+    }
+
+
+BENCHMARKS = {
+    'model': bench_model,
+    'figures': bench_figures,
+    'pdf': bench_pdf,
+    'api': bench_api,
+    'simulations': bench_simulations,
+    'rerun': bench_rerun,
+    'startup': bench_startup,
+}
+
+
+def environment():
+    def version(pkg):
+        try:
+            return metadata.version(pkg)
+        except metadata.PackageNotFoundError:
+            return None
+
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(APP), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'packages': {pkg: version(pkg) for pkg in ('numpy', 'plotly', 'streamlit', 'fpdf2')},
+    }
+
+
+def run(names=tuple(BENCHMARKS), repeat=5):
+    results = {}
+    for name in names:
+        print(f"Running {name}...", file=sys.stderr)
+        results.update(BENCHMARKS[name](repeat))
+    return {'environment': environment(), 'results': results}
+
+
+# Units of metrics that count things (modules loaded, flags): any increase is a regression
+COUNT_UNITS = ('modules', 'bool')
+
+
+def compare(current, baseline, threshold=0.10):
+    """Return (name, old, new, change) for every metric worse than `threshold`.
+
+    Count metrics regress on any change for the worse, and so does any
+    metric whose baseline is zero (its change is reported as inf).
+    """
+    regressions = []
+    for name, new in current['results'].items():
+        old = baseline['results'].get(name)
+        if old is None:
+            continue
+        sign = 1 if new['better'] == 'lower' else -1
+        if old['value']:
+            change = new['value'] / old['value'] - 1
+        else:
+            change = float(np.sign(new['value'] - old['value'])) * np.inf if new['value'] != old['value'] else 0.0
+        if new['unit'] in COUNT_UNITS or not old['value']:
+            worse = sign * (new['value'] - old['value']) > 0
+        else:
+            worse = sign * change > threshold
+        if worse:
+            regressions.append((name, old['value'], new['value'], change))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the model, figures, PDF export, model API and app reruns.")
+    parser.add_argument('--out', default=None, help="write results JSON here (default: stdout)")
+    parser.add_argument('--compare', default=None, help="baseline results JSON to check for regressions")
+    parser.add_argument('--threshold', type=float, default=0.10, help="allowed slowdown as a fraction (default: 0.10)")
+    parser.add_argument('--only', default=','.join(BENCHMARKS), help="comma-separated benchmarks to run")
+    parser.add_argument('--repeat', type=int, default=5, help="rounds per benchmark; the best is kept (default: 5)")
+    args = parser.parse_args(argv)
+
+    names = [n.strip() for n in args.only.split(',') if n.strip()]
+    unknown = set(names) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    current = run(names, args.repeat)
+    text = json.dumps(current, indent=2)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    for name, res in current['results'].items():
+        print(f"{name:<32} {res['value']:>14,.2f} {res['unit']}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold)
+        for name, old, new, change in regressions:
+            print(f"REGRESSION {name}: {old:,.2f} -> {new:,.2f} ({change:+.1%})", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against {args.compare}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""
+Process-wide result cache.
+
+Entries are keyed on a canonical hash of their inputs (sorted keys, floats
+rounded, arrays hashed by value), so every session that looks at the same
+scenario shares one computed result. The cache is bounded by entry count
+and by an approximate byte budget with least-recently-used eviction, and
+entries expire after a TTL. Hit, miss and eviction counters are kept for
+monitoring.
+"""
+
+import hashlib
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+
+def canonical_hash(data, ndigits=6):
+    """Stable hash of a flat dict: sorted keys, floats rounded to `ndigits`."""
+    canon = {k: round(float(v), ndigits) if isinstance(v, float) else v for k, v in data.items()}
+    return hashlib.sha256(json.dumps(canon, sort_keys=True).encode()).hexdigest()
+
+
+def _feed(h, obj, ndigits):
+    if isinstance(obj, np.ndarray) or isinstance(obj, np.generic):
+        a = np.asarray(obj)
+        if a.dtype.kind == 'f':
+            a = np.round(a, ndigits) + 0.0   # + 0.0 folds -0.0 into 0.0
+        h.update(f"nd{a.dtype.str}{a.shape}".encode())
+        h.update(np.ascontiguousarray(a).tobytes())
+    elif isinstance(obj, float):
+        h.update(repr(round(obj, ndigits) + 0.0).encode())
+    elif isinstance(obj, dict):
+        h.update(b"{")
+        for k in sorted(obj, key=repr):
+            _feed(h, k, ndigits)
+            _feed(h, obj[k], ndigits)
+        h.update(b"}")
+    elif isinstance(obj, (list, tuple)):
+        h.update(b"[")
+        for v in obj:
+            _feed(h, v, ndigits)
+        h.update(b"]")
+    elif obj is None or isinstance(obj, (bool, int, str)):
+        h.update(f"{type(obj).__name__}:{obj!r}".encode())
+    else:
+        raise TypeError(f"Cannot build a cache key from {type(obj).__name__}")
+    h.update(b";")
+
+
+def cache_key(*parts, ndigits=6):
+    """Canonical hash of nested dicts/lists/tuples of scalars and NumPy arrays."""
+    h = hashlib.sha256()
+    _feed(h, parts, ndigits)
+    return h.hexdigest()
+
+
+def sizeof(obj):
+    """Approximate memory held by `obj`, following containers and arrays."""
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes + 112
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(sizeof(k) + sizeof(v) for k, v in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return sys.getsizeof(obj) + sum(sizeof(v) for v in obj)
+    if hasattr(obj, 'to_plotly_json'):
+        # Plotly figures: count the JSON spec they will be sent as
+        return len(obj.to_json())
+    return sys.getsizeof(obj)
+
+
+class ResultCache:
+    """Thread-safe LRU of computed results with a byte budget and a TTL.
+
+    Values are shared between sessions and must not be modified by callers.
+    """
+
+    def __init__(self, max_bytes=64 * 2**20, max_entries=4096, ttl=3600.0):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()    # key -> (value, size, expires)
+        self.bytes = 0
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] < time.monotonic():
+                self._drop(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        size = sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            if size > self.max_bytes:
+                return value
+            self._entries[key] = (value, size, time.monotonic() + self.ttl)
+            self.bytes += size
+            while self.bytes > self.max_bytes or len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+        return value
+
+    def get_or_compute(self, key, compute):
+        """Cached value for `key`, computing and storing it on a miss.
+
+        Concurrent misses on the same key may both compute; the results are
+        equal, so the later one simply replaces the earlier.
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = self.put(key, compute())
+        return value
+
+    def _drop(self, key):
+        _, size, _ = self._entries.pop(key)
+        self.bytes -= size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries), 'bytes': self.bytes, 'max_bytes': self.max_bytes,
+                'hits': self.hits, 'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions, 'expirations': self.expirations,
+            }
@@ -0,0 +1,418 @@
+"""
+Plotly figures for the dashboard.
+
+Each builder takes plain numbers (or projection arrays) and returns a
+go.Figure, so figures can be built and benchmarked without Streamlit.
+"""
+
+import numpy as np
+import plotly.graph_objects as go
+
+import schedule
+import surface
+
+
+def runway_figure(proj, runway):
+    """Projected cash balance until a few months past zero."""
+    n = int(min(runway + 4, len(proj['months']) - 1)) + 1
+    x, y = proj['months'][:n], np.maximum(proj['balance'][:n], 0)
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=x, y=y, mode='lines', line=dict(color='#C97B63', width=3, shape='spline'),
+        fill='tozeroy', fillcolor='rgba(201,123,99,0.12)'))
+    fig.add_hline(y=0, line_dash="dot", line_color='#1A3C40', line_width=2)
+    fig.update_layout(
+        title=dict(text=f"💸 Cash Runway: {runway:.1f} months", font=dict(size=16, color='#1A3C40', family='Arial Black')),
+        xaxis=dict(
+            title=dict(text="Months", font=dict(size=14, color='#1A3C40', family='Arial')),
+            showgrid=True, gridcolor='rgba(0,0,0,0.08)', zeroline=False,
+            tickfont=dict(size=13, color='#1A3C40', family='Arial'),
+            fixedrange=True
+        ),
+        yaxis=dict(
+            title=dict(text="Cash ($)", font=dict(size=14, color='#1A3C40', family='Arial')),
+            showgrid=True, gridcolor='rgba(0,0,0,0.08)', zeroline=False,
+            tickfont=dict(size=13, color='#1A3C40', family='Arial'),
+            fixedrange=True
+        ),
+        height=380, template="plotly_white", margin=dict(l=20, r=20, t=60, b=50),
+        plot_bgcolor='rgba(255,255,255,0.95)', paper_bgcolor='rgba(0,0,0,0)',
+        dragmode=False
+    )
+    return fig
+
+
+def donut_figure(cogs, labor, rent_b, rent_n, util, exp):
+    """Monthly cost structure with the total in the hole."""
+    labels = ['COGS', 'Labor', 'Base Rent', 'NNN', 'Utilities']
+    values = [cogs, labor, rent_b, rent_n, util]
+    # Brighter, vibrant commercial colors
+    colors_chart = ['#00A86B', '#E63946', '#1E90FF', '#9B59B6', '#F39C12']
+
+    fig = go.Figure(data=[go.Pie(
+        labels=labels, values=values, hole=0.55,
+        marker=dict(colors=colors_chart, line=dict(color='white', width=3)),
+        textinfo='percent+label', textposition='outside',
+        textfont=dict(size=12, family='Arial', color='#1A3C40'),
+        hovertemplate='<b>%{label}</b><br>$%{value:,.0f}<br>%{percent}<extra></extra>',
+        pull=[0.02, 0.02, 0.02, 0.02, 0.02]
+    )])
+
+    fig.add_annotation(
+        text=f"<b>${exp:,.0f}</b><br><span style='font-size:12px;color:#6C757D'>Total/Month</span>",
+        x=0.5, y=0.5, font=dict(size=24, color='#1A3C40', family='Arial Black'), showarrow=False
+    )
+
+    fig.update_layout(
+        height=450, showlegend=True,
+        legend=dict(orientation="h", yanchor="bottom", y=-0.12, xanchor="center", x=0.5,
+                    font=dict(size=12, family='Arial')),
+        margin=dict(l=30, r=30, t=30, b=70),
+        paper_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig
+
+
+def breakeven_figure(price, unit, cups, days, fixed, be_cups_day):
+    """Revenue and total cost lines by daily volume, with the break-even marked."""
+    x = np.linspace(0, cups * 1.5, 50)
+    rev_l = x * price * days
+    cost_l = (x * unit * days) + fixed
+
+    fig = go.Figure()
+    # Brighter, vibrant colors
+    fig.add_trace(go.Scatter(x=x, y=rev_l, name='Revenue',
+        line=dict(color='#00A86B', width=4),
+        fill='tozeroy', fillcolor='rgba(0, 168, 107, 0.08)'))
+    fig.add_trace(go.Scatter(x=x, y=cost_l, name='Total Cost',
+        line=dict(color='#E63946', width=4)))
+
+    # Break-even label at top
+    fig.add_vline(x=be_cups_day, line_dash="dash", line_color='#D4A855', line_width=2,
+        annotation_text=f"☕ Break-even: {be_cups_day:.0f}/day",
+        annotation_position="top left",
+        annotation_font=dict(size=12, color='#D4A855', family='Arial'))
+
+    fig.update_layout(
+        title=dict(text="📈 Revenue vs Cost by Daily Sales Volume", font=dict(size=16, color='#1A3C40', family='Arial Black')),
+        xaxis=dict(
+            title=dict(text="Cups/Day", font=dict(size=14, color='#1A3C40', family='Arial')),
+            showgrid=True, gridcolor='rgba(0,0,0,0.08)', zeroline=False,
+            tickfont=dict(size=13, color='#1A3C40', family='Arial'),
+            fixedrange=True  # Disable zoom on x-axis
+        ),
+        yaxis=dict(
+            title=dict(text="$/Month", font=dict(size=14, color='#1A3C40', family='Arial')),
+            showgrid=True, gridcolor='rgba(0,0,0,0.08)', zeroline=False,
+            tickfont=dict(size=13, color='#1A3C40', family='Arial'),
+            fixedrange=True  # Disable zoom on y-axis
+        ),
+        height=420, template="plotly_white",
+        legend=dict(orientation="h", y=1.12, font=dict(size=13, color='#1A3C40', family='Arial')),
+        margin=dict(l=20, r=20, t=70, b=50),
+        plot_bgcolor='rgba(255,255,255,0.95)', paper_bgcolor='rgba(0,0,0,0)',
+        dragmode=False  # Completely disable drag/zoom
+    )
+    return fig
+
+
+def fan_figure(mc):
+    """P10/P50/P90 bands of simulated cash balances from simulation.simulate_survival()."""
+    x = mc['months']
+    fan = mc['balance_pct']
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=x, y=fan[90], name='P90', mode='lines', line=dict(color='#87A889', width=1)))
+    fig.add_trace(go.Scatter(x=x, y=fan[10], name='P10', mode='lines', line=dict(color='#C97B63', width=1),
+        fill='tonexty', fillcolor='rgba(74,155,155,0.15)'))
+    fig.add_trace(go.Scatter(x=x, y=fan[50], name='P50', mode='lines', line=dict(color='#1A3C40', width=3)))
+    fig.add_hline(y=0, line_dash="dot", line_color='#1A3C40', line_width=2)
+    fig.update_layout(
+        title=dict(text="🎲 Simulated Cash Balance (P10 / P50 / P90)", font=dict(size=16, color='#1A3C40', family='Arial Black')),
+        xaxis=dict(
+            title=dict(text="Months", font=dict(size=14, color='#1A3C40', family='Arial')),
+            showgrid=True, gridcolor='rgba(0,0,0,0.08)', zeroline=False,
+            tickfont=dict(size=13, color='#1A3C40', family='Arial'),
+            fixedrange=True
+        ),
+        yaxis=dict(
+            title=dict(text="Cash ($)", font=dict(size=14, color='#1A3C40', family='Arial')),
+            showgrid=True, gridcolor='rgba(0,0,0,0.08)', zeroline=False,
+            tickfont=dict(size=13, color='#1A3C40', family='Arial'),
+            fixedrange=True
+        ),
+        height=380, template="plotly_white", margin=dict(l=20, r=20, t=60, b=50),
+        legend=dict(orientation="h", y=1.12, font=dict(size=13, color='#1A3C40', family='Arial')),
+        plot_bgcolor='rgba(255,255,255,0.95)', paper_bgcolor='rgba(0,0,0,0)',
+        dragmode=False
+    )
+    return fig
+
+
+def price_volume_figure(grid, grid_metric, price=None, cups=None):
+    """Heatmap of surface.price_volume_grid() with the break-even contour and the current plan.
+
+    Without `price` and `cups` the plan marker is left empty for with_point()
+    to place, so the heatmap can be built once per grid.
+    """
+    if grid_metric == "Monthly Profit":
+        z, zmid, cbar = grid['profit'], 0, "$/Month"
+        colorscale = [[0, '#E63946'], [0.5, '#F9F9F7'], [1, '#00A86B']]
+        hover = '$%{x:.2f} × %{y:.0f} cups/day<br>Profit: $%{z:,.0f}/mo<extra></extra>'
+    else:
+        # Sustainable cells have infinite runway; show them, and any past
+        # five years, at the cap
+        z, zmid, cbar = np.minimum(grid['runway'], 60), None, "Months (60 = 60+ or ∞)"
+        colorscale = [[0, '#E63946'], [0.4, '#D4A855'], [1, '#00A86B']]
+        hover = '$%{x:.2f} × %{y:.0f} cups/day<br>Runway: %{z:.1f} months<extra></extra>'
+
+    fig = go.Figure()
+    fig.add_trace(go.Heatmap(x=grid['price'], y=grid['cups'], z=z, zmid=zmid, colorscale=colorscale,
+        colorbar=dict(title=dict(text=cbar, font=dict(size=12, family='Arial'))), hovertemplate=hover))
+    fig.add_trace(go.Scatter(x=grid['price'], y=grid['be_cups_day'], mode='lines',
+        name='Break-even after debt service' if grid['debt_month'] else 'Break-even',
+        line=dict(color='#1A3C40', width=3, dash='dash'), hoverinfo='skip'))
+    fig.add_trace(go.Scatter(x=[] if price is None else [price], y=[] if cups is None else [cups],
+        mode='markers', name='Your Plan',
+        marker=dict(color='#D4A855', size=14, symbol='star', line=dict(color='#1A3C40', width=2)),
+        hovertemplate='Your plan: $%{x:.2f} × %{y:.0f} cups/day<extra></extra>'))
+    fig.update_layout(
+        title=dict(text=f"🗺️ {grid_metric} by Price × Daily Volume", font=dict(size=16, color='#1A3C40', family='Arial Black')),
+        xaxis=dict(
+            title=dict(text="Price/Cup ($)", font=dict(size=14, color='#1A3C40', family='Arial')),
+            range=list(surface.PRICE_RANGE), zeroline=False,
+            tickfont=dict(size=13, color='#1A3C40', family='Arial'),
+            fixedrange=True
+        ),
+        yaxis=dict(
+            title=dict(text="Cups/Day", font=dict(size=14, color='#1A3C40', family='Arial')),
+            range=list(surface.CUPS_RANGE), zeroline=False,
+            tickfont=dict(size=13, color='#1A3C40', family='Arial'),
+            fixedrange=True
+        ),
+        height=460, template="plotly_white",
+        legend=dict(orientation="h", y=1.1, font=dict(size=13, color='#1A3C40', family='Arial')),
+        margin=dict(l=20, r=20, t=70, b=50),
+        plot_bgcolor='rgba(255,255,255,0.95)', paper_bgcolor='rgba(0,0,0,0)',
+        dragmode=False
+    )
+    return fig
+
+
+def with_point(fig, name, x, y):
+    """Copy of `fig` with the trace called `name` moved to the single point (x, y).
+
+    `fig` was validated when it was built and only the point changes, so
+    the copy skips Plotly's validation: a few milliseconds instead of a
+    full rebuild for a large heatmap.
+    """
+    out = go.Figure(fig.to_dict(), _validate=False)
+    out.update_traces(x=[x], y=[y], selector=dict(name=name))
+    return out
+
+
+def tornado_figure(names, low, high, base, sens_label, sens_pct):
+    """Low/high swings of one metric around its base value, one bar per input."""
+    fig = go.Figure()
+    fig.add_trace(go.Bar(y=names, x=low, base=base, orientation='h', name=f'-{sens_pct:.0f}%',
+        marker=dict(color='#E63946'), hovertemplate='<b>%{y}</b><br>%{x:+,.1f}<extra></extra>'))
+    fig.add_trace(go.Bar(y=names, x=high, base=base, orientation='h', name=f'+{sens_pct:.0f}%',
+        marker=dict(color='#00A86B'), hovertemplate='<b>%{y}</b><br>%{x:+,.1f}<extra></extra>'))
+    fig.add_vline(x=base, line_dash="dot", line_color='#1A3C40', line_width=2)
+    fig.update_layout(
+        title=dict(text=f"🌪️ {sens_label}: Which Input Hurts Most?", font=dict(size=16, color='#1A3C40', family='Arial Black')),
+        barmode='overlay',
+        xaxis=dict(
+            title=dict(text=sens_label, font=dict(size=14, color='#1A3C40', family='Arial')),
+            showgrid=True, gridcolor='rgba(0,0,0,0.08)', zeroline=False,
+            tickfont=dict(size=13, color='#1A3C40', family='Arial'),
+            fixedrange=True
+        ),
+        yaxis=dict(tickfont=dict(size=13, color='#1A3C40', family='Arial'), fixedrange=True),
+        height=420, template="plotly_white",
+        legend=dict(orientation="h", y=1.12, font=dict(size=13, color='#1A3C40', family='Arial')),
+        margin=dict(l=20, r=20, t=70, b=50),
+        plot_bgcolor='rgba(255,255,255,0.95)', paper_bgcolor='rgba(0,0,0,0)',
+        dragmode=False
+    )
+    return fig
+
+
+def frontier_figure(profit, be_cups, best, current):
+    """Profit against break-even volume along the optimizer's Pareto frontier.
+
+    `best` and `current` are (profit, be_cups_day) points, `best` may be None.
+    """
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=be_cups, y=profit, mode='lines+markers', name='Best trade-offs',
+        line=dict(color='#1E90FF', width=3), marker=dict(size=7),
+        hovertemplate='Break-even %{x:.0f} cups/day<br>Profit $%{y:,.0f}/mo<extra></extra>'))
+    if best is not None:
+        fig.add_trace(go.Scatter(x=[best[1]], y=[best[0]], mode='markers', name='Optimized Plan',
+            marker=dict(color='#00A86B', size=16, symbol='star', line=dict(color='#1A3C40', width=2)),
+            hovertemplate='Optimized: $%{y:,.0f}/mo, break-even %{x:.0f} cups/day<extra></extra>'))
+    if np.isfinite(current[1]):
+        fig.add_trace(go.Scatter(x=[current[1]], y=[current[0]], mode='markers', name='Your Plan',
+            marker=dict(color='#D4A855', size=14, symbol='diamond', line=dict(color='#1A3C40', width=2)),
+            hovertemplate='Your plan: $%{y:,.0f}/mo, break-even %{x:.0f} cups/day<extra></extra>'))
+    fig.update_layout(
+        title=dict(text="🎯 Profit vs Break-even Volume", font=dict(size=16, color='#1A3C40', family='Arial Black')),
+        xaxis=dict(
+            title=dict(text="Break-even (cups/day)", font=dict(size=14, color='#1A3C40', family='Arial')),
+            showgrid=True, gridcolor='rgba(0,0,0,0.08)', zeroline=False,
+            tickfont=dict(size=13, color='#1A3C40', family='Arial'),
+            fixedrange=True
+        ),
+        yaxis=dict(
+            title=dict(text="Profit ($/Month)", font=dict(size=14, color='#1A3C40', family='Arial')),
+            showgrid=True, gridcolor='rgba(0,0,0,0.08)', zeroline=False,
+            tickfont=dict(size=13, color='#1A3C40', family='Arial'),
+            fixedrange=True
+        ),
+        height=400, template="plotly_white",
+        legend=dict(orientation="h", y=1.12, font=dict(size=13, color='#1A3C40', family='Arial')),
+        margin=dict(l=20, r=20, t=70, b=50),
+        plot_bgcolor='rgba(255,255,255,0.95)', paper_bgcolor='rgba(0,0,0,0)',
+        dragmode=False
+    )
+    return fig
+
+
+def schedule_figure(demand, staff, rate, title):
+    """Day × hour heatmap of baristas on duty against hourly demand.
+
+    Cells are colored by spare baristas (on duty minus demand / rate):
+    red where the roster is short of the service level, green where idle.
+    Hours nobody works and nobody buys are left blank.
+    """
+    spare = staff - demand / rate
+    active = (staff > 0) | (demand > 0)
+    hours = np.flatnonzero(active.any(axis=0))
+    lo, hi = (hours[0], hours[-1] + 1) if len(hours) else (0, 24)
+    z = np.where(active, spare, np.nan)[:, lo:hi]
+    bound = max(float(np.nanmax(np.abs(z))) if np.isfinite(z).any() else 1.0, 1.0)
+    fig = go.Figure()
+    fig.add_trace(go.Heatmap(
+        x=[f"{h}:00" for h in range(lo, hi)], y=list(schedule.DAYS), z=z, zmid=0, zmin=-bound, zmax=bound,
+        colorscale=[[0, '#E63946'], [0.5, '#F9F9F7'], [1, '#00A86B']],
+        customdata=np.stack([staff[:, lo:hi], demand[:, lo:hi]], axis=-1),
+        colorbar=dict(title=dict(text="Spare baristas", font=dict(size=12, family='Arial'))),
+        hovertemplate='%{y} %{x}<br>%{customdata[0]} on duty • %{customdata[1]:.0f} cups<extra></extra>'))
+    fig.update_layout(
+        title=dict(text=title, font=dict(size=16, color='#1A3C40', family='Arial Black')),
+        xaxis=dict(tickfont=dict(size=12, color='#1A3C40', family='Arial'), fixedrange=True),
+        yaxis=dict(autorange='reversed', tickfont=dict(size=13, color='#1A3C40', family='Arial'), fixedrange=True),
+        height=360, template="plotly_white",
+        margin=dict(l=20, r=20, t=60, b=40),
+        plot_bgcolor='rgba(255,255,255,0.95)', paper_bgcolor='rgba(0,0,0,0)',
+        dragmode=False
+    )
+    return fig
+
+
+def capacity_figure(hourly_wait, hourly_lost, open_hour, close_hour):
+    """Average wait in line and cups lost to walk-aways, by hour of day."""
+    hours = [f"{h}:00" for h in range(open_hour, close_hour)]
+    fig = go.Figure()
+    fig.add_trace(go.Bar(x=hours, y=hourly_lost[open_hour:close_hour], name='Lost cups/day',
+        marker_color='#E63946', opacity=0.8, hovertemplate='%{x}: %{y:.1f} cups/day lost<extra></extra>'))
+    fig.add_trace(go.Scatter(x=hours, y=hourly_wait[open_hour:close_hour], name='Average wait', yaxis='y2',
+        mode='lines+markers', line=dict(color='#1E90FF', width=3), marker=dict(size=7),
+        hovertemplate='%{x}: %{y:.1f} min wait<extra></extra>'))
+    fig.update_layout(
+        title=dict(text="⏱️ Line Waits & Walk-aways by Hour", font=dict(size=16, color='#1A3C40', family='Arial Black')),
+        xaxis=dict(tickfont=dict(size=12, color='#1A3C40', family='Arial'), fixedrange=True),
+        yaxis=dict(
+            title=dict(text="Lost Cups/Day", font=dict(size=14, color='#1A3C40', family='Arial')),
+            rangemode='tozero', showgrid=True, gridcolor='rgba(0,0,0,0.08)',
+            tickfont=dict(size=13, color='#1A3C40', family='Arial'), fixedrange=True
+        ),
+        yaxis2=dict(
+            title=dict(text="Wait (minutes)", font=dict(size=14, color='#1A3C40', family='Arial')),
+            overlaying='y', side='right', rangemode='tozero', showgrid=False,
+            tickfont=dict(size=13, color='#1A3C40', family='Arial'), fixedrange=True
+        ),
+        height=360, template="plotly_white",
+        legend=dict(orientation="h", y=1.12, font=dict(size=13, color='#1A3C40', family='Arial')),
+        margin=dict(l=20, r=20, t=70, b=40),
+        plot_bgcolor='rgba(255,255,255,0.95)', paper_bgcolor='rgba(0,0,0,0)',
+        dragmode=False
+    )
+    return fig
+
+
+def inventory_figure(variants):
+    """Waste against in-stock rate for every simulated ordering policy.
+
+    `variants` maps an ingredient label to (fill, waste_pct) arrays over
+    its policies plus the chosen policy's (fill, waste_pct).
+    """
+    colors = ('#1E90FF', '#8B5E3C', '#00A86B', '#D4A855')
+    fig = go.Figure()
+    for (label, (fill, waste, best_fill, best_waste)), color in zip(variants.items(), colors):
+        fig.add_trace(go.Scatter(x=np.asarray(fill) * 100, y=waste, mode='markers', name=label,
+            marker=dict(color=color, size=7, opacity=0.45),
+            hovertemplate=label + ': %{x:.2f}% in stock, %{y:.1f}% waste<extra></extra>'))
+        fig.add_trace(go.Scatter(x=[best_fill * 100], y=[best_waste], mode='markers', showlegend=False,
+            marker=dict(color=color, size=16, symbol='star', line=dict(color='#1A3C40', width=2)),
+            hovertemplate=label + ' (chosen): %{x:.2f}% in stock, %{y:.1f}% waste<extra></extra>'))
+    fig.update_layout(
+        title=dict(text="📦 Ordering Policies: Waste vs In-Stock Rate", font=dict(size=16, color='#1A3C40', family='Arial Black')),
+        xaxis=dict(
+            title=dict(text="Demand Met from Stock (%)", font=dict(size=14, color='#1A3C40', family='Arial')),
+            showgrid=True, gridcolor='rgba(0,0,0,0.08)', zeroline=False,
+            tickfont=dict(size=13, color='#1A3C40', family='Arial'), fixedrange=True
+        ),
+        yaxis=dict(
+            title=dict(text="Waste (% of purchases)", font=dict(size=14, color='#1A3C40', family='Arial')),
+            rangemode='tozero', showgrid=True, gridcolor='rgba(0,0,0,0.08)', zeroline=False,
+            tickfont=dict(size=13, color='#1A3C40', family='Arial'), fixedrange=True
+        ),
+        height=400, template="plotly_white",
+        legend=dict(orientation="h", y=1.12, font=dict(size=13, color='#1A3C40', family='Arial')),
+        margin=dict(l=20, r=20, t=70, b=50),
+        plot_bgcolor='rgba(255,255,255,0.95)', paper_bgcolor='rgba(0,0,0,0)',
+        dragmode=False
+    )
+    return fig
+
+
+def amortization_figure(interest, principal, balance, opening):
+    """Monthly interest and principal paid, and the balance still owed from `opening`, over the loans' terms.
+
+    `principal` is the scheduled repayment; a balloon at term shows as the
+    drop in the balance line.
+    """
+    months = np.arange(1, len(interest) + 1)
+    fig = go.Figure()
+    fig.add_trace(go.Bar(x=months, y=interest, name='Interest', marker_color='#C97B63',
+        hovertemplate='Month %{x}: $%{y:,.0f} interest<extra></extra>'))
+    fig.add_trace(go.Bar(x=months, y=principal, name='Principal', marker_color='#2D6A4F',
+        hovertemplate='Month %{x}: $%{y:,.0f} principal<extra></extra>'))
+    fig.add_trace(go.Scatter(x=np.concatenate([[0], months]), y=np.concatenate([[opening], balance]),
+        mode='lines', name='Balance Owed', yaxis='y2', line=dict(color='#1A3C40', width=3),
+        hovertemplate='Month %{x}: $%{y:,.0f} owed<extra></extra>'))
+    fig.update_layout(
+        title=dict(text="🏦 Amortization Schedule", font=dict(size=16, color='#1A3C40', family='Arial Black')),
+        barmode='stack', bargap=0.1,
+        xaxis=dict(
+            title=dict(text="Month", font=dict(size=14, color='#1A3C40', family='Arial')),
+            showgrid=False, zeroline=False,
+            tickfont=dict(size=13, color='#1A3C40', family='Arial'), fixedrange=True
+        ),
+        yaxis=dict(
+            title=dict(text="Payment ($/month)", font=dict(size=14, color='#1A3C40', family='Arial')),
+            showgrid=True, gridcolor='rgba(0,0,0,0.08)', zeroline=False,
+            tickfont=dict(size=13, color='#1A3C40', family='Arial'), fixedrange=True
+        ),
+        yaxis2=dict(
+            title=dict(text="Balance Owed ($)", font=dict(size=14, color='#1A3C40', family='Arial')),
+            overlaying='y', side='right', rangemode='tozero', showgrid=False, zeroline=False,
+            tickfont=dict(size=13, color='#1A3C40', family='Arial'), fixedrange=True
+        ),
+        height=400, template="plotly_white",
+        legend=dict(orientation="h", y=1.12, font=dict(size=13, color='#1A3C40', family='Arial')),
+        margin=dict(l=20, r=20, t=70, b=50),
+        plot_bgcolor='rgba(255,255,255,0.95)', paper_bgcolor='rgba(0,0,0,0)',
+        dragmode=False
+    )
+    return fig
@@ -0,0 +1,191 @@
+"""
+Debt financing: loan schedules, debt service, DSCR and levered runway.
+
+The model treats the available capital as owner equity. Here term loans
+and lines of credit add to the opening cash, and their monthly payments
+come out of the projected profit. A loan is a principal, an annual rate,
+a term and an interest-only period. After that it amortizes as an annuity
+over the rest of the term, or over `amort` months with the balance due at
+term (a balloon). A line of credit is the same thing with no amortization:
+interest on the drawn balance, and the draw repaid at term.
+
+Every argument broadcasts. A schedule has shape (..., months), so a grid
+of rates × terms × interest-only periods is amortized in one pass. That
+is how offers() prices thousands of lender offers against one projection.
+
+    sched = amortize(250000, 0.105, 120, io=6, months=120)
+    sched['payment'][..., :12]           # six interest-only months, then P&I
+"""
+
+import numpy as np
+
+import projection
+
+# Minimum debt service coverage (NOI / debt service) lenders look for
+DSCR_THRESHOLDS = {'SBA 7(a)': 1.25, 'Conventional Bank': 1.35}
+
+# Lender-comparison grid: annual rate, term (months), interest-only months
+OFFER_RATES = np.round(np.arange(0.05, 0.14 + 1e-9, 0.00125), 5)
+OFFER_TERMS = (36, 60, 84, 120, 180, 240, 300)
+OFFER_IO = (0, 3, 6, 12)
+
+
+def amortize(principal, rate, term, io=0, amort=None, months=None):
+    """Monthly schedule of a loan: payment, interest, principal repaid and balance.
+
+    `rate` is annual, `term`, `io` (interest-only) and `amort` in months;
+    `amort` defaults to the months left after the interest-only period,
+    np.inf gives a line of credit (interest only). Whatever is owed at
+    `term` is paid with that month's payment. `months` defaults to the
+    longest term. Returns arrays of shape (..., months); 'balance' is at
+    month end, and 'balloon' is the part of the payment that repays the
+    balance at term early.
+    """
+    principal, rate, term, io = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (principal, rate, term, io)))
+    amort = term - io if amort is None else np.broadcast_to(np.asarray(amort, dtype=float), term.shape)
+    amort = np.maximum(amort, 1)
+    months = int(term.max()) if months is None else int(months)
+
+    def col(x):
+        return x[..., np.newaxis]
+
+    t = np.arange(1, months + 1)
+    r = col(rate / 12)
+    n = col(amort)
+    growth = r > 0
+    safe_r = np.where(growth, r, 1)
+    with np.errstate(over='ignore', invalid='ignore', divide='ignore'):
+        level = np.where(growth, col(principal) * safe_r / (1 - (1 + safe_r) ** -n), col(principal) / n)
+
+    def balance(k):
+        # Owed after k level payments
+        with np.errstate(over='ignore', invalid='ignore'):
+            grown = (1 + safe_r) ** k
+            owed = np.where(growth, col(principal) * grown - level * (grown - 1) / safe_r,
+                            col(principal) - level * k)
+        return np.maximum(owed, 0)
+
+    live = t <= col(term)
+    most = np.minimum(n, col(term - io))
+    paid = np.clip(t - col(io), 0, most)                 # level payments made by month end
+    opening = np.where(live, balance(np.clip(t - 1 - col(io), 0, most)), 0)
+    interest = opening * r
+    regular = np.where(t <= col(io), interest, np.minimum(level, opening + interest))
+    closing = np.where(live, balance(paid), 0)
+    balloon = np.where(t == col(term), closing, 0)
+    closing = np.where(t == col(term), 0, closing)
+    payment = np.where(live, regular, 0) + balloon
+    return {'payment': payment, 'interest': interest, 'principal': payment - interest,
+            'balance': closing, 'balloon': balloon}
+
+
+def debt_service(loans, months):
+    """Combined schedule of several loans, each a dict of amortize() arguments."""
+    total = None
+    for loan in loans:
+        s = amortize(**loan, months=months)
+        total = s if total is None else {k: total[k] + s[k] for k in total}
+    if total is None:
+        zero = np.zeros(months)
+        total = dict.fromkeys(('payment', 'interest', 'principal', 'balance', 'balloon'), zero)
+    return total
+
+
+def dscr(noi, payment, balloon=0.0):
+    """Debt service coverage: NOI over scheduled payments, balloons excluded; inf without debt."""
+    service = np.asarray(payment) - balloon
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(service > 0, noi / np.where(service > 0, service, 1), np.inf)
+
+
+def lever(profit, cash0, debt, service, equity_capex):
+    """Levered cash balance, runway and payback.
+
+    `profit` is the projected monthly operating profit (..., months),
+    `cash0` the equity cash after CapEx, `debt` the loan proceeds and
+    `service` the monthly payments. Payback is the months until profit
+    after debt service recovers the owner's share of the CapEx
+    (`equity_capex`); 0 where the debt funded it all.
+    """
+    flow = profit - service
+    cum = np.cumsum(flow, axis=-1)
+    opening = np.asarray(cash0 + debt, dtype=float)[..., np.newaxis]
+    balance = np.concatenate([np.broadcast_to(opening, cum.shape[:-1] + (1,)), opening + cum], axis=-1)
+    equity = np.broadcast_to(np.asarray(equity_capex, dtype=float), cum.shape[:-1])[..., np.newaxis]
+    unrecovered = np.concatenate([equity, equity - cum], axis=-1)
+    payback = np.where(equity[..., 0] > 0, projection.crossing_time(unrecovered), 0.0)
+    return {'flow': flow, 'balance': balance, 'runway': projection.crossing_time(balance), 'payback': payback}
+
+
+def summary(loans, months):
+    """Loan proceeds, payments and regular debt service of `loans`, for levering other views.
+
+    `loans` are amortize() arguments as for debt_service(). Returns
+    {'debt': proceeds, 'service': payments over `months`, 'debt_month':
+    the largest scheduled payment over the loans' life, balloons excluded}.
+    """
+    if not loans:
+        return {'debt': 0.0, 'service': np.zeros(months), 'debt_month': 0.0}
+    sched = debt_service(loans, max(months, *(loan['term'] for loan in loans)))
+    return {'debt': float(sum(loan['principal'] for loan in loans)), 'service': sched['payment'][:months],
+            'debt_month': float((sched['payment'] - sched['balloon']).max())}
+
+
+def levered_project(inputs, months, debt, **assumptions):
+    """projection.project() with balance, runway and payback levered by `debt` (see summary())."""
+    proj = projection.project(inputs, months, **assumptions)
+    if not debt['debt']:
+        return proj
+    equity_capex = np.maximum(np.asarray(inputs['reno']) + inputs['equip'] - debt['debt'], 0)
+    lev = lever(proj['profit'], proj['balance'][..., 0], debt['debt'], debt['service'], equity_capex)
+    return {**proj, 'balance': lev['balance'], 'runway': lev['runway'], 'payback': lev['payback']}
+
+
+def breakeven_cups(metrics, price, days, debt_month):
+    """Cups/day covering the fixed costs plus `debt_month` of debt service.
+
+    `metrics` is model.evaluate() output for `price` and `days`; NaN where
+    price does not exceed unit cost, as model's break-even.
+    """
+    margin = np.asarray(price) - metrics['unit']
+    viable = margin > 0
+    return np.where(viable, (metrics['fixed'] + debt_month) / np.where(viable, margin, 1), np.nan) / days
+
+
+def min_annual_dscr(noi, payment, balloon):
+    """Lowest 12-month DSCR over whole years of the schedule."""
+    years = noi.shape[-1] // 12
+    if years == 0:
+        return dscr(noi.sum(axis=-1), payment.sum(axis=-1), balloon.sum(axis=-1))
+    cut = years * 12
+    yearly = lambda x: x[..., :cut].reshape(*x.shape[:-1], years, 12).sum(axis=-1)
+    return dscr(yearly(noi), yearly(payment), yearly(balloon)).min(axis=-1)
+
+
+def offers(principal, profit, cash0, equity_capex, noi, rates=OFFER_RATES, terms=OFFER_TERMS, io=OFFER_IO):
+    """Price every rate × term × interest-only offer for `principal` against one projection.
+
+    `profit` is the projected monthly operating profit (months,) and `noi`
+    the steady-state monthly operating profit. Returns flat (N,) arrays:
+    'rate', 'term', 'io', 'payment' (regular P&I), 'total_interest' (over
+    the full term), 'dscr' (noi / regular payment), 'dscr_min' (lowest
+    12-month DSCR in the projection), 'runway' and 'payback' (levered).
+    """
+    months = len(profit)
+    r, t, i = (a.ravel() for a in np.meshgrid(rates, terms, io, indexing='ij'))
+    full = amortize(principal, r, t, i, months=int(max(terms)))
+    horizon = {k: v[:, :months] for k, v in full.items()}
+    # The regular payment: the first amortizing month
+    regular = np.take_along_axis(full['payment'] - full['balloon'], np.minimum(i, t - 1).astype(int)[:, np.newaxis],
+                                 axis=-1)[:, 0]
+    lev = lever(profit, cash0, principal, horizon['payment'], equity_capex)
+    return {
+        'rate': r, 'term': t, 'io': i,
+        'payment': regular,
+        'total_interest': full['interest'].sum(axis=-1),
+        'dscr': dscr(noi, regular),
+        'dscr_min': min_annual_dscr(np.broadcast_to(profit, horizon['payment'].shape), horizon['payment'],
+                                    horizon['balloon']),
+        'runway': lev['runway'],
+        'payback': lev['payback'],
+    }
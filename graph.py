@@ -0,0 +1,126 @@
+"""
+Incremental evaluation of a declared computation graph.
+
+A graph is a dict of named nodes, each `name: (inputs, fn)` where `inputs`
+names other nodes or free inputs and `fn` is called with their values in
+that order. A Graph evaluates every node in one pass (the batch path); an
+Evaluation keeps node values between calls and, when some inputs change,
+recomputes only the nodes downstream of them, and only once they are read.
+"""
+
+import numpy as np
+
+
+class CycleError(ValueError):
+    """Raised when the declared nodes do not form a DAG."""
+
+
+def _same(a, b):
+    if a is b:
+        return True
+    if type(a) is not type(b):
+        return False
+    try:
+        return bool(a == b)
+    except ValueError:
+        # Arrays compare elementwise
+        return np.array_equal(a, b)
+
+
+class Graph:
+    """A validated, topologically ordered set of nodes."""
+
+    def __init__(self, nodes):
+        self.nodes = dict(nodes)
+        self.inputs = tuple(dict.fromkeys(
+            i for deps, _ in self.nodes.values() for i in deps if i not in self.nodes))
+        self.order = self._toposort()
+        self.dependents = {name: set() for name in (*self.inputs, *self.nodes)}
+        for name, (deps, _) in self.nodes.items():
+            for dep in deps:
+                self.dependents[dep].add(name)
+
+    def _toposort(self):
+        order, state = [], {}
+
+        def visit(name, path):
+            if state.get(name) == 'done' or name not in self.nodes:
+                return
+            if state.get(name) == 'visiting':
+                raise CycleError(f"Cycle through {' -> '.join(path + [name])}")
+            state[name] = 'visiting'
+            for dep in self.nodes[name][0]:
+                visit(dep, path + [name])
+            state[name] = 'done'
+            order.append(name)
+
+        for name in self.nodes:
+            visit(name, [])
+        return tuple(order)
+
+    def downstream(self, names):
+        """Every node that depends, directly or not, on any of `names`."""
+        out, stack = set(), list(names)
+        while stack:
+            for dep in self.dependents.get(stack.pop(), ()):
+                if dep not in out:
+                    out.add(dep)
+                    stack.append(dep)
+        return out
+
+    def evaluate(self, **inputs):
+        """Compute every node from `inputs` in one pass; returns {node: value}."""
+        values = dict(inputs)
+        for name in self.order:
+            deps, fn = self.nodes[name]
+            values[name] = fn(*(values[d] for d in deps))
+        return {name: values[name] for name in self.nodes}
+
+    def evaluation(self):
+        return Evaluation(self)
+
+
+class Evaluation:
+    """Node values of one graph, kept between updates (e.g. per session).
+
+    `update(**inputs)` invalidates the nodes downstream of the inputs whose
+    value changed; reading a node (`ev[name]`) recomputes it and any stale
+    dependency on demand. `recomputed` counts node evaluations since the
+    last update.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+        self._inputs = {}
+        self._values = {}
+        self.recomputed = 0
+
+    def update(self, **inputs):
+        changed = [k for k, v in inputs.items()
+                   if k not in self._inputs or not _same(self._inputs[k], v)]
+        self._inputs.update(inputs)
+        for name in self.graph.downstream(changed):
+            self._values.pop(name, None)
+        self.recomputed = 0
+        return changed
+
+    def __getitem__(self, name):
+        if name in self._inputs:
+            return self._inputs[name]
+        try:
+            return self._values[name]
+        except KeyError:
+            pass
+        if name not in self.graph.nodes:
+            raise KeyError(f"Missing graph input: {name!r}")
+        deps, fn = self.graph.nodes[name]
+        value = self._values[name] = fn(*(self[d] for d in deps))
+        self.recomputed += 1
+        return value
+
+    def get(self, names):
+        return {name: self[name] for name in names}
+
+    def held(self):
+        """Inputs and node values currently held, without computing anything."""
+        return {**self._inputs, **self._values}
@@ -0,0 +1,168 @@
+"""
+Perishable inventory: ordering policies, spoilage and the true waste factor.
+
+The model used to gross every bean and milk cost up by a flat 10% for
+waste. Here a year of daily stock is simulated for dairy milk, oat milk
+and beans. Each day, deliveries ordered `lead` days earlier arrive.
+Stochastic demand is drawn first-in-first-out from stock. Whatever reaches
+the end of its shelf life is thrown away. Then the (s, S) policy orders up
+to S whenever stock on hand plus on order has fallen to s, in whole packs.
+
+Every policy variant of every ingredient is a row of the same arrays
+(stock by days of life left, deliveries by days until arrival), so the
+day loop runs once for hundreds of variants. All variants of an ingredient
+see the same demand path, so they are compared like for like.
+
+An ingredient's waste factor is what was bought per unit that went into a
+drink sold: (1 + process loss) × (1 + spoiled / used). It replaces the
+flat 1.1 in the model's unit economics (model.DEFAULTS 'bean_waste' and
+'milk_waste').
+"""
+
+import numpy as np
+
+import schedule
+
+# name -> unit, pack size (units per order line), shelf life and delivery
+# lead time (days), process loss (spills, dialing in, steaming pitchers)
+ITEMS = {
+    'milk': {'label': 'Dairy Milk', 'unit': 'gal', 'oz': 128, 'pack': 1.0, 'shelf': 10, 'lead': 1, 'loss': 0.05},
+    'oat': {'label': 'Oat Milk', 'unit': 'gal', 'oz': 128, 'pack': 1.0, 'shelf': 21, 'lead': 3, 'loss': 0.05},
+    'bean': {'label': 'Coffee Beans', 'unit': 'lb', 'oz': 453, 'pack': 5.0, 'shelf': 28, 'lead': 4, 'loss': 0.04},
+}
+
+# The flat allowance on beans and milk that the simulated factors replace
+FLAT_WASTE = 1.1
+
+# Policy grid, in days of average use: reorder point s and order-up-to S - s
+REORDER_DAYS = (0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 4.0, 5.0, 6.0, 7.0, 9.0, 12.0)
+ORDER_DAYS = (1.0, 2.0, 3.0, 4.0, 5.0, 7.0, 10.0, 14.0, 21.0, 28.0)
+
+# Day-to-day variation of use per cup sold (drink mix, pour sizes)
+USAGE_CV = 0.10
+
+
+def usage(cups, per_cup, loss, days=364, seed=11):
+    """Daily use of one ingredient in its unit: (days,) including process loss.
+
+    `per_cup` is the menu's average quantity per item sold, in units; cups
+    sold per day are Poisson around `cups` × the day-of-week multiplier.
+    """
+    rng = np.random.default_rng(seed)
+    week = np.asarray(schedule.WEEKLY, dtype=float)
+    sold = rng.poisson(cups * week[np.arange(days) % 7] / week.mean())
+    sigma = np.sqrt(np.log1p(USAGE_CV ** 2))
+    return sold * per_cup * (1 + loss) * rng.lognormal(-sigma ** 2 / 2, sigma, days)
+
+
+def simulate(demand, reorder, order_up_to, shelf, lead, pack):
+    """Simulate (s, S) policies against daily demand, one row per policy.
+
+    `demand` is (P, days); `reorder`, `order_up_to`, `shelf`, `lead` and
+    `pack` are (P,). Stock starts at S, fresh. Returns (P,) arrays:
+    'used', 'short' (demand not met), 'spoiled', 'bought', 'orders',
+    'stockout_days' and 'on_hand' (average units in stock).
+    """
+    P, days = demand.shape
+    rows = np.arange(P)
+    shelf = np.asarray(shelf, dtype=int)
+    lead = np.asarray(lead, dtype=int)
+    # stock[:, a]: units with a days of life left after today
+    stock = np.zeros((P, int(shelf.max())))
+    stock[rows, shelf - 1] = order_up_to
+    pipe = np.zeros((P, int(lead.max()) + 1))     # pipe[:, k]: arriving in k days
+    used = np.zeros(P)
+    short = np.zeros(P)
+    spoiled = np.zeros(P)
+    bought = np.zeros(P)
+    orders = np.zeros(P)
+    stockout_days = np.zeros(P)
+    on_hand = np.zeros(P)
+
+    for t in range(days):
+        stock[rows, shelf - 1] += pipe[:, 0]
+        pipe[:, :-1] = pipe[:, 1:]
+        pipe[:, -1] = 0
+
+        # First in, first out: oldest stock (least life left) goes first
+        need = demand[:, t]
+        before = np.cumsum(stock, axis=1) - stock
+        take = np.clip(need[:, np.newaxis] - before, 0, stock)
+        stock -= take
+        got = take.sum(axis=1)
+        used += got
+        gap = need - got
+        short += gap
+        stockout_days += gap > 1e-9
+
+        spoiled += stock[:, 0]
+        stock[:, :-1] = stock[:, 1:]
+        stock[:, -1] = 0
+        on_hand += stock.sum(axis=1)
+
+        position = stock.sum(axis=1) + pipe.sum(axis=1)
+        qty = np.where(position <= reorder, np.ceil((order_up_to - position) / pack - 1e-9) * pack, 0.0)
+        pipe[rows, lead - 1] += qty
+        bought += qty
+        orders += qty > 0
+
+    return {'used': used, 'short': short, 'spoiled': spoiled, 'bought': bought,
+            'orders': orders, 'stockout_days': stockout_days, 'on_hand': on_hand / days}
+
+
+def plan(cups, per_cup, shelf=None, fill_target=0.995, items=ITEMS, days=364, seed=11):
+    """Best ordering policy per ingredient and its waste factor.
+
+    `per_cup` maps ingredient name to the menu's average quantity per item
+    sold in ITEMS units; ingredients with none are skipped. `shelf`
+    overrides ITEMS shelf lives. For each ingredient the policy with the
+    least spoilage among those meeting `fill_target` (share of demand met
+    from stock) is chosen, or the best-filling one if none does.
+
+    Returns {name: {'reorder', 'order_up_to' (units), 'reorder_days',
+    'order_days', 'factor', 'waste_pct', 'fill', 'stockout_days',
+    'orders_per_month', 'on_hand', 'variants': {'fill', 'waste_pct'} per
+    variant}}.
+    """
+    shelf = {**{k: v['shelf'] for k, v in items.items()}, **(shelf or {})}
+    names = [k for k in items if per_cup.get(k, 0) > 0]
+    if not names:
+        return {}
+    r_days, q_days = (a.ravel() for a in np.meshgrid(REORDER_DAYS, ORDER_DAYS, indexing='ij'))
+    n = len(r_days)
+
+    demand, cols = [], {k: [] for k in ('reorder', 'order_up_to', 'shelf', 'lead', 'pack')}
+    for i, name in enumerate(names):
+        item = items[name]
+        use = usage(cups, per_cup[name], item['loss'], days, seed + i)
+        mean = use.mean()
+        demand.append(np.broadcast_to(use, (n, days)))
+        cols['reorder'].append(r_days * mean)
+        cols['order_up_to'].append((r_days + q_days) * mean)
+        cols['shelf'].append(np.full(n, shelf[name]))
+        cols['lead'].append(np.full(n, item['lead']))
+        cols['pack'].append(np.full(n, item['pack']))
+    res = simulate(np.concatenate(demand), *(np.concatenate(cols[k]) for k in cols))
+
+    out = {}
+    for i, name in enumerate(names):
+        part = slice(i * n, (i + 1) * n)
+        r = {k: v[part] for k, v in res.items()}
+        wanted = r['used'] + r['short']
+        fill = np.where(wanted > 0, r['used'] / np.maximum(wanted, 1e-12), 1.0)
+        spoil = r['spoiled'] / np.maximum(r['used'], 1e-12)
+        loss = items[name]['loss']
+        factor = (1 + loss) * (1 + spoil)
+        waste_pct = (1 - 1 / factor) * 100
+        ok = fill >= fill_target
+        best = int(np.argmin(np.where(ok, spoil + r['orders'] * 1e-9, np.inf))) if ok.any() else int(np.argmax(fill))
+        out[name] = {
+            'reorder': float(cols['reorder'][i][best]), 'order_up_to': float(cols['order_up_to'][i][best]),
+            'reorder_days': float(r_days[best]), 'order_days': float(q_days[best]),
+            'factor': float(factor[best]), 'waste_pct': float(waste_pct[best]), 'fill': float(fill[best]),
+            'stockout_days': int(r['stockout_days'][best]),
+            'orders_per_month': float(r['orders'][best] / days * 365 / 12),
+            'on_hand': float(r['on_hand'][best]),
+            'variants': {'fill': fill, 'waste_pct': waste_pct},
+        }
+    return out
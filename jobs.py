@@ -0,0 +1,111 @@
+"""
+Background PDF rendering.
+
+One PDFJobQueue per server process: a bounded worker pool renders reports
+off the Streamlit script thread, sessions keep only a job id and poll its
+status, and finished reports are kept in a small LRU keyed on the scenario
+hash so identical exports are served without rendering again.
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from report import create_pdf
+
+
+class QueueFull(RuntimeError):
+    """Raised when the server already has `max_pending` renders waiting."""
+
+
+class Job:
+    """Status of one render; fields are written by the worker thread only."""
+
+    __slots__ = ('id', 'key', 'state', 'progress', 'stage', 'result', 'error',
+                 'submitted', 'started', 'finished')
+
+    def __init__(self, key):
+        self.id = uuid.uuid4().hex
+        self.key = key
+        self.state = 'queued'      # queued → running → done | failed
+        self.progress = 0.0
+        self.stage = "Waiting for a free renderer"
+        self.result = None
+        self.error = None
+        self.submitted = time.monotonic()
+        self.started = self.finished = None
+
+    @property
+    def pending(self):
+        return self.state in ('queued', 'running')
+
+
+class PDFJobQueue:
+    """Render reports on at most `max_workers` threads per process.
+
+    Renders of the same scenario key are deduplicated while in flight and
+    for as long as the result stays in the `max_results` LRU. `on_finished`,
+    if given, is called with every job once its render succeeds or fails.
+    """
+
+    def __init__(self, max_workers=2, max_pending=32, max_results=64, on_finished=None):
+        self.max_pending = max_pending
+        self.max_results = max_results
+        self.on_finished = on_finished
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='pdf-render')
+        self._lock = threading.Lock()
+        self._jobs = {}                  # id -> Job, in flight or finished
+        self._by_key = OrderedDict()     # key -> Job, LRU order
+
+    def submit(self, key, data):
+        """Queue a render of `data` and return its Job (possibly a cached one)."""
+        with self._lock:
+            job = self._by_key.get(key)
+            if job is not None:
+                if job.state != 'failed':
+                    self._by_key.move_to_end(key)
+                    return job
+                del self._jobs[self._by_key.pop(key).id]
+            if sum(j.pending for j in self._jobs.values()) >= self.max_pending:
+                raise QueueFull("Too many reports are being generated right now.")
+            job = Job(key)
+            self._jobs[job.id] = job
+            self._by_key[key] = job
+            self._evict()
+        self._pool.submit(self._run, job, data)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def render_times(self):
+        """(seconds, bytes) of every finished render still held, oldest first."""
+        with self._lock:
+            return [(j.finished - j.started, len(j.result)) for j in self._by_key.values()
+                    if j.state == 'done']
+
+    def _run(self, job, data):
+        job.state, job.started = 'running', time.monotonic()
+
+        def progress(fraction, stage):
+            job.progress, job.stage = fraction, stage
+
+        try:
+            job.result = bytes(create_pdf(data, progress))
+            job.state = 'done'
+        except Exception as e:
+            job.error, job.state = f"{type(e).__name__}: {e}", 'failed'
+        finally:
+            job.finished = time.monotonic()
+        if self.on_finished is not None:
+            self.on_finished(job)
+
+    def _evict(self):
+        # Drop the oldest finished reports beyond the LRU bound; in-flight
+        # jobs are never evicted.
+        finished = [k for k, j in self._by_key.items() if not j.pending]
+        for key in finished[:max(0, len(self._by_key) - self.max_results)]:
+            del self._jobs[self._by_key.pop(key).id]
@@ -0,0 +1,185 @@
+"""
+Concurrent-session load test.
+
+    python loadtest.py [--sessions 1,4,16] [--edits 20] [--think 0.0] [--seed 0]
+                       [--out results.json] [--compare baseline.json] [--threshold 0.10]
+
+Drives N simulated sessions of app.py in one process through Streamlit's
+headless AppTest harness, the way one `streamlit run` process serves N
+browser tabs: every session enters the access code at the check_password
+gate, then makes random sidebar edits, each followed by a full rerun. The
+sessions run on their own threads and share the process's caches, like
+real sessions do.
+
+For each concurrency level it reports p50/p95/p99 rerun latency, reruns
+per second, CPU use of the process and resident memory added per session.
+Results use the bench.py JSON format, so --compare flags a level whose
+latency or throughput got worse than the baseline by more than --threshold.
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import threading
+import time
+
+import bench
+from bench import _percentile, _result
+from metrics import rss_bytes
+
+APP = bench.APP
+PASSWORD = "save150k"
+
+
+class Session:
+    """One simulated browser session of app.py."""
+
+    def __init__(self, rng):
+        from streamlit.testing.v1 import AppTest
+
+        self.rng = rng
+        self.at = AppTest.from_file(APP, default_timeout=120)
+        self.latencies = []
+
+    def _run(self):
+        t0 = time.perf_counter()
+        self.at.run()
+        self.latencies.append(time.perf_counter() - t0)
+        if self.at.exception:
+            raise RuntimeError(f"app.py raised: {self.at.exception[0].value}")
+
+    def login(self):
+        """Show the gate, then enter the access code."""
+        self._run()
+        self.at.text_input(key="password").input(PASSWORD)
+        self._run()
+        if not self.at.sidebar.number_input:
+            raise RuntimeError("Access code was not accepted")
+
+    def edit(self):
+        """Set one random sidebar number input to a random allowed value, then rerun."""
+        widget = self.rng.choice(self.at.sidebar.number_input)
+        steps = int(round((widget.max - widget.min) / widget.step))
+        value = widget.min + widget.step * self.rng.randint(0, steps)
+        # data_type 0 is an int input
+        widget.set_value(int(value) if widget.proto.data_type == 0 else round(value, 6))
+        self._run()
+
+
+def run_level(n_sessions, edits, think=0.0, seed=0):
+    """Run `n_sessions` concurrent sessions of `edits` reruns each."""
+    sessions = [Session(random.Random(seed + i)) for i in range(n_sessions)]
+    errors = []
+    start = threading.Barrier(n_sessions + 1)
+
+    def drive(session):
+        try:
+            start.wait()
+            session.login()
+            for _ in range(edits):
+                if think:
+                    time.sleep(session.rng.expovariate(1 / think))
+                session.edit()
+        except Exception as exc:   # reported after the level
+            errors.append(exc)
+
+    threads = [threading.Thread(target=drive, args=(s,), daemon=True) for s in sessions]
+    for t in threads:
+        t.start()
+    rss0 = rss_bytes()
+    cpu0, wall0 = time.process_time(), time.perf_counter()
+    start.wait()
+    for t in threads:
+        t.join()
+    wall, cpu = time.perf_counter() - wall0, time.process_time() - cpu0
+    if errors:
+        raise errors[0]
+
+    # Edits only: the gate and first dashboard run are cold-path costs measured by bench.py
+    times = sorted(t for s in sessions for t in s.latencies[2:])
+    reruns = sum(len(s.latencies) for s in sessions)
+    return {
+        'sessions': n_sessions,
+        'reruns': reruns,
+        'p50_ms': statistics.median(times) * 1000,
+        'p95_ms': _percentile(times, 0.95) * 1000,
+        'p99_ms': _percentile(times, 0.99) * 1000,
+        'reruns_per_s': reruns / wall,
+        'cpu_pct': 100 * cpu / wall,
+        # Read while `sessions` still holds every session's state
+        'rss_per_session_mb': max(rss_bytes() - rss0, 0) / n_sessions / 2**20,
+    }
+
+
+def run(levels, edits, think=0.0, seed=0):
+    # Warm-up session: imports, caches and the first dashboard run are paid
+    # once per process, not per session
+    warm = Session(random.Random(seed))
+    warm.login()
+    del warm
+
+    rows, results = [], {}
+    for n in levels:
+        print(f"Running {n} session(s)...", file=sys.stderr)
+        row = run_level(n, edits, think, seed)
+        rows.append(row)
+        results.update({
+            f'load.{n}.p50': _result(row['p50_ms'], 'ms', 'lower'),
+            f'load.{n}.p95': _result(row['p95_ms'], 'ms', 'lower'),
+            f'load.{n}.p99': _result(row['p99_ms'], 'ms', 'lower'),
+            f'load.{n}.throughput': _result(row['reruns_per_s'], 'reruns/s', 'higher'),
+            f'load.{n}.cpu': _result(row['cpu_pct'], '%', 'lower'),
+            f'load.{n}.rss_per_session': _result(row['rss_per_session_mb'], 'MB', 'lower'),
+        })
+    return {'environment': bench.environment(), 'results': results, 'levels': rows}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test app.py with concurrent simulated sessions.")
+    parser.add_argument('--sessions', default='1,4,16', help="comma-separated concurrency levels (default: 1,4,16)")
+    parser.add_argument('--edits', type=int, default=20, help="sidebar edits per session (default: 20)")
+    parser.add_argument('--think', type=float, default=0.0, help="mean think time between edits in seconds (default: 0)")
+    parser.add_argument('--seed', type=int, default=0, help="random seed for the edits (default: 0)")
+    parser.add_argument('--out', default=None, help="write results JSON here (default: stdout)")
+    parser.add_argument('--compare', default=None, help="baseline results JSON to check for regressions")
+    parser.add_argument('--threshold', type=float, default=0.10, help="allowed slowdown as a fraction (default: 0.10)")
+    args = parser.parse_args(argv)
+
+    try:
+        levels = [int(n) for n in args.sessions.split(',') if n.strip()]
+    except ValueError:
+        parser.error("--sessions must be comma-separated integers")
+    if not levels or min(levels) < 1:
+        parser.error("--sessions needs at least one level of 1 or more")
+
+    current = run(levels, args.edits, args.think, args.seed)
+    text = json.dumps(current, indent=2)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    print(f"{'sessions':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'reruns/s':>9} {'CPU %':>7} {'MB/sess':>8}",
+          file=sys.stderr)
+    for row in current['levels']:
+        print(f"{row['sessions']:>8} {row['p50_ms']:>9,.1f} {row['p95_ms']:>9,.1f} {row['p99_ms']:>9,.1f} "
+              f"{row['reruns_per_s']:>9,.1f} {row['cpu_pct']:>7,.0f} {row['rss_per_session_mb']:>8,.2f}",
+              file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = bench.compare(current, baseline, args.threshold)
+        for name, old, new, change in regressions:
+            print(f"REGRESSION {name}: {old:,.2f} -> {new:,.2f} ({change:+.1%})", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against {args.compare}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
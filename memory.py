@@ -0,0 +1,99 @@
+"""
+Per-session memory accounting and idle eviction.
+
+Large per-session artifacts (a session's model evaluation, a captured
+rerun profile) are kept in one process-wide SessionStore rather than in
+st.session_state, and each session holds only its id. The store records
+when every session last ran and drops the artifacts of sessions idle for
+longer than `idle_ttl`, so an abandoned tab keeps only its widget state;
+a session that comes back rebuilds what it needs on its next rerun.
+usage() reports the bytes held by every session, by category.
+"""
+
+import threading
+import time
+
+from cache import sizeof
+
+
+class _Session:
+    __slots__ = ('seen', 'state_bytes', 'artifacts')
+
+    def __init__(self):
+        self.seen = time.monotonic()
+        self.state_bytes = 0
+        self.artifacts = {}      # category -> value
+
+
+def artifact_bytes(value):
+    """sizeof(), counting a graph.Evaluation by the values it holds."""
+    return sizeof(value.held() if hasattr(value, 'held') else value)
+
+
+def state_bytes(session_state):
+    """Approximate bytes held by a session's st.session_state entries."""
+    return sum(sizeof(v) for v in session_state.values())
+
+
+class SessionStore:
+    """Per-session artifacts of one process, evicted after `idle_ttl` seconds idle."""
+
+    def __init__(self, idle_ttl=900.0):
+        self.idle_ttl = idle_ttl
+        self._lock = threading.Lock()
+        self._sessions = {}      # session id -> _Session
+        self.evicted = 0
+
+    def touch(self, sid, state_bytes=0):
+        """Mark `sid` active now and record the size of its session state."""
+        with self._lock:
+            session = self._sessions.get(sid)
+            if session is None:
+                session = self._sessions[sid] = _Session()
+            session.seen = time.monotonic()
+            session.state_bytes = state_bytes
+
+    def get(self, sid, category, default=None):
+        with self._lock:
+            session = self._sessions.get(sid)
+            return default if session is None else session.artifacts.get(category, default)
+
+    def put(self, sid, category, value):
+        with self._lock:
+            session = self._sessions.get(sid)
+            if session is None:
+                session = self._sessions[sid] = _Session()
+            session.artifacts[category] = value
+        return value
+
+    def pop(self, sid, category, default=None):
+        with self._lock:
+            session = self._sessions.get(sid)
+            return default if session is None else session.artifacts.pop(category, default)
+
+    def active(self, within=300.0):
+        """Number of sessions that reran in the last `within` seconds."""
+        cutoff = time.monotonic() - within
+        with self._lock:
+            return sum(s.seen >= cutoff for s in self._sessions.values())
+
+    def sweep(self):
+        """Drop every session idle for longer than `idle_ttl`; returns how many."""
+        cutoff = time.monotonic() - self.idle_ttl
+        with self._lock:
+            idle = [sid for sid, s in self._sessions.items() if s.seen < cutoff]
+            for sid in idle:
+                del self._sessions[sid]
+            self.evicted += len(idle)
+        return len(idle)
+
+    def usage(self):
+        """One row per session: id, idle seconds and bytes per category, largest first."""
+        now = time.monotonic()
+        with self._lock:
+            sessions = [(sid, s.seen, s.state_bytes, dict(s.artifacts)) for sid, s in self._sessions.items()]
+        rows = []
+        for sid, seen, state, artifacts in sessions:
+            sizes = {'state': state, **{category: artifact_bytes(v) for category, v in artifacts.items()}}
+            rows.append({'session': sid[:8], 'idle_s': now - seen, **sizes, 'total': sum(sizes.values())})
+        return sorted(rows, key=lambda r: r['total'], reverse=True)
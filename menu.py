@@ -0,0 +1,127 @@
+"""
+Menu model: what is sold, in what mix, and what goes into each item.
+
+A menu is a table of items with a price, a share of sales and a bill of
+materials (BOM): grams of beans, ounces of dairy and oat milk, and dollars
+of bought-in food per item. Each item also carries its service time:
+seconds of barista work and seconds on an espresso group head (0 for
+drinks that need no shot). Costs are linear in ingredient prices, so
+
+    item cost      = ingredient prices @ BOM.T + packaging      (..., items)
+    cost per cup   = ingredient prices @ (mix @ BOM) + packaging
+    average ticket = item prices @ mix
+
+and any number of price scenarios (the leading axes of the price arrays)
+against a menu of any length is one matrix product. The mix-weighted BOM
+is what the model's unit economics take as the average cup (summarize()).
+"""
+
+import numpy as np
+
+import model
+
+# BOM columns: name -> unit of the quantity per item
+INGREDIENTS = {'bean': 'g', 'milk': 'oz', 'oat': 'oz', 'food': '$'}
+
+# Service columns: barista seconds and espresso group seconds per item
+SERVICE = ('secs', 'pull')
+
+COLUMNS = ('item', 'price', 'mix', *INGREDIENTS, *SERVICE)
+
+# Q1/2026 US specialty café menu: item, price ($), mix (% of items sold),
+# beans (g), dairy (oz), oat milk (oz), bought-in food ($), barista seconds,
+# group-head seconds. The mix-weighted average is the model's default cup
+# (model.DEFAULTS).
+DEFAULT_MENU = (
+    ('Espresso', 3.50, 6, 18, 0, 0, 0.00, 45, 30),
+    ('Americano', 4.50, 10, 18, 0, 0, 0.00, 60, 30),
+    ('Drip Coffee', 4.00, 10, 20, 1, 0, 0.00, 30, 0),
+    ('Latte', 6.25, 22, 18, 12, 0, 0.00, 90, 30),
+    ('Cappuccino', 5.50, 10, 18, 8, 0, 0.00, 90, 30),
+    ('Oat Milk Latte', 6.75, 10, 18, 0, 12, 0.00, 95, 30),
+    ('Cold Brew', 6.00, 12, 30, 1, 0, 0.00, 30, 0),
+    ('Mocha', 6.50, 8, 18, 10, 0, 0.40, 105, 30),
+    ('Pastry', 5.00, 12, 0, 0, 0, 1.60, 30, 0),
+)
+
+
+def table(rows=DEFAULT_MENU):
+    """Menu arrays from rows of COLUMNS: item names, prices, mix, BOM and service times.
+
+    The mix is normalized to fractions summing to 1; items with no share
+    are kept (they still get a cost) but do not count towards the average.
+    """
+    rows = list(rows)
+    if not rows:
+        raise ValueError("menu has no items")
+    cols = list(zip(*rows))
+    n_bom = len(INGREDIENTS)
+    mix = np.asarray(cols[2], dtype=float)
+    if (mix < 0).any() or mix.sum() <= 0:
+        raise ValueError("sales mix must be non-negative with a positive total")
+    return {
+        'item': [str(name) for name in cols[0]],
+        'price': np.asarray(cols[1], dtype=float),
+        'mix': mix / mix.sum(),
+        'bom': np.column_stack([np.asarray(c, dtype=float) for c in cols[3:3 + n_bom]]),
+        **{name: np.asarray(c, dtype=float) for name, c in zip(SERVICE, cols[3 + n_bom:])},
+    }
+
+
+def _waste(waste):
+    """Waste factor per ingredient: `waste` over the model's defaults."""
+    default = {'bean': model.DEFAULTS['bean_waste'], 'milk': model.DEFAULTS['milk_waste'],
+               'oat': model.DEFAULTS['milk_waste']}
+    return {**default, **(waste or {})}
+
+
+def ingredient_prices(bean, milk, oat, waste=None):
+    """Cost per BOM unit of each ingredient, stacked on a trailing axis.
+
+    Bean price is per lb and both milks per 128 oz, as in the model, each
+    grossed up by its waste factor (`waste` maps 'bean', 'milk' and 'oat'
+    to factors, by default the model's). Inputs broadcast, giving shape
+    (..., 4).
+    """
+    w = _waste(waste)
+    bean, milk, oat = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (bean, milk, oat)))
+    return np.stack([bean / 453 * w['bean'], milk / 128 * w['milk'], oat / 128 * w['oat'], np.ones_like(bean)],
+                    axis=-1)
+
+
+def item_costs(menu, bean, milk, oat, pkg, waste=None):
+    """Cost of every menu item under each price scenario, shape (..., items)."""
+    return ingredient_prices(bean, milk, oat, waste) @ menu['bom'].T + np.asarray(pkg, dtype=float)[..., np.newaxis]
+
+
+def unit_cost(menu, bean, milk, oat, pkg, waste=None):
+    """Mix-weighted cost per item sold under each price scenario."""
+    return ingredient_prices(bean, milk, oat, waste) @ (menu['mix'] @ menu['bom']) + pkg
+
+
+def average_price(menu, prices=None):
+    """Mix-weighted ticket; `prices` may hold per-item price scenarios (..., items)."""
+    return (menu['price'] if prices is None else np.asarray(prices, dtype=float)) @ menu['mix']
+
+
+def per_cup(menu):
+    """Mix-weighted quantity of each ingredient per item sold: {name: amount}."""
+    return dict(zip(INGREDIENTS, (float(x) for x in menu['mix'] @ menu['bom'])))
+
+
+def summarize(menu, milk, oat, waste=None):
+    """The menu as the model's average cup.
+
+    Returns the model inputs it determines: 'price', 'bean_g', 'milk_oz',
+    'food', 'milk_p', the dairy/oat price blended by volume poured, and
+    'bean_waste' and 'milk_waste' (the dairy and oat factors blended by
+    spend), so that model.evaluate's unit cost equals unit_cost() for this
+    menu and `waste`.
+    """
+    q, w = per_cup(menu), _waste(waste)
+    milk_oz = q['milk'] + q['oat']
+    milk_p = (q['milk'] * milk + q['oat'] * oat) / milk_oz if milk_oz > 0 else milk
+    spend = q['milk'] * milk + q['oat'] * oat
+    milk_waste = (q['milk'] * milk * w['milk'] + q['oat'] * oat * w['oat']) / spend if spend > 0 else w['milk']
+    return {'price': float(average_price(menu)), 'bean_g': q['bean'], 'milk_oz': milk_oz, 'food': q['food'],
+            'milk_p': float(milk_p), 'bean_waste': float(w['bean']), 'milk_waste': float(milk_waste)}
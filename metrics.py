@@ -0,0 +1,243 @@
+"""
+Process metrics in the Prometheus text format.
+
+A Registry holds counters and histograms that the hot paths update (a
+lock and a few additions per call) and callback metrics that are read
+only when scraped, such as cache statistics or process RSS. serve()
+exposes the registry on a local HTTP port for Prometheus to scrape.
+Standard library only, so it can be imported before the access gate.
+
+    registry = Registry()
+    reruns = registry.counter('app_reruns_total', "Script reruns.", ('page',))
+    reruns.inc(page='dashboard')
+    serve(registry, 9108)       # GET http://127.0.0.1:9108/metrics
+"""
+
+import bisect
+import os
+import resource
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Seconds; suits reruns (tens of ms) up to PDF renders (seconds)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def rss_bytes():
+    """Current resident set size of this process."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        # Peak rather than current RSS (KB on Linux, bytes on macOS)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def start_time():
+    """When this process started, in seconds since the epoch; None if unknown.
+
+    From /proc (start ticks after boot plus the boot time) on Linux, else
+    psutil when installed.
+    """
+    try:
+        with open('/proc/self/stat') as f:
+            # Fields after the command name, which may itself contain spaces
+            ticks = int(f.read().rsplit(')', 1)[1].split()[19])
+        with open('/proc/stat') as f:
+            boot = next(int(line.split()[1]) for line in f if line.startswith('btime '))
+        return boot + ticks / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError, StopIteration):
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().create_time()
+
+
+def _escape(value):
+    return str(value).replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"')
+
+
+def _labels(names, values, extra=()):
+    pairs = [*zip(names, values), *extra]
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{n}="{_escape(v)}"' for n, v in pairs) + '}'
+
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = 'untyped'
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def render(self):
+        return [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} {self.kind}', *self._samples()]
+
+
+class Counter(_Metric):
+    """Monotonic count, optionally split by labels."""
+
+    kind = 'counter'
+
+    def __init__(self, name, help, labelnames=()):
+        super().__init__(name, help, labelnames)
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def _samples(self):
+        with self._lock:
+            values = dict(self._values)
+        return [f'{self.name}{_labels(self.labelnames, k)} {_number(v)}' for k, v in values.items()]
+
+
+class Histogram(_Metric):
+    """Observations counted into fixed cumulative buckets, plus their sum."""
+
+    kind = 'histogram'
+
+    def __init__(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}        # label values -> [counts per bucket and +Inf, sum]
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][i] += 1
+            series[1] += value
+
+    def _samples(self):
+        with self._lock:
+            series = {k: (list(counts), total) for k, (counts, total) in self._series.items()}
+        lines = []
+        for key, (counts, total) in series.items():
+            cumulative = 0
+            for le, n in zip((*self.buckets, float('inf')), counts):
+                cumulative += n
+                lines.append(f'{self.name}_bucket{_labels(self.labelnames, key, [("le", _number(le))])} {cumulative}')
+            lines.append(f'{self.name}_sum{_labels(self.labelnames, key)} {_number(total)}')
+            lines.append(f'{self.name}_count{_labels(self.labelnames, key)} {cumulative}')
+        return lines
+
+
+class Callback(_Metric):
+    """Gauge or counter whose value is read from `fn()` at scrape time."""
+
+    def __init__(self, name, help, fn, kind='gauge'):
+        super().__init__(name, help)
+        self.fn = fn
+        self.kind = kind
+
+    def _samples(self):
+        return [f'{self.name} {_number(self.fn())}']
+
+
+class Registry:
+    """Named metrics of one process, rendered together for a scrape.
+
+    Registering a name that already exists returns the existing metric, so
+    code that runs on every rerun can declare what it updates.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+
+    def _register(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, help, labelnames=()):
+        return self._register(Counter(name, help, labelnames))
+
+    def histogram(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def gauge(self, name, help, fn):
+        return self._register(Callback(name, help, fn, 'gauge'))
+
+    def counter_fn(self, name, help, fn):
+        return self._register(Callback(name, help, fn, 'counter'))
+
+    def get(self, name):
+        return self._metrics.get(name)
+
+    def render(self):
+        """The whole registry in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            try:
+                lines += metric.render()
+            except Exception as e:   # one failing callback must not break the scrape
+                lines.append(f'# {metric.name} unavailable: {type(e).__name__}')
+        return '\n'.join(lines) + '\n'
+
+
+def process_metrics(registry):
+    """Register resident memory, CPU time and, where it can be read, the start time of this process."""
+    registry.gauge('process_resident_memory_bytes', "Resident memory size in bytes.", rss_bytes)
+    registry.counter_fn('process_cpu_seconds_total', "User and system CPU time spent in seconds.", time.process_time)
+    started = start_time()
+    if started is not None:
+        registry.gauge('process_start_time_seconds', "Start time of the process since the epoch in seconds.",
+                       lambda: started)
+    return registry
+
+
+def serve(registry, port, addr='127.0.0.1'):
+    """Serve `registry` at http://addr:port/metrics from a daemon thread; returns the server."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] not in ('/metrics', '/'):
+                self.send_error(404)
+                return
+            body = registry.render().encode()
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass   # scrapes every few seconds would flood the server log
+
+    server = ThreadingHTTPServer((addr, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True).start()
+    return server
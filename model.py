@@ -0,0 +1,172 @@
+"""
+Vectorized financial model behind the simulator.
+
+Every sidebar input may be a scalar or a NumPy array; all inputs are
+broadcast together and every derived metric is returned as an array of the
+broadcast shape. The formulas are exactly those of the dashboard's
+CALCULATIONS block, with the scalar branches expressed as masks, and are
+declared once as graph NODES so the dashboard can recompute only what an
+input change affects.
+"""
+
+import numpy as np
+
+from graph import Graph
+
+# Q1/2026 US market defaults, keyed as in the sidebar ('milk'/'oat' are the
+# two milk prices; the model takes whichever one is selected as 'milk_p').
+# Price and the per-cup quantities are those of menu.DEFAULT_MENU's average
+# item; the waste factors (bought per unit that ends up in a cup sold) are
+# inventory.plan()'s for that menu at the default volume.
+DEFAULTS = {
+    'cap': 350000, 'reno': 185000, 'equip': 85000,
+    'milk': 4.48, 'oat': 5.20, 'bean': 14.50, 'pkg': 0.17,
+    'bean_g': 17.48, 'milk_oz': 5.66, 'food': 0.224, 'bean_waste': 1.04, 'milk_waste': 1.05,
+    'wage': 15.0, 'burden': 0.18, 'rent': 45.0, 'nnn': 12.0, 'util': 1200,
+    'sqft': 800, 'staff': 3, 'hrs': 8.0, 'price': 5.50, 'cups': 120, 'days': 30
+}
+
+# Allowed (min, max) of each DEFAULTS key, as enforced by the sidebar's
+# st.number_input widgets; int bounds mark whole-number inputs
+BOUNDS = {
+    'cap': (10000, 2000000), 'reno': (0, 500000), 'equip': (0, 300000),
+    'milk': (2.0, 10.0), 'oat': (2.0, 12.0), 'bean': (8.0, 30.0), 'pkg': (0.05, 0.50),
+    'bean_g': (0.0, 60.0), 'milk_oz': (0.0, 24.0), 'food': (0.0, 10.0),
+    'bean_waste': (1.0, 3.0), 'milk_waste': (1.0, 3.0),
+    'wage': (10.0, 30.0), 'burden': (0.0, 0.40), 'rent': (10.0, 200.0), 'nnn': (0.0, 50.0), 'util': (500, 5000),
+    'sqft': (200, 5000), 'staff': (1, 20), 'hrs': (4.0, 12.0), 'price': (3.0, 12.0), 'cups': (20, 500), 'days': (20, 31)
+}
+
+# Model inputs, in sidebar order
+INPUTS = (
+    'cap', 'reno', 'equip',
+    'milk_p', 'bean', 'pkg',
+    'bean_g', 'milk_oz', 'food', 'bean_waste', 'milk_waste',
+    'wage', 'burden',
+    'rent', 'nnn', 'util', 'sqft',
+    'staff', 'hrs',
+    'price', 'cups', 'days',
+)
+
+# Derived metrics returned by evaluate()
+METRICS = (
+    'cash', 'bean_c', 'milk_c', 'unit',
+    'mo_cups', 'rev', 'cogs', 'labor', 'rent_b', 'rent_n', 'rent_t', 'exp', 'profit',
+    'rent_r', 'labor_r', 'cogs_r', 'margin',
+    'burn', 'runway', 'payback',
+    'fixed', 'be_cups_month', 'be_cups_day',
+)
+
+
+def _ratio(num, den):
+    """`num / den * 100` where `den > 0`, else 0."""
+    ok = den > 0
+    return np.where(ok, num / np.where(ok, den, 1) * 100, 0.0)
+
+
+def _survival(profit, cash):
+    burning = (profit < 0) & (cash > 0)
+    return burning, np.where(burning, -profit, 1)
+
+
+def _runway(profit, cash):
+    burning, loss = _survival(profit, cash)
+    return np.where(burning, cash / loss, np.where(profit >= 0, np.inf, 0.0))
+
+
+def _payback(profit, reno, equip):
+    earning = profit > 0
+    return np.where(earning, (reno + equip) / np.where(earning, profit, 1), np.inf)
+
+
+def _be_cups_month(fixed, price, unit):
+    viable = price > unit
+    return np.where(viable, fixed / np.where(viable, price - unit, 1), np.nan)
+
+
+# The model as named nodes: name -> (inputs, fn). Inputs are other nodes or
+# model INPUTS; graph.Graph orders them and graph.Evaluation recomputes only
+# what an input change reaches.
+NODES = {
+    'cash': (('cap', 'reno', 'equip'), lambda cap, reno, equip: cap - reno - equip),
+
+    # Unit economics of the average item sold (see menu.summarize)
+    'bean_c': (('bean', 'bean_g', 'bean_waste'),
+               lambda bean, bean_g, bean_waste: (bean / 453) * bean_g * bean_waste),
+    'milk_c': (('milk_p', 'milk_oz', 'milk_waste'),
+               lambda milk_p, milk_oz, milk_waste: (milk_p / 128) * milk_oz * milk_waste),
+    'unit': (('bean_c', 'milk_c', 'food', 'pkg'), lambda bean_c, milk_c, food, pkg: bean_c + milk_c + food + pkg),
+
+    # Monthly P&L
+    'mo_cups': (('cups', 'days'), lambda cups, days: cups * days),
+    'rev': (('mo_cups', 'price'), lambda mo_cups, price: mo_cups * price),
+    'cogs': (('mo_cups', 'unit'), lambda mo_cups, unit: mo_cups * unit),
+    'labor': (('staff', 'hrs', 'days', 'wage', 'burden'),
+              lambda staff, hrs, days, wage, burden: staff * hrs * days * wage * (1 + burden)),
+    'rent_b': (('sqft', 'rent'), lambda sqft, rent: (sqft * rent) / 12),
+    'rent_n': (('sqft', 'nnn'), lambda sqft, nnn: (sqft * nnn) / 12),
+    'rent_t': (('rent_b', 'rent_n'), lambda rent_b, rent_n: rent_b + rent_n),
+    'exp': (('cogs', 'labor', 'rent_t', 'util'), lambda cogs, labor, rent_t, util: cogs + labor + rent_t + util),
+    'profit': (('rev', 'exp'), lambda rev, exp: rev - exp),
+
+    # Ratios (% of revenue)
+    'rent_r': (('rent_t', 'rev'), _ratio),
+    'labor_r': (('labor', 'rev'), _ratio),
+    'cogs_r': (('cogs', 'rev'), _ratio),
+    'margin': (('profit', 'rev'), _ratio),
+
+    # Survival
+    'burn': (('profit', 'cash'), lambda profit, cash: np.where(_survival(profit, cash)[0], -profit, 0.0)),
+    'runway': (('profit', 'cash'), _runway),
+    'payback': (('profit', 'reno', 'equip'), _payback),
+
+    # Break-even
+    'fixed': (('labor', 'rent_t', 'util'), lambda labor, rent_t, util: labor + rent_t + util),
+    'be_cups_month': (('fixed', 'price', 'unit'), _be_cups_month),
+    'be_cups_day': (('be_cups_month', 'days'), lambda be_cups_month, days: be_cups_month / days),
+}
+
+GRAPH = Graph(NODES)
+
+
+def evaluate(cap, reno, equip, milk_p, bean, pkg, wage, burden, rent, nnn, util,
+             sqft, staff, hrs, price, cups, days, bean_g=DEFAULTS['bean_g'],
+             milk_oz=DEFAULTS['milk_oz'], food=DEFAULTS['food'], bean_waste=DEFAULTS['bean_waste'],
+             milk_waste=DEFAULTS['milk_waste']):
+    """Evaluate the monthly model for one or many scenarios in one pass.
+
+    `burden` is a fraction (0.18, not 18). `bean_g`, `milk_oz` and `food`
+    are grams of beans, ounces of milk and dollars of food in the average
+    item sold; `bean_waste` and `milk_waste` gross them up to what is bought
+    (1.05 = 5% spilled or spoiled). Returns a dict keyed by METRICS.
+    Runway and payback are `inf` where the scalar model would show ∞/N/A;
+    break-even figures are NaN where price does not exceed unit cost.
+    """
+    inputs = (cap, reno, equip, milk_p, bean, pkg, bean_g, milk_oz, food, bean_waste, milk_waste,
+              wage, burden, rent, nnn, util, sqft, staff, hrs, price, cups, days)
+    shape = np.broadcast_shapes(*(np.shape(x) for x in inputs))
+    out = GRAPH.evaluate(**dict(zip(INPUTS, map(np.asarray, inputs))))
+    if not shape:
+        # One scenario: every value is already 0-d
+        return {k: np.asarray(out[k]) for k in METRICS}
+    # Terms that depend only on scalar inputs are computed once and broadcast
+    # as read-only views rather than materialized per scenario.
+    return {k: np.broadcast_to(out[k], shape) for k in METRICS}
+
+
+def resolve_inputs(values, milk_type='Dairy'):
+    """Map DEFAULTS-keyed values to model inputs, filling gaps from DEFAULTS.
+
+    `milk_type` ('Dairy' or 'Oat') may be a scalar or an array per scenario.
+    """
+    v = {**DEFAULTS, **values}
+    out = {k: v[k] for k in INPUTS if k != 'milk_p'}
+    out['milk_p'] = np.where(np.asarray(milk_type) == 'Oat', v['oat'], v['milk'])
+    if out['milk_p'].ndim == 0:
+        out['milk_p'] = out['milk_p'].item()
+    return out
+
+
+def scalar(result):
+    """Unwrap a single-scenario result into plain Python numbers."""
+    return {k: np.asarray(v).item() for k, v in result.items()}
@@ -0,0 +1,173 @@
+"""
+Plan optimizer over price, staffing and hours.
+
+Searches price/cup, number of employees and hours per employee for the plan
+with the highest monthly profit or the shortest payback, subject to the
+risk indicators' limits (labor ≤ 35%, rent ≤ 15%, COGS ≤ 30% of revenue)
+and to the CapEx fitting within the available capital plus any loans.
+Cups/day is not a free choice: demand follows price along a constant-elasticity curve through
+the current plan, and cups sold are capped by what the staff can serve.
+With loans, profit, break-even, runway and payback are levered as on the
+dashboard: debt service is a fixed cost and comes out of every projected
+month.
+
+Every candidate of a coarse grid is evaluated in one vectorized model call,
+then the best plan is refined locally to the cent; the Pareto frontier of
+profit against break-even volume is taken over all feasible candidates.
+"""
+
+import numpy as np
+
+import financing
+import model
+
+# Same thresholds as the dashboard's risk indicators (percent of revenue)
+RISK_LIMITS = {'labor_r': 35.0, 'rent_r': 15.0, 'cogs_r': 30.0}
+
+OBJECTIVES = ('profit', 'payback')
+
+# Decision variables: name -> (min, max, coarse step, refined step); staff
+# and hours keep the sidebar's own steps
+SEARCH = {
+    'price': (*model.BOUNDS['price'], 0.10, 0.01),
+    'staff': (*model.BOUNDS['staff'], 1, 1),
+    'hrs': (*model.BOUNDS['hrs'], 0.5, 0.5),
+}
+
+
+def demand(price, ref_price, ref_cups, elasticity):
+    """Cups/day at `price` on a constant-elasticity curve through (ref_price, ref_cups)."""
+    return ref_cups * (np.asarray(price, dtype=float) / ref_price) ** -elasticity
+
+
+def plans(inputs, price, staff, hrs, elasticity=1.0, throughput=10.0):
+    """Model inputs for candidate plans, with cups/day from demand and capacity.
+
+    `throughput` is cups one employee can serve per hour worked; cups/day
+    is the lower of demand and staff × hours × throughput, within the
+    sidebar's cups/day bounds.
+    """
+    cups = np.minimum(demand(price, inputs['price'], inputs['cups'], elasticity), staff * hrs * throughput)
+    cups = np.clip(np.round(cups), *model.BOUNDS['cups'])
+    return {**inputs, 'price': price, 'staff': staff, 'hrs': hrs, 'cups': cups}
+
+
+def _grid(lo, hi, step):
+    if isinstance(step, int):
+        return np.arange(int(lo), int(hi) + 1, step)
+    return np.round(np.arange(lo, hi + step / 2, step), 2)
+
+
+def _score(cand, objective, limits, months, assumptions, debt):
+    """(metrics, feasible mask, score to maximize) for candidate plan inputs."""
+    res = model.evaluate(**cand)
+    feasible = np.asarray(res['cash']) + debt['debt'] >= 0
+    for name, limit in limits.items():
+        feasible &= np.asarray(res[name]) <= limit
+    res = {k: np.asarray(v) for k, v in res.items()}
+    # Debt service is a fixed cost: it comes off the profit and the cups
+    # sold have to cover it
+    res['net_profit'] = res['profit'] - debt['debt_month']
+    if debt['debt_month']:
+        res['be_cups_day'] = financing.breakeven_cups(res, cand['price'], cand['days'], debt['debt_month'])
+        res['be_cups_month'] = res['be_cups_day'] * cand['days']
+    if objective == 'profit':
+        return res, feasible, res['net_profit']
+    # Payback as on the dashboard: months of the projection until the CapEx
+    # is recovered. Projected only where it can be finite.
+    payback = np.full(feasible.shape, np.inf)
+    live = np.flatnonzero(feasible & (res['profit'] > 0))
+    for start in range(0, len(live), 8192):
+        idx = live[start:start + 8192]
+        sub = {k: v[idx] if np.ndim(v) else v for k, v in cand.items()}
+        payback[idx] = financing.levered_project(sub, months, debt, **assumptions)['payback']
+    res['payback'] = payback
+    return res, feasible & np.isfinite(payback), -payback
+
+
+def frontier(profit, be_cups):
+    """Indices of plans not beaten on both higher profit and lower break-even, by profit."""
+    order = np.lexsort((be_cups, -profit))
+    be = be_cups[order]
+    lowest_before = np.concatenate([[np.inf], np.minimum.accumulate(be)[:-1]])
+    return order[be < lowest_before][::-1]
+
+
+def optimize(inputs, objective='profit', elasticity=1.0, throughput=10.0, limits=RISK_LIMITS,
+             months=60, assumptions=None, max_frontier=40, loans=()):
+    """Best plan for `objective` and the profit / break-even frontier.
+
+    `inputs` maps model.INPUTS to the current plan, whose price and cups/day
+    anchor the demand curve. `loans` are financing.amortize() arguments, as
+    for financing.debt_service(); 'net_profit' is the profit after their
+    regular payments. Returns {'best': plan or None, 'closest': plan,
+    'frontier': [plans], 'evaluated': candidates, 'feasible': feasible
+    candidates}; a plan is a dict of price, staff, hrs, cups and the model
+    metrics. When no plan meets every limit, 'closest' is the one that
+    misses them by the fewest percentage points.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"objective must be one of {OBJECTIVES}")
+    assumptions = assumptions or {}
+    debt = financing.summary(loans, months)
+
+    def evaluate(price, staff, hrs):
+        p, s, h = (a.ravel() for a in np.meshgrid(price, staff, hrs, indexing='ij'))
+        cand = plans(inputs, p, s, h, elasticity, throughput)
+        res, ok, score = _score(cand, objective, limits, months, assumptions, debt)
+        return {'price': p, 'staff': s, 'hrs': h, 'cups': cand['cups'], **res}, ok, score
+
+    axes = {name: _grid(lo, hi, step) for name, (lo, hi, step, _) in SEARCH.items()}
+    pool, ok, score = evaluate(axes['price'], axes['staff'], axes['hrs'])
+    evaluated = len(score)
+
+    best = int(np.argmax(np.where(ok, score, -np.inf))) if ok.any() else None
+    # Local refinement: finer price steps and neighbouring staff/hours around
+    # the incumbent until it stops improving
+    for _ in range(4):
+        if best is None:
+            break
+        near = {}
+        for name, (lo, hi, coarse, fine) in SEARCH.items():
+            centre = pool[name][best]
+            near[name] = _grid(max(lo, centre - coarse), min(hi, centre + coarse), fine)
+        more, more_ok, more_score = evaluate(near['price'], near['staff'], near['hrs'])
+        evaluated += len(more_score)
+        pool = {k: np.concatenate([pool[k], more[k]]) for k in pool}
+        ok, score = np.concatenate([ok, more_ok]), np.concatenate([score, more_score])
+        new_best = int(np.argmax(np.where(ok, score, -np.inf)))
+        if score[new_best] <= score[best]:
+            break
+        best = new_best
+
+    feasible = np.flatnonzero(ok & np.isfinite(pool['be_cups_day']))
+    front = feasible[frontier(pool['net_profit'][feasible], pool['be_cups_day'][feasible])]
+    if len(front) > max_frontier:
+        front = front[np.linspace(0, len(front) - 1, max_frontier).round().astype(int)]
+    if best is None:
+        miss = sum(np.maximum(pool[name] - limit, 0) for name, limit in limits.items())
+        closest = int(np.argmin(np.where(pool['cash'] + debt['debt'] >= 0, miss, np.inf)))
+    else:
+        closest = best
+
+    # Report runway (and payback, unless it was the objective) as the
+    # dashboard does, from the projection, for the few plans returned
+    idx = np.array([closest, *front])
+    chosen = plans(inputs, pool['price'][idx], pool['staff'][idx], pool['hrs'][idx], elasticity, throughput)
+    proj = financing.levered_project(chosen, months, debt, **assumptions)
+    pool['runway'] = pool['runway'].copy()
+    pool['runway'][idx] = proj['runway']
+    if objective == 'profit':
+        pool['payback'] = pool['payback'].copy()
+        pool['payback'][idx] = proj['payback']
+
+    def plan(i):
+        return {k: v[i].item() for k, v in pool.items()}
+
+    return {
+        'best': plan(best) if best is not None else None,
+        'closest': plan(closest),
+        'frontier': [plan(i) for i in front],
+        'evaluated': evaluated,
+        'feasible': int(ok.sum()),
+    }
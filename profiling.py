@@ -0,0 +1,129 @@
+"""
+Rerun timing instrumentation.
+
+A RerunTimer splits one script run into named sections (one per `# ====`
+banner in app.py) with optional nested spans for hot calls inside a
+section. Finished runs go into a process-wide RerunLog so an admin can see
+where the last N reruns of every session spent their time. A single rerun
+can also be captured under cProfile, or pyinstrument when installed, and
+downloaded for offline analysis.
+"""
+
+import io
+import marshal
+import pstats
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+class RerunTimer:
+    """Section and span timings of one script run, in seconds."""
+
+    __slots__ = ('started', 'sections', 'spans', '_section', '_mark')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.sections = {}     # section -> seconds, in run order
+        self.spans = {}        # 'section › span' -> seconds
+        self._section = None
+        self._mark = self.started
+
+    def section(self, name):
+        """Close the current section and start timing `name`."""
+        now = time.perf_counter()
+        if self._section is not None:
+            self.sections[self._section] = self.sections.get(self._section, 0.0) + now - self._mark
+        self._section, self._mark = name, now
+
+    @contextmanager
+    def span(self, name):
+        """Time a block inside the current section; repeated spans add up."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            key = f"{self._section} › {name}"
+            self.spans[key] = self.spans.get(key, 0.0) + time.perf_counter() - t0
+
+    def finish(self):
+        """Close the last section and return the run's record."""
+        self.section(None)
+        return {
+            'at': time.time(),
+            'total': self._mark - self.started,
+            # Copies: fragment reruns after the run has finished may still
+            # add spans to this timer, but not to the logged record
+            'sections': dict(self.sections),
+            'spans': dict(self.spans),
+        }
+
+
+class RerunLog:
+    """The last `maxlen` finished reruns across all sessions of the process."""
+
+    def __init__(self, maxlen=50):
+        self._runs = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def add(self, record):
+        with self._lock:
+            self._runs.append(record)
+
+    def runs(self):
+        with self._lock:
+            return list(self._runs)
+
+    def summary(self):
+        """Per-section mean, p95 and max over the logged runs, slowest first."""
+        runs = self.runs()
+        times = {}
+        for run in runs:
+            for name, t in {'TOTAL': run['total'], **run['sections'], **run['spans']}.items():
+                times.setdefault(name, []).append(t)
+        rows = []
+        for name, ts in times.items():
+            ts = sorted(ts)
+            rows.append({
+                'section': name, 'runs': len(ts),
+                'mean_ms': 1000 * sum(ts) / len(ts),
+                'p95_ms': 1000 * ts[min(len(ts) - 1, int(0.95 * len(ts)))],
+                'max_ms': 1000 * ts[-1],
+            })
+        return sorted(rows, key=lambda r: r['mean_ms'], reverse=True)
+
+
+class RerunProfiler:
+    """Profile one script run with pyinstrument if available, else cProfile."""
+
+    def __init__(self):
+        try:
+            from pyinstrument import Profiler
+            self._impl = Profiler()
+            self.kind = 'pyinstrument'
+        except ImportError:
+            import cProfile
+            self._impl = cProfile.Profile()
+            self.kind = 'cprofile'
+
+    def start(self):
+        if self.kind == 'pyinstrument':
+            self._impl.start()
+        else:
+            self._impl.enable()
+
+    def stop(self):
+        """Stop profiling and return (file_name, data, mime, text_summary)."""
+        if self.kind == 'pyinstrument':
+            self._impl.stop()
+            return ("rerun_profile.html", self._impl.output_html().encode(), "text/html",
+                    self._impl.output_text(unicode=True))
+        self._impl.disable()
+        stats = pstats.Stats(self._impl)
+        text = io.StringIO()
+        stats.stream = text
+        stats.sort_stats('cumulative').print_stats(25)
+        # Same format as Stats.dump_stats, readable by pstats/snakeviz
+        return ("rerun_profile.prof", marshal.dumps(stats.stats), "application/octet-stream",
+                text.getvalue())
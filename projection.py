@@ -0,0 +1,132 @@
+"""
+Month-by-month cash-flow projection.
+
+Turns the steady-state model into a time series: an opening ramp-up on
+cups/day, seasonality, annual rent escalation and wage growth, and
+continuous COGS inflation. Months are a trailing axis, so one call projects
+any number of scenarios at once.
+"""
+
+import numpy as np
+
+import model
+
+# Cups/day multipliers, January..December (mean 1.0)
+SEASONALITY = (1.04, 0.97, 1.00, 0.99, 0.98, 0.94, 0.92, 0.93, 1.00, 1.03, 1.06, 1.14)
+
+# Months of trailing cash flow crossing_time() extrapolates past the horizon
+TREND_MONTHS = 12
+
+
+def crossing_time(balance):
+    """Months until `balance` first drops below zero, interpolated within the month.
+
+    `balance[..., 0]` is the opening balance (month 0). Returns 0 where the
+    opening balance is already negative. Where it stays above zero for the
+    whole series but is still falling, the crossing is extrapolated past the
+    end at the average change over the last 12 months (one seasonal cycle);
+    `inf` only where that change is not negative.
+    """
+    broke = balance < 0
+    crosses = broke.any(axis=-1)
+    first = np.argmax(broke, axis=-1)
+    n = balance.shape[-1] - 1
+    window = min(TREND_MONTHS, n)
+    if window > 0:
+        trend = (balance[..., -1] - balance[..., -1 - window]) / window
+        with np.errstate(invalid='ignore', divide='ignore'):
+            beyond = np.where(trend < 0, n + balance[..., -1] / np.where(trend < 0, -trend, 1), np.inf)
+    else:
+        beyond = np.full(balance.shape[:-1], np.inf)
+    out = np.where(crosses, first.astype(float), beyond)
+    later = crosses & (first > 0)
+    t = np.where(later, first, 1)
+    before = np.take_along_axis(balance, (t - 1)[..., np.newaxis], axis=-1)[..., 0]
+    after = np.take_along_axis(balance, t[..., np.newaxis], axis=-1)[..., 0]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(later, (t - 1) + before / (before - after), out)
+
+
+def monthly_factors(months, ramp_months=6, ramp_start=0.6, seasonality=SEASONALITY, start_month=1,
+                    rent_escalation=0.03, wage_growth=0.03, cogs_inflation=0.025):
+    """Per-month multipliers for cups, rent/NNN, wage and bean/milk/food prices.
+
+    Month 1 opens in calendar month `start_month`. Rent and wages step up on
+    each anniversary; COGS inflation compounds monthly.
+    """
+    t = np.arange(1, months + 1)
+    year = (t - 1) // 12
+    if ramp_months > 0:
+        ramp = ramp_start + (1 - ramp_start) * np.minimum(1.0, (t - 1) / ramp_months)
+    else:
+        ramp = np.ones(months)
+    season = np.asarray(seasonality if seasonality is not None else (1.0,) * 12, dtype=float)
+    season = season[(t - 1 + start_month - 1) % 12]
+    return {
+        'cups': ramp * season,
+        'rent': (1 + rent_escalation) ** year,
+        'wage': (1 + wage_growth) ** year,
+        'cogs': (1 + cogs_inflation) ** ((t - 1) / 12),
+    }
+
+
+def project(inputs, months=60, base=None, **assumptions):
+    """Project monthly P&L and cash for one or many scenarios.
+
+    `inputs` maps model.INPUTS to scalars or arrays of shape S; results have
+    shape S + (months,) for monthly series and S for runway/payback.
+    `base` is model.evaluate(**inputs) if the caller already has it.
+    `assumptions` are passed to monthly_factors().
+    """
+    f = monthly_factors(months, **assumptions)
+    if base is None:
+        base = model.evaluate(**inputs)
+
+    def col(x):
+        return np.asarray(x)[..., np.newaxis]
+
+    # Every escalated term enters the model linearly, so the monthly P&L is
+    # assembled from one steady-state evaluation scaled by the month factors
+    # instead of re-running the model on a (scenarios, months) grid.
+    cups_t = col(base['mo_cups']) * f['cups']
+    unit_t = col(base['bean_c'] + base['milk_c'] + inputs['food']) * f['cogs'] + col(inputs['pkg'])
+    rev = cups_t * col(inputs['price'])
+    exp = (cups_t * unit_t + col(base['labor']) * f['wage']
+           + col(base['rent_t']) * f['rent'] + col(inputs['util']))
+    profit = rev - exp
+
+    cash0 = np.asarray(base['cash'])
+    cum = np.cumsum(profit, axis=-1)
+    balance = np.concatenate([cash0[..., np.newaxis], cash0[..., np.newaxis] + cum], axis=-1)
+    # Payback: months until cumulative profit recovers the CapEx
+    capex = np.broadcast_to(np.asarray(inputs['reno']) + np.asarray(inputs['equip']), cash0.shape)[..., np.newaxis]
+    unrecovered = np.concatenate([capex, capex - cum], axis=-1)
+
+    return {
+        'months': np.arange(months + 1),
+        'rev': rev, 'exp': exp, 'profit': profit,
+        'balance': balance,
+        'runway': crossing_time(balance),
+        'payback': crossing_time(unrecovered),
+    }
+
+
+# What project() reads: model inputs and the steady-state metrics it scales
+PROJECT_INPUTS = ('food', 'pkg', 'price', 'util', 'reno', 'equip')
+PROJECT_BASE = ('mo_cups', 'bean_c', 'milk_c', 'labor', 'rent_t', 'cash')
+
+
+def _project_node(*values):
+    n = len(PROJECT_INPUTS)
+    inputs = dict(zip(PROJECT_INPUTS, values[:n]))
+    base = dict(zip(PROJECT_BASE, values[n:n + len(PROJECT_BASE)]))
+    months, assumptions = values[-2:]
+    return project(inputs, months, base=base, **assumptions)
+
+
+# Graph node over the model's metric nodes plus 'proj_months' and a dict of
+# monthly_factors() keyword arguments ('proj_assumptions'); it reuses the
+# model values already computed instead of evaluating the model again
+NODES = {
+    'proj': ((*PROJECT_INPUTS, *PROJECT_BASE, 'proj_months', 'proj_assumptions'), _project_node),
+}
@@ -0,0 +1,432 @@
+"""
+Business plan PDF report.
+
+Lays out the two-page plan from a flat record of scenario figures. Kept free
+of Streamlit so it can be rendered from worker threads and batch jobs.
+fpdf is imported on the first render, not with this module, so the
+dashboard and the breakdown tables don't pay for it at startup.
+"""
+
+import functools
+
+import numpy as np
+
+# ============================================================================
+# DATA BREAKDOWNS (FOR PDF EXPORT)
+# ============================================================================
+RENOVATION_BREAKDOWN = [
+    ("Design & Permits (Architect/MEP/Fire)", 22000),
+    ("Demolition & Site Prep", 10000),
+    ("Plumbing (Floor Drains/Grease Trap)", 45000),
+    ("Electrical (Panel/Circuits/LED)", 35000),
+    ("Flooring, Walls & Ceiling", 30000),
+    ("Millwork & Custom Bar Build", 28000),
+]
+
+EQUIPMENT_BREAKDOWN = [
+    ("Espresso Machine (2-3 Group)", 24000),
+    ("Grinders (2 Espresso + 1 Bulk)", 8000),
+    ("Water Filtration + Ice Machine", 9000),
+    ("Refrigeration (Under-counter/Walk-in)", 15000),
+    ("Oven, Blender & Prep Equipment", 12000),
+    ("Commercial Dishwasher", 8000),
+    ("POS System & Technology", 10000),
+]
+
+# ============================================================================
+# REPORT DATA
+# ============================================================================
+class ReportData:
+    """Scenario figures for create_pdf, one slot per field.
+
+    Read like a dict (`data['revenue']`) but without a per-instance dict,
+    since every session holds one for its export button.
+    """
+
+    __slots__ = (
+        'revenue', 'expenses', 'profit', 'margin', 'runway', 'payback',
+        'total_capital', 'renovation', 'equipment', 'remaining_cash',
+        'sqft', 'base_rent', 'nnn', 'utilities', 'monthly_rent',
+        'employees', 'hours_per_day', 'hourly_wage', 'labor_burden', 'monthly_labor',
+        'milk_price', 'bean_price', 'packaging', 'beans_per_cup', 'milk_per_cup', 'food_per_cup',
+        'bean_waste', 'milk_waste',
+        'unit_cost', 'monthly_cogs',
+        'avg_price', 'cups_per_day', 'operating_days', 'monthly_cups',
+        'rent_r', 'labor_r', 'cogs_r',
+        'fixed_costs', 'be_cups_month', 'be_cups_day',
+        'financing',
+    )
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields[name])
+
+    def __getitem__(self, name):
+        return getattr(self, name)
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+# Lender offers listed in the report
+REPORT_OFFERS = 10
+
+
+def _months(x):
+    return float(x) if x < 1000 else 9999
+
+
+def financing_data(fin):
+    """Plain-number financing summary: the loans, coverage, and the cheapest offers meeting the lender's DSCR."""
+    if fin is None:
+        return None
+    offers = []
+    if fin['offers'] is not None:
+        o = fin['offers']
+        ok = np.flatnonzero(o['dscr'] >= fin['threshold'])
+        best = ok[np.argsort(o['total_interest'][ok], kind='stable')][:REPORT_OFFERS]
+        offers = [[float(o['rate'][i]) * 100, int(o['term'][i]), int(o['io'][i]), float(o['payment'][i]),
+                   float(o['total_interest'][i]), float(o['dscr'][i])] for i in best]
+    return {
+        'lender': fin['lender'], 'threshold': fin['threshold'],
+        'loans': [[label, float(p), float(r), int(t), int(io)] for label, p, r, t, io in fin['loans']],
+        'debt': float(fin['debt']), 'debt_service': fin['debt_service'], 'profit_after_debt': fin['profit_after_debt'],
+        'total_interest': fin['total_interest'], 'dscr': min(fin['dscr'], 999), 'dscr_min': min(fin['dscr_min'], 999),
+        'unlevered_runway': _months(fin['unlevered_runway']), 'unlevered_payback': _months(fin['unlevered_payback']),
+        'offers': offers, 'offers_priced': 0 if fin['offers'] is None else len(fin['offers']['rate']),
+        'offers_ok': 0 if fin['offers'] is None else int((fin['offers']['dscr'] >= fin['threshold']).sum()),
+    }
+
+
+def report_data(inputs, m, financing=None):
+    """Collect model inputs and scalar metrics into the record create_pdf expects.
+
+    `financing` is the app's debt summary (loans, DSCR, lender offers), or
+    None for an all-equity plan.
+    """
+    return ReportData(**{
+        # Executive Summary
+        'revenue': m['rev'], 'expenses': m['exp'], 'profit': m['profit'], 'margin': m['margin'],
+        'runway': m['runway'] if m['runway'] < 1000 else 9999, 'payback': m['payback'] if m['payback'] < 1000 else 9999,
+        
+        # Capital & Investment
+        'total_capital': inputs['cap'], 'renovation': inputs['reno'], 'equipment': inputs['equip'],
+        'remaining_cash': m['cash'],
+        
+        # Location
+        'sqft': inputs['sqft'], 'base_rent': inputs['rent'], 'nnn': inputs['nnn'], 'utilities': inputs['util'],
+        'monthly_rent': m['rent_t'],
+        
+        # Staffing
+        'employees': inputs['staff'], 'hours_per_day': inputs['hrs'], 'hourly_wage': inputs['wage'],
+        'labor_burden': inputs['burden'] * 100, 'monthly_labor': m['labor'],
+        
+        # COGS
+        'milk_price': inputs['milk_p'], 'bean_price': inputs['bean'], 'packaging': inputs['pkg'],
+        'beans_per_cup': inputs['bean_g'], 'milk_per_cup': inputs['milk_oz'], 'food_per_cup': inputs['food'],
+        'bean_waste': (inputs['bean_waste'] - 1) * 100, 'milk_waste': (inputs['milk_waste'] - 1) * 100,
+        'unit_cost': m['unit'], 'monthly_cogs': m['cogs'],
+        
+        # Sales
+        'avg_price': inputs['price'], 'cups_per_day': inputs['cups'], 'operating_days': inputs['days'],
+        'monthly_cups': m['mo_cups'],
+        
+        # Risk Ratios
+        'rent_r': m['rent_r'], 'labor_r': m['labor_r'], 'cogs_r': m['cogs_r'],
+        
+        # Break-even (NaN where price does not exceed unit cost); with debt,
+        # fixed costs include the monthly debt service
+        'fixed_costs': m['fixed'], 'be_cups_month': m['be_cups_month'], 'be_cups_day': m['be_cups_day'],
+        
+        # Debt financing (None without loans)
+        'financing': financing_data(financing)
+    })
+
+# ============================================================================
+# PDF GENERATION (INCLUDES FULL BREAKDOWNS)
+# ============================================================================
+@functools.lru_cache(maxsize=None)
+def _pdf_class():
+    """BusinessPlanPDF, defined on first use so fpdf loads lazily."""
+    from fpdf import FPDF
+    
+    class BusinessPlanPDF(FPDF):
+        def header(self):
+            # Header with colored background
+            self.set_fill_color(26, 60, 64)
+            self.rect(0, 0, 210, 25, 'F')
+            self.set_font('Helvetica', 'B', 18)
+            self.set_text_color(255, 255, 255)
+            self.set_y(8)
+            self.cell(0, 10, 'Coffee Shop Business Plan 2026', ln=True, align='C')
+            self.ln(15)
+    
+        def footer(self):
+            self.set_y(-15)
+            self.set_font('Helvetica', 'I', 8)
+            self.set_text_color(128, 128, 128)
+            self.cell(0, 10, f'Page {self.page_no()} | Coffee Shop Survival Simulator - Commercial Edition | Q1/2026 Data', align='C')
+    
+        def section_title(self, title):
+            self.set_font('Helvetica', 'B', 12)
+            self.set_text_color(26, 60, 64)
+            self.set_fill_color(249, 249, 247)
+            self.cell(0, 8, f'  {title}', ln=True, fill=True)
+            self.ln(2)
+    
+        def key_metric(self, label, value, status=""):
+            self.set_font('Helvetica', '', 10)
+            self.set_text_color(108, 117, 125)
+            self.cell(60, 6, label, ln=False)
+            self.set_font('Helvetica', 'B', 10)
+            self.set_text_color(26, 60, 64)
+            self.cell(50, 6, str(value), ln=False)
+            if status:
+                if "OK" in status or "Healthy" in status:
+                    self.set_text_color(45, 106, 79)
+                elif "DANGER" in status or "High" in status:
+                    self.set_text_color(201, 123, 99)
+                else:
+                    self.set_text_color(212, 168, 85)
+                self.set_font('Helvetica', 'I', 9)
+                self.cell(0, 6, status, ln=True)
+            else:
+                self.ln()
+    
+    return BusinessPlanPDF
+
+def create_pdf(data, progress=None):
+    """Render the business plan; `progress(fraction, stage)` is called as pages are laid out."""
+    step = progress or (lambda fraction, stage: None)
+    step(0.0, "Executive summary")
+    pdf = _pdf_class()()
+    pdf.add_page()
+    pdf.set_auto_page_break(auto=True, margin=15)
+    
+    # ==================== PAGE 1: EXECUTIVE SUMMARY ====================
+    pdf.section_title("EXECUTIVE SUMMARY")
+    
+    runway_text = "Infinite" if data['runway'] > 999 else f"{data['runway']:.1f} months"
+    payback_text = "N/A" if data['payback'] > 999 else f"{data['payback']:.1f} months"
+    profit_status = "Profitable" if data['profit'] >= 0 else "Loss"
+    
+    pdf.key_metric("Monthly Revenue:", f"${data['revenue']:,.0f}")
+    pdf.key_metric("Monthly Expenses:", f"${data['expenses']:,.0f}")
+    pdf.key_metric("Net Profit/Loss:", f"${data['profit']:,.0f}", f"({data['margin']:.1f}% margin) - {profit_status}")
+    pdf.key_metric("Cash Runway:", runway_text)
+    pdf.key_metric("Payback Period:", payback_text)
+    pdf.ln(5)
+    
+    # ==================== INPUT PARAMETERS ====================
+    pdf.section_title("INPUT PARAMETERS - CAPITAL & INVESTMENT")
+    pdf.key_metric("Total Capital:", f"${data['total_capital']:,.0f}")
+    pdf.key_metric("Renovation Budget:", f"${data['renovation']:,.0f}")
+    pdf.key_metric("Equipment Budget:", f"${data['equipment']:,.0f}")
+    if data['financing'] is None:
+        pdf.key_metric("Operating Cash:", f"${data['remaining_cash']:,.0f}", 
+                       "OK" if data['remaining_cash'] >= 0 else "SHORTFALL!")
+    else:
+        financed = data['remaining_cash'] + data['financing']['debt']
+        pdf.key_metric("Cash Before Financing:", f"${data['remaining_cash']:,.0f}")
+        pdf.key_metric("Operating Cash (financed):", f"${financed:,.0f}", "OK" if financed >= 0 else "SHORTFALL!")
+    pdf.ln(3)
+    
+    pdf.section_title("INPUT PARAMETERS - LOCATION & REAL ESTATE")
+    pdf.key_metric("Shop Size:", f"{data['sqft']:,} sqft")
+    pdf.key_metric("Base Rent:", f"${data['base_rent']:.2f}/sqft/year")
+    pdf.key_metric("NNN Charges:", f"${data['nnn']:.2f}/sqft/year")
+    pdf.key_metric("Monthly Rent Total:", f"${data['monthly_rent']:,.0f}")
+    pdf.key_metric("Utilities:", f"${data['utilities']:,.0f}/month")
+    pdf.ln(3)
+    
+    pdf.section_title("INPUT PARAMETERS - STAFFING")
+    pdf.key_metric("Number of Employees:", f"{data['employees']}")
+    pdf.key_metric("Hours/Employee/Day:", f"{data['hours_per_day']:.1f}")
+    pdf.key_metric("Hourly Wage:", f"${data['hourly_wage']:.2f}")
+    pdf.key_metric("Labor Burden:", f"{data['labor_burden']:.0f}%")
+    pdf.key_metric("Monthly Labor Cost:", f"${data['monthly_labor']:,.0f}")
+    pdf.ln(3)
+    
+    pdf.section_title("INPUT PARAMETERS - COST OF GOODS SOLD")
+    pdf.key_metric("Milk Price (menu blend):", f"${data['milk_price']:.2f}/gallon")
+    pdf.key_metric("Coffee Beans:", f"${data['bean_price']:.2f}/lb")
+    pdf.key_metric("Packaging:", f"${data['packaging']:.2f}/cup")
+    pdf.key_metric("Menu Average per Cup:",
+                   f"{data['beans_per_cup']:.1f} g beans, {data['milk_per_cup']:.1f} oz milk, "
+                   f"${data['food_per_cup']:.2f} food")
+    pdf.key_metric("Waste Allowance:", f"beans +{data['bean_waste']:.1f}%, milk +{data['milk_waste']:.1f}%")
+    pdf.key_metric("Unit Cost per Cup:", f"${data['unit_cost']:.2f}")
+    pdf.key_metric("Monthly COGS:", f"${data['monthly_cogs']:,.0f}")
+    pdf.ln(3)
+    
+    pdf.section_title("INPUT PARAMETERS - SALES PROJECTIONS")
+    pdf.key_metric("Average Price/Cup:", f"${data['avg_price']:.2f}")
+    pdf.key_metric("Cups Sold/Day:", f"{data['cups_per_day']}")
+    pdf.key_metric("Operating Days/Month:", f"{data['operating_days']}")
+    pdf.key_metric("Monthly Cups Sold:", f"{data['monthly_cups']:,}")
+    pdf.ln(5)
+    
+    # ==================== PAGE 2: CAPEX BREAKDOWN ====================
+    step(0.4, "CapEx breakdown")
+    pdf.add_page()
+    
+    pdf.section_title(f"RENOVATION INVESTMENT: ${data['renovation']:,.0f}")
+    pdf.set_font('Helvetica', '', 10)
+    pdf.set_text_color(60, 60, 60)
+    for item, cost in RENOVATION_BREAKDOWN:
+        pdf.cell(120, 6, f"  - {item}", ln=False)
+        pdf.cell(0, 6, f"${cost:,.0f}", ln=True)
+    total_reno = sum(c for _, c in RENOVATION_BREAKDOWN)
+    pdf.set_font('Helvetica', 'I', 9)
+    pdf.set_text_color(108, 117, 125)
+    pdf.cell(0, 6, f"  Standard total: ${total_reno:,.0f} | Your budget: ${data['renovation']:,.0f}", ln=True)
+    pdf.ln(5)
+    
+    pdf.section_title(f"EQUIPMENT INVESTMENT: ${data['equipment']:,.0f}")
+    pdf.set_font('Helvetica', '', 10)
+    pdf.set_text_color(60, 60, 60)
+    for item, cost in EQUIPMENT_BREAKDOWN:
+        pdf.cell(120, 6, f"  - {item}", ln=False)
+        pdf.cell(0, 6, f"${cost:,.0f}", ln=True)
+    total_equip = sum(c for _, c in EQUIPMENT_BREAKDOWN)
+    pdf.set_font('Helvetica', 'I', 9)
+    pdf.set_text_color(108, 117, 125)
+    pdf.cell(0, 6, f"  Standard total: ${total_equip:,.0f} | Your budget: ${data['equipment']:,.0f}", ln=True)
+    pdf.ln(8)
+    
+    # ==================== RISK ANALYSIS ====================
+    step(0.6, "Risk analysis")
+    pdf.section_title("RISK ANALYSIS")
+    
+    rent_status = "[DANGER: >15%]" if data['rent_r'] > 15 else "[WARNING: >10%]" if data['rent_r'] >= 10 else "[OK: Healthy]"
+    labor_status = "[DANGER: >35%]" if data['labor_r'] > 35 else "[OK: Controlled]"
+    cogs_status = "[WARNING: >30%]" if data['cogs_r'] > 30 else "[OK: Good]"
+    
+    pdf.key_metric("Rent Ratio:", f"{data['rent_r']:.1f}% of Revenue", rent_status)
+    pdf.key_metric("Labor Ratio:", f"{data['labor_r']:.1f}% of Revenue", labor_status)
+    pdf.key_metric("COGS Ratio:", f"{data['cogs_r']:.1f}% of Revenue", cogs_status)
+    pdf.ln(8)
+    
+    # ==================== BREAK-EVEN ANALYSIS ====================
+    step(0.7, "Break-even analysis")
+    pdf.section_title("BREAK-EVEN ANALYSIS")
+    
+    # Break-even comes from the same model evaluation as the dashboard
+    if data['avg_price'] > data['unit_cost']:
+        fixed_costs, be_cups_monthly, be_cups_daily = data['fixed_costs'], data['be_cups_month'], data['be_cups_day']
+        cups_surplus = data['cups_per_day'] - be_cups_daily
+        
+        pdf.key_metric("Fixed Costs + Debt Service/Month:" if data['financing'] is not None else "Fixed Costs/Month:",
+                       f"${fixed_costs:,.0f}")
+        pdf.key_metric("Contribution Margin/Cup:", f"${data['avg_price'] - data['unit_cost']:.2f}")
+        pdf.key_metric("Break-even Point:", f"{be_cups_daily:.0f} cups/day ({be_cups_monthly:,.0f}/month)")
+        pdf.key_metric("Your Projection:", f"{data['cups_per_day']} cups/day", 
+                       f"+{cups_surplus:.0f} above BE" if cups_surplus > 0 else f"{cups_surplus:.0f} below BE!")
+        
+        if data['payback'] < 1000:
+            payback_mo = data['payback']
+            pdf.key_metric("Payback Period:", f"{payback_mo:.1f} months ({payback_mo/12:.1f} years)")
+    else:
+        pdf.key_metric("Status:", "INVALID - Price below unit cost!", "[CRITICAL]")
+    pdf.ln(8)
+    
+    # ==================== FINANCIAL SUMMARY TABLE ====================
+    step(0.85, "Profit & loss statement")
+    pdf.section_title("MONTHLY PROFIT & LOSS STATEMENT")
+    
+    pdf.set_font('Helvetica', '', 10)
+    pdf.set_text_color(26, 60, 64)
+    
+    # Revenue
+    pdf.cell(100, 6, "  REVENUE", ln=False)
+    pdf.cell(0, 6, f"${data['revenue']:,.0f}", ln=True, align='R')
+    
+    # Expenses
+    pdf.set_text_color(80, 80, 80)
+    pdf.cell(100, 6, "    (-) Cost of Goods Sold", ln=False)
+    pdf.cell(0, 6, f"${data['monthly_cogs']:,.0f}", ln=True, align='R')
+    
+    pdf.cell(100, 6, "    (-) Labor", ln=False)
+    pdf.cell(0, 6, f"${data['monthly_labor']:,.0f}", ln=True, align='R')
+    
+    pdf.cell(100, 6, "    (-) Rent", ln=False)
+    pdf.cell(0, 6, f"${data['monthly_rent']:,.0f}", ln=True, align='R')
+    
+    pdf.cell(100, 6, "    (-) Utilities", ln=False)
+    pdf.cell(0, 6, f"${data['utilities']:,.0f}", ln=True, align='R')
+    
+    # Total Expenses
+    pdf.set_font('Helvetica', 'B', 10)
+    pdf.set_text_color(26, 60, 64)
+    pdf.cell(100, 6, "  TOTAL EXPENSES", ln=False)
+    pdf.cell(0, 6, f"${data['expenses']:,.0f}", ln=True, align='R')
+    
+    # Profit line
+    pdf.ln(2)
+    pdf.set_draw_color(26, 60, 64)
+    pdf.line(10, pdf.get_y(), 200, pdf.get_y())
+    pdf.ln(2)
+    
+    profit_color = (45, 106, 79) if data['profit'] >= 0 else (201, 123, 99)
+    pdf.set_text_color(*profit_color)
+    pdf.set_font('Helvetica', 'B', 12)
+    pdf.cell(100, 8, "  NET PROFIT/LOSS", ln=False)
+    pdf.cell(0, 8, f"${data['profit']:,.0f}", ln=True, align='R')
+    
+    pdf.set_font('Helvetica', 'I', 10)
+    pdf.cell(100, 6, "  Net Margin", ln=False)
+    pdf.cell(0, 6, f"{data['margin']:.1f}%", ln=True, align='R')
+    
+    # ==================== FINANCING ====================
+    fin = data['financing']
+    if fin is not None:
+        step(0.9, "Financing")
+        pdf.add_page()
+        pdf.section_title(f"DEBT FINANCING: ${fin['debt']:,.0f}")
+        for label, principal, rate, term, io in fin['loans']:
+            detail = f"{rate:.2f}%, {term} months" + (f", {io} months interest-only" if io else "")
+            pdf.key_metric(f"{label}:", f"${principal:,.0f}", detail)
+        pdf.key_metric("Monthly Debt Service:", f"${fin['debt_service']:,.0f}",
+                       f"${fin['total_interest']:,.0f} total interest")
+        pdf.key_metric("Profit After Debt Service:", f"${fin['profit_after_debt']:,.0f}/month")
+        dscr_ok = fin['dscr'] >= fin['threshold']
+        pdf.key_metric("DSCR:", f"{fin['dscr']:.2f}x (lowest year {fin['dscr_min']:.2f}x)",
+                       f"[OK: {fin['lender']} >= {fin['threshold']:.2f}]" if dscr_ok
+                       else f"[DANGER: {fin['lender']} needs {fin['threshold']:.2f}]")
+        unlev_runway = "Infinite" if fin['unlevered_runway'] > 999 else f"{fin['unlevered_runway']:.1f} months"
+        unlev_payback = "N/A" if fin['unlevered_payback'] > 999 else f"{fin['unlevered_payback']:.1f} months"
+        pdf.key_metric("Runway Without Debt:", unlev_runway)
+        pdf.key_metric("Payback Without Debt:", unlev_payback)
+        pdf.ln(3)
+        
+        if fin['offers_priced']:
+            pdf.section_title(f"LENDER COMPARISON - CHEAPEST OFFERS MEETING {fin['lender']} DSCR")
+            widths = (25, 25, 30, 35, 40, 25)
+            pdf.set_font('Helvetica', 'B', 9)
+            pdf.set_text_color(26, 60, 64)
+            for w, head in zip(widths, ("Rate", "Term", "Interest-Only", "Payment/mo", "Total Interest", "DSCR")):
+                pdf.cell(w, 6, head, align='R')
+            pdf.ln()
+            pdf.set_font('Helvetica', '', 9)
+            pdf.set_text_color(60, 60, 60)
+            for rate, term, io, payment, interest, cover in fin['offers']:
+                row = (f"{rate:.3f}%", f"{term} mo", f"{io} mo", f"${payment:,.0f}", f"${interest:,.0f}", f"{cover:.2f}x")
+                for w, text in zip(widths, row):
+                    pdf.cell(w, 6, text, align='R')
+                pdf.ln()
+            pdf.set_font('Helvetica', 'I', 9)
+            pdf.set_text_color(108, 117, 125)
+            pdf.cell(0, 6, f"  {fin['offers_ok']:,} of {fin['offers_priced']:,} rate x term x interest-only offers "
+                           f"meet the threshold, by total interest.", ln=True)
+    
+    # ==================== FOOTER NOTE ====================
+    pdf.ln(15)
+    pdf.set_font('Helvetica', 'I', 9)
+    pdf.set_text_color(128, 128, 128)
+    pdf.cell(0, 5, 'This report was generated by Coffee Shop Survival Simulator 2026.', ln=True)
+    pdf.cell(0, 5, 'All default values are based on Q1/2026 US Coffee Market Research.', ln=True)
+    pdf.cell(0, 5, 'For investment purposes only. Consult a financial advisor before making decisions.', ln=True)
+    
+    out = pdf.output()
+    step(1.0, "Done")
+    return out
@@ -0,0 +1,186 @@
+"""
+Hourly demand and barista shift scheduling.
+
+The model's labor line is flat: `staff` people each working `hrs` hours,
+every day. Here cups/day is spread over a 7 × 24 week (day-of-week ×
+hour-of-day) and staffing is planned against it. Each open hour needs
+enough baristas that none serves more than `rate` cups in the hour, and
+never fewer than `min_staff`. The schedule is built level by level: level
+k covers the hours that need at least k baristas. At every level, each
+day's need is tested against every candidate shift pattern (one shift, or
+two shifts that do not overlap) in one broadcast, and the pattern with the
+fewest hours is chosen.
+
+    d = demand(cups=120)                     # (7, 24) cups per hour
+    plan = optimize(d, rate=25, min_staff=1)
+    plan['staff']                            # (7, 24) baristas on duty
+"""
+
+import numpy as np
+
+DAYS = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
+
+# Share of a day's cups by hour of day (hours outside opening get none):
+# breakfast rush, a lunch bump and an afternoon tail
+HOURLY = (
+    0.00, 0.00, 0.00, 0.00, 0.00, 0.01, 0.05, 0.12, 0.14, 0.11, 0.08, 0.08,
+    0.09, 0.08, 0.07, 0.06, 0.05, 0.03, 0.02, 0.01, 0.00, 0.00, 0.00, 0.00,
+)
+
+# Day-of-week cups multipliers, Monday..Sunday (mean 1.0)
+WEEKLY = (0.95, 0.93, 0.95, 0.98, 1.05, 1.12, 1.02)
+
+# Shift lengths (hours) a barista can be scheduled for
+SHIFT_LENGTHS = (4, 5, 6, 7, 8)
+
+
+def open_hours(open_hour=6, close_hour=19):
+    """(24,) mask of the hours the shop is open, [open_hour, close_hour)."""
+    h = np.arange(24)
+    return (h >= open_hour) & (h < close_hour)
+
+
+def demand(cups, open_hour=6, close_hour=19, hourly=HOURLY, weekly=WEEKLY):
+    """Cups per hour over the week, shape cups.shape + (7, 24).
+
+    The hourly shape is renormalized over the open hours, so every day
+    sells `cups` × that day's multiplier, and the week averages `cups`/day.
+    Raises ValueError if no hour of the day is open.
+    """
+    is_open = open_hours(open_hour, close_hour)
+    if not is_open.any():
+        raise ValueError(f"no opening hours between {open_hour}:00 and {close_hour}:00")
+    shape = np.asarray(hourly, dtype=float) * is_open
+    if shape.sum() <= 0:
+        shape = is_open.astype(float)
+    shape /= shape.sum()
+    week = np.asarray(weekly, dtype=float)
+    week = week / week.mean()
+    return np.asarray(cups, dtype=float)[..., np.newaxis, np.newaxis] * week[:, np.newaxis] * shape
+
+
+def required(hourly_demand, rate=25.0, min_staff=1, open_hour=6, close_hour=19):
+    """Baristas needed per hour: enough to keep each under `rate` cups/hour, at least `min_staff`."""
+    need = np.maximum(np.ceil(hourly_demand / rate - 1e-9), min_staff)
+    return np.where(open_hours(open_hour, close_hour), need, 0).astype(int)
+
+
+def shifts(open_hour=6, close_hour=19, lengths=SHIFT_LENGTHS):
+    """Every shift inside opening hours: ((S, 2) start/length, (S, 24) mask)."""
+    spec = [(s, n) for n in lengths for s in range(open_hour, close_hour - n + 1)]
+    if not spec:
+        # Opening shorter than the shortest shift: one shift over the day
+        spec = [(open_hour, close_hour - open_hour)]
+    spec = np.array(spec)
+    h = np.arange(24)
+    mask = (h >= spec[:, :1]) & (h < spec[:, :1] + spec[:, 1:])
+    return spec, mask
+
+
+def patterns(mask):
+    """Candidate coverage per level: every single shift and every non-overlapping pair.
+
+    Returns ((P, 2) shift indices, -1 for none, (P, 24) coverage mask).
+    """
+    n = len(mask)
+    i, j = np.triu_indices(n, k=1)
+    apart = ~(mask[i] & mask[j]).any(axis=1)
+    i, j = i[apart], j[apart]
+    idx = np.concatenate([np.column_stack([np.arange(n), np.full(n, -1)]), np.column_stack([i, j])])
+    cover = np.concatenate([mask, mask[i] | mask[j]])
+    return idx, cover
+
+
+def _tile(need, spec):
+    """Fallback for a need no pattern covers: longest shifts from each uncovered hour.
+
+    A shift that would run past the last hour needed starts earlier instead.
+    """
+    longest = int(spec[:, 1].max())
+    hours = np.flatnonzero(need)
+    end = int(hours[-1]) + 1
+    out, covered = [], np.zeros(24, dtype=bool)
+    for h in hours:
+        if not covered[h]:
+            start = max(min(int(h), end - longest), 0)
+            out.append((start, longest))
+            covered[start:start + longest] = True
+    return out
+
+
+def optimize(hourly_demand, rate=25.0, min_staff=1, open_hour=6, close_hour=19, lengths=SHIFT_LENGTHS):
+    """Fewest-hours shift schedule meeting the service level, for a (7, 24) week.
+
+    Returns {'staff': (7, 24) baristas on duty, 'shifts': per day a list of
+    (start hour, length), 'hours': (7,) barista-hours per day,
+    'weekly_hours', 'required': (7, 24), 'evaluated': patterns tested}.
+    """
+    need = required(hourly_demand, rate, min_staff, open_hour, close_hour)
+    spec, mask = shifts(open_hour, close_hour, lengths)
+    idx, cover = patterns(mask)
+    hours = cover.sum(axis=1)
+
+    # (levels, 7, 24): level k needs someone wherever `need` >= k
+    levels = np.arange(1, need.max() + 1)
+    need_k = need >= levels[:, np.newaxis, np.newaxis]
+    # (levels, 7, P): does pattern p cover that level's hours on that day?
+    ok = ~(need_k[:, :, np.newaxis, :] & ~cover).any(axis=-1)
+    # Fewest hours, then fewest shifts
+    cost = np.where(ok, hours + (idx[:, 1] >= 0) * 0.5, np.inf)
+    best = cost.argmin(axis=-1)
+
+    day_shifts = [[] for _ in DAYS]
+    for k in range(len(levels)):
+        for d in range(len(DAYS)):
+            if not need_k[k, d].any():
+                continue
+            if np.isfinite(cost[k, d, best[k, d]]):
+                day_shifts[d] += [tuple(int(x) for x in spec[s]) for s in idx[best[k, d]] if s >= 0]
+            else:
+                day_shifts[d] += _tile(need_k[k, d], spec)
+
+    staff = np.zeros((len(DAYS), 24), dtype=int)
+    for d, day in enumerate(day_shifts):
+        for start, n in day:
+            staff[d, start:start + n] += 1
+    return {
+        'staff': staff,
+        'shifts': [sorted(day) for day in day_shifts],
+        'hours': staff.sum(axis=1),
+        'weekly_hours': int(staff.sum()),
+        'required': need,
+        'evaluated': int(ok.size),
+    }
+
+
+def flat(staff, hrs, open_hour=6, close_hour=19):
+    """The model's flat plan as a (7, 24) roster.
+
+    `staff` people work `hrs` each every day, with start times spread
+    evenly so the shifts together span the opening hours.
+    """
+    n = max(int(round(hrs)), 1)
+    last = max(close_hour - n, open_hour)
+    starts = np.round(np.linspace(open_hour, last, int(staff))).astype(int)
+    h = np.arange(24)
+    day = ((h >= starts[:, np.newaxis]) & (h < starts[:, np.newaxis] + n)).sum(axis=0)
+    return np.broadcast_to(day, (len(DAYS), 24)).copy()
+
+
+def coverage(hourly_demand, staff, rate=25.0):
+    """Hourly under- and over-staffing of a roster.
+
+    Returns {'under': cups over the service level per hour, 'over': idle
+    barista-hours per hour, 'served': share of cups within the service
+    level}, each under/over array shaped like `staff`.
+    """
+    capacity = staff * rate
+    under = np.maximum(hourly_demand - capacity, 0)
+    over = np.maximum(staff - hourly_demand / rate, 0)
+    total = hourly_demand.sum()
+    return {'under': under, 'over': over, 'served': 1 - under.sum() / total if total > 0 else 1.0}
+
+
+def monthly_labor(weekly_hours, days, wage, burden):
+    """Monthly labor cost of a weekly roster over `days` operating days (as the model's labor line)."""
+    return weekly_hours / 7 * days * wage * (1 + burden)
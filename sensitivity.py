@@ -0,0 +1,69 @@
+"""
+One-at-a-time sensitivity (tornado) analysis.
+
+Every input is nudged down and up by the same percentage; the base case and
+all 2 × len(inputs) perturbations go through the vectorized model as one
+batch. Runway and break-even are the dashboard's: runway from the monthly
+projection, and both after debt service when the plan has loans.
+"""
+
+import numpy as np
+
+import financing
+import model
+
+LABELS = {
+    'cap': 'Total Capital', 'reno': 'Renovation', 'equip': 'Equipment',
+    'milk_p': 'Milk Price', 'bean': 'Bean Price', 'pkg': 'Packaging',
+    'bean_g': 'Beans/Cup', 'milk_oz': 'Milk/Cup', 'food': 'Food Cost/Cup',
+    'bean_waste': 'Bean Waste', 'milk_waste': 'Milk Waste',
+    'wage': 'Hourly Wage', 'burden': 'Labor Burden',
+    'rent': 'Base Rent', 'nnn': 'NNN Charges', 'util': 'Utilities', 'sqft': 'Shop Size',
+    'staff': 'Employees', 'hrs': 'Hours/Employee', 'price': 'Price/Cup',
+    'cups': 'Cups/Day', 'days': 'Operating Days',
+}
+
+METRICS = ('profit', 'margin', 'runway', 'be_cups_day')
+
+
+def sensitivity(inputs, pct=10.0, names=model.INPUTS, metrics=METRICS, months=60, assumptions=None, loans=()):
+    """Perturb each of `names` by ±`pct`% around `inputs`.
+
+    Runway is projected over `months` with projection.project()
+    `assumptions`; `loans` (financing.amortize() arguments) lever runway and
+    add their regular payments to the fixed costs the break-even covers.
+
+    Returns {metric: {'base', 'low', 'high', 'swing', 'elasticity'}} where
+    low/high/swing/elasticity are arrays aligned with `names`. Elasticity is
+    the % change in metric per % change in input, taken against |base| so its
+    sign is the direction of the effect even when the base is a loss; it is
+    NaN where the metric is zero or infinite at the base or either end.
+    """
+    n = len(names)
+    step = pct / 100
+    cols = {k: np.full(2 * n + 1, float(v)) for k, v in inputs.items()}
+    for i, name in enumerate(names):
+        cols[name][1 + i] *= 1 - step
+        cols[name][1 + n + i] *= 1 + step
+
+    res = model.evaluate(**cols)
+    debt = financing.summary(loans, months)
+    if 'runway' in metrics:
+        res['runway'] = financing.levered_project(cols, months, debt, **(assumptions or {}))['runway']
+    if debt['debt_month']:
+        res['be_cups_day'] = financing.breakeven_cups(res, cols['price'], cols['days'], debt['debt_month'])
+
+    out = {}
+    for metric in metrics:
+        v = np.asarray(res[metric], dtype=float)
+        base, low, high = v[0], v[1:n + 1], v[n + 1:]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            elasticity = (high - low) / np.abs(base) / (2 * step)
+            swing = np.abs(high - low)
+        defined = np.isfinite(low) & np.isfinite(high) & np.isfinite(base) & (base != 0)
+        out[metric] = {
+            'base': base, 'low': low, 'high': high,
+            'swing': swing,
+            'elasticity': np.where(defined, elasticity, np.nan),
+        }
+    return out
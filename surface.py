@@ -0,0 +1,58 @@
+"""
+Price × volume surfaces.
+
+The whole grid is one broadcast of the vectorized model: prices along the
+columns, cups/day along the rows. The axes span the sidebar bounds, so a
+surface depends only on the other inputs and can be reused while price or
+cups/day change. Runway and the break-even contour are the dashboard's:
+runway from the monthly projection, and both after debt service when the
+plan has loans.
+"""
+
+import numpy as np
+
+import financing
+import model
+
+# Same bounds as the sidebar's price and cups/day inputs
+PRICE_RANGE = (3.0, 12.0)
+CUPS_RANGE = (20, 500)
+
+# Grid rows projected at a time, bounding the (rows, prices, months) arrays
+PROJECT_ROWS = 25
+
+
+def price_volume_grid(inputs, n_price=200, n_cups=200, months=60, assumptions=None, loans=()):
+    """Monthly profit and runway over a (n_cups, n_price) price × cups grid.
+
+    `inputs` maps model.INPUTS to values; its 'price' and 'cups' entries, if
+    present, are ignored. Runway is projected over `months` with
+    projection.project() `assumptions` and levered by `loans`
+    (financing.amortize() arguments); profit is before debt service.
+    """
+    prices = np.linspace(*PRICE_RANGE, n_price)
+    cups = np.linspace(*CUPS_RANGE, n_cups)
+    res = model.evaluate(**{**inputs, 'price': prices[np.newaxis, :], 'cups': cups[:, np.newaxis]})
+    debt = financing.summary(loans, months)
+    runway = np.empty((n_cups, n_price))
+    for start in range(0, n_cups, PROJECT_ROWS):
+        rows = cups[start:start + PROJECT_ROWS, np.newaxis]
+        grid = {**inputs, 'price': prices[np.newaxis, :], 'cups': rows}
+        runway[start:start + len(rows)] = financing.levered_project(grid, months, debt, **(assumptions or {}))['runway']
+    return {
+        'price': prices, 'cups': cups,
+        'profit': np.ascontiguousarray(res['profit']),
+        'runway': runway,
+        'be_cups_day': breakeven_cups(inputs, prices, debt['debt_month']),
+        'debt_month': debt['debt_month'],
+    }
+
+
+def breakeven_cups(inputs, prices, debt_month=0.0):
+    """Break-even contour: cups/day = (fixed + debt_month) / ((price - unit) × days).
+
+    Fixed costs and unit cost do not depend on price or volume, so the
+    contour is exact; NaN where price does not exceed unit cost.
+    """
+    res = model.evaluate(**{**inputs, 'price': prices, 'cups': 0})
+    return financing.breakeven_cups(res, prices, inputs['days'], debt_month)
@@ -0,0 +1,295 @@
+"""
+Chunked parameter sweeps over a Cartesian grid of scenarios.
+
+    python sweep.py --axis sqft=600:2000:100 --axis rent=30:90:5 --axis nnn=8:16:2 \\
+                    --axis staff=2:6 --axis hrs=6:10:1 --axis price=4:7:0.25 --axis cups=60:400:20 \\
+                    [--where "margin >= 15 and runway == inf"] [--top 20 --by profit] \\
+                    [--out-dir DIR] [--workers N] [--chunk-size N]
+
+The grid is never materialized: scenario i of the product is decoded from
+its flat index, so each worker process evaluates a contiguous index range
+with one vectorized model call. With --out-dir, workers write their
+metrics straight into .npy memory maps (one per metric, float32) at their
+own offsets, so results cross no pipe and can be queried again later
+without recomputing. Queries (a filter and a top-K by one metric) are
+answered per chunk and merged as chunks finish; only the matches' count and
+the running top K reach the parent, so memory stays bounded by the chunk
+size times the number of chunks in flight, whatever the grid size.
+
+Runway is the steady-state model runway (inf when profitable), not the
+month-by-month projection the dashboard uses, which would multiply the
+work by the projection horizon.
+"""
+
+import argparse
+import csv
+import json
+import operator
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+
+import model
+
+# Metrics stored and queryable by default
+METRICS = ('unit', 'rev', 'exp', 'profit', 'margin', 'rent_r', 'labor_r', 'cogs_r',
+           'runway', 'payback', 'be_cups_day')
+
+OPS = {'>=': operator.ge, '<=': operator.le, '>': operator.gt, '<': operator.lt,
+       '==': operator.eq, '!=': operator.ne}
+
+
+class Grid:
+    """The Cartesian product of `axes` (name -> values) over fixed `base` inputs.
+
+    Axis names are model.DEFAULTS keys; other inputs come from `base`
+    (DEFAULTS-keyed, defaults filled in). The last axis varies fastest.
+    """
+
+    def __init__(self, axes, base=None, mtype='Dairy'):
+        unknown = set(axes) - set(model.DEFAULTS)
+        if unknown:
+            raise ValueError(f"Unknown sweep axes: {', '.join(sorted(unknown))}")
+        self.axes = {k: np.asarray(v) for k, v in axes.items()}
+        self.base = dict(base or {})
+        self.mtype = mtype
+        self.shape = tuple(len(v) for v in self.axes.values())
+        self.size = int(np.prod(self.shape, dtype=np.int64))
+
+    def values(self, flat):
+        """Axis values of the scenarios at flat indices `flat`."""
+        idx = np.unravel_index(flat, self.shape)
+        return {k: v[i] for (k, v), i in zip(self.axes.items(), idx)}
+
+    def inputs(self, flat):
+        """Model inputs of the scenarios at flat indices `flat`."""
+        return model.resolve_inputs({**self.base, **self.values(flat)}, self.mtype)
+
+    def to_json(self):
+        return {'axes': {k: v.tolist() for k, v in self.axes.items()}, 'base': self.base, 'mtype': self.mtype}
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(data['axes'], data['base'], data['mtype'])
+
+
+def parse_where(text):
+    """'margin >= 15 and runway == inf' -> [('margin', '>=', 15.0), ('runway', '==', inf)]."""
+    clauses = []
+    for clause in filter(None, (c.strip() for c in (text or '').split(' and '))):
+        parts = clause.split()
+        if len(parts) != 3 or parts[1] not in OPS:
+            raise ValueError(f"Cannot parse condition {clause!r}; expected '<metric> <op> <number>'")
+        clauses.append((parts[0], parts[1], float(parts[2])))
+    return clauses
+
+
+def _mask(values, where):
+    mask = np.ones(len(next(iter(values.values()))), dtype=bool)
+    for name, op, value in where:
+        mask &= OPS[op](values[name], value)
+    return mask
+
+
+def _top(flat, score, k, largest):
+    """The `k` best (flat, score) pairs, best first."""
+    if len(score) > k:
+        part = np.argpartition(-score if largest else score, k - 1)[:k]
+        flat, score = flat[part], score[part]
+    order = np.argsort(-score if largest else score, kind='stable')
+    return flat[order], score[order]
+
+
+def _open(out_dir, name, mode, size=None):
+    path = os.path.join(out_dir, f"{name}.npy")
+    if mode == 'w+':
+        return np.lib.format.open_memmap(path, mode='w+', dtype=np.float32, shape=(size,))
+    return np.load(path, mmap_mode=mode)
+
+
+def _evaluate_chunk(grid, metrics, where, by, k, largest, out_dir, start, stop):
+    """Worker: evaluate scenarios [start, stop); returns (matches, top flat indices, top scores)."""
+    flat = np.arange(start, stop, dtype=np.int64)
+    res = model.evaluate(**grid.inputs(flat))
+    values = {name: np.asarray(res[name]) for name in metrics}
+    if out_dir is not None:
+        for name, v in values.items():
+            out = _open(out_dir, name, 'r+')
+            out[start:stop] = v
+            out.flush()
+            del out
+    return _query(flat, values, where, by, k, largest)
+
+
+def _query(flat, values, where, by, k, largest):
+    mask = _mask(values, where)
+    if by is None or k == 0:
+        return int(mask.sum()), flat[:0], np.empty(0)
+    score = values[by][mask].astype(float)
+    ranked = ~np.isnan(score)     # e.g. break-even where price does not cover unit cost
+    top_flat, top_score = _top(flat[mask][ranked], score[ranked], k, largest)
+    return int(mask.sum()), top_flat, top_score
+
+
+class Result:
+    """Running answer of a sweep query: matching count and top K."""
+
+    def __init__(self, k, largest):
+        self.k, self.largest = k, largest
+        self.matches = 0
+        self.scenarios = 0
+        self.flat = np.empty(0, dtype=np.int64)
+        self.score = np.empty(0)
+
+    def merge(self, n, matches, flat, score):
+        self.scenarios += n
+        self.matches += matches
+        if len(flat):
+            self.flat, self.score = _top(np.concatenate([self.flat, flat]), np.concatenate([self.score, score]),
+                                         self.k, self.largest)
+
+    def rows(self, grid, metrics=METRICS):
+        """Top-K scenarios as dicts of their axis values and metrics, best first."""
+        if not len(self.flat):
+            return []
+        res = model.evaluate(**grid.inputs(self.flat))
+        cols = {**grid.values(self.flat), **{m: np.asarray(res[m]) for m in metrics}}
+        return [{k: v[i].item() for k, v in cols.items()} for i in range(len(self.flat))]
+
+
+def _chunks(size, chunk_size):
+    for start in range(0, size, chunk_size):
+        yield start, min(start + chunk_size, size)
+
+
+def _run(chunks, submit, result, workers, max_inflight, progress):
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for start, stop in chunks:
+            pending.append((stop - start, pool.submit(submit, start, stop)))
+            # Back-pressure: at most `max_inflight` chunks queued or running
+            while len(pending) >= max_inflight:
+                n, fut = pending.popleft()
+                result.merge(n, *fut.result())
+                if progress:
+                    progress(result)
+        while pending:
+            n, fut = pending.popleft()
+            result.merge(n, *fut.result())
+            if progress:
+                progress(result)
+    return result
+
+
+def run(grid, where=(), by='profit', k=100, largest=True, metrics=METRICS, out_dir=None,
+        workers=None, chunk_size=2**18, max_inflight=None, progress=None):
+    """Evaluate every scenario of `grid` and answer a filter / top-K query.
+
+    `where` is a list of (metric, op, value) conditions, all of which must
+    hold; `by` and `k` select the top K matches by one metric. With
+    `out_dir`, every metric is also stored as <out_dir>/<metric>.npy
+    (float32, flat grid order) with the grid in sweep.json.
+    """
+    metrics = tuple(dict.fromkeys((*metrics, *(w[0] for w in where), *((by,) if by else ()))))
+    workers = workers or os.cpu_count() or 1
+    if out_dir is not None:
+        os.makedirs(out_dir, exist_ok=True)
+        for name in metrics:
+            # Full-size result files up front; workers fill in their own ranges
+            _open(out_dir, name, 'w+', grid.size).flush()
+        with open(os.path.join(out_dir, 'sweep.json'), 'w') as f:
+            json.dump({**grid.to_json(), 'metrics': list(metrics)}, f)
+    submit = partial(_evaluate_chunk, grid, metrics, list(where), by, k, largest, out_dir)
+    return _run(_chunks(grid.size, chunk_size), submit, Result(k, largest), workers,
+                max_inflight or 2 * workers, progress)
+
+
+def _query_chunk(out_dir, names, where, by, k, largest, start, stop):
+    values = {name: np.asarray(_open(out_dir, name, 'r')[start:stop]) for name in names}
+    return _query(np.arange(start, stop, dtype=np.int64), values, where, by, k, largest)
+
+
+def query(out_dir, where=(), by='profit', k=100, largest=True, workers=None, chunk_size=2**20, progress=None):
+    """Answer a filter / top-K query over a stored sweep without recomputing it."""
+    with open(os.path.join(out_dir, 'sweep.json')) as f:
+        meta = json.load(f)
+    grid = Grid.from_json(meta)
+    names = tuple(dict.fromkeys((*(w[0] for w in where), *((by,) if by else ()))))
+    missing = set(names) - set(meta['metrics'])
+    if missing:
+        raise ValueError(f"Sweep in {out_dir} did not store: {', '.join(sorted(missing))}")
+    workers = workers or os.cpu_count() or 1
+    submit = partial(_query_chunk, out_dir, names, list(where), by, k, largest)
+    result = _run(_chunks(grid.size, chunk_size), submit, Result(k, largest), workers, 2 * workers, progress)
+    return grid, result
+
+
+def parse_axis(text):
+    """'cups=60:400:20' (inclusive range) or 'staff=2,3,5' -> ('cups', values)."""
+    name, sep, spec = text.partition('=')
+    if not sep or name not in model.DEFAULTS:
+        raise ValueError(f"Axis must be <input>=<start>:<stop>[:<step>] or <input>=<v1>,<v2>,...; got {text!r}")
+    if ':' in spec:
+        start, stop, *step = (float(x) for x in spec.split(':'))
+        step = step[0] if step else 1.0
+        values = np.arange(start, stop + step / 2, step)
+    else:
+        values = np.array([float(x) for x in spec.split(',')])
+    whole = isinstance(model.BOUNDS[name][0], int)
+    return name, values.round().astype(np.int64) if whole else values
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep a Cartesian grid of scenarios and query the results.")
+    parser.add_argument('--axis', action='append', default=[], help="input=start:stop[:step] or input=v1,v2,... (repeatable)")
+    parser.add_argument('--mtype', default='Dairy', choices=('Dairy', 'Oat'), help="milk type (default: Dairy)")
+    parser.add_argument('--where', default='', help="conditions joined by 'and', e.g. \"margin >= 15 and runway == inf\"")
+    parser.add_argument('--by', default='profit', help="metric to rank matches by (default: profit)")
+    parser.add_argument('--top', type=int, default=20, help="matches to print (default: 20)")
+    parser.add_argument('--smallest', action='store_true', help="rank ascending instead of descending")
+    parser.add_argument('--out-dir', default=None, help="store every metric as .npy memory maps here")
+    parser.add_argument('--from-dir', default=None, help="query a stored sweep instead of running one")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument('--chunk-size', type=int, default=2**18, help="scenarios per chunk (default: 262144)")
+    args = parser.parse_args(argv)
+
+    try:
+        where = parse_where(args.where)
+        axes = dict(parse_axis(a) for a in args.axis)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.from_dir is None and not axes:
+        parser.error("give at least one --axis, or --from-dir")
+    if args.by not in model.METRICS or any(w[0] not in model.METRICS for w in where):
+        parser.error(f"metrics must be among: {', '.join(model.METRICS)}")
+
+    def progress(result):
+        print(f"\r{result.scenarios:,} scenarios, {result.matches:,} matches", end='', file=sys.stderr)
+
+    t0 = time.perf_counter()
+    if args.from_dir is not None:
+        grid, result = query(args.from_dir, where, args.by, args.top, not args.smallest, args.workers,
+                             progress=progress)
+    else:
+        grid = Grid(axes, mtype=args.mtype)
+        result = run(grid, where, args.by, args.top, not args.smallest, out_dir=args.out_dir,
+                     workers=args.workers, chunk_size=args.chunk_size, progress=progress)
+    elapsed = time.perf_counter() - t0
+    print(f"\n{grid.size:,} scenarios in {elapsed:.1f}s ({grid.size / max(elapsed, 1e-9):,.0f}/s), "
+          f"{result.matches:,} match", file=sys.stderr)
+
+    rows = result.rows(grid)
+    if rows:
+        writer = csv.DictWriter(sys.stdout, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
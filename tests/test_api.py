@@ -0,0 +1,69 @@
+import asyncio
+import json
+
+import pytest
+
+import api
+
+
+def post(path, body):
+    if not isinstance(body, bytes):
+        body = json.dumps(body).encode()
+    return asyncio.run(api.dispatch('POST', path, body))
+
+
+@pytest.mark.parametrize('path, body, message', [
+    ('/v1/scenario', b'{"inputs": ', 'not valid JSON'),
+    ('/v1/scenario', [1, 2], 'JSON object'),
+    ('/v1/scenario', {'inputs': []}, 'expected an object'),
+    ('/v1/scenario', {'inputs': {'foo': 1}}, 'Unknown inputs: foo'),
+    ('/v1/scenario', {'inputs': {'cups': 1000}}, 'cups'),
+    ('/v1/scenario', {'inputs': {'cups': 'many'}}, 'expected numbers'),
+    ('/v1/scenario', {'mtype': 'Soy'}, 'mtype'),
+    ('/v1/scenario', {'projection': {'seasonal': 'yes'}}, 'seasonal'),
+    ('/v1/scenario', {'projection': {'months': 60, 'horizon': 1}}, 'Unknown projection settings'),
+    ('/v1/batch', {}, 'scenarios'),
+    ('/v1/batch', {'columns': {'cups': [100, 200], 'price': [4.0]}}, 'same length'),
+    ('/v1/batch', {'columns': {'cups': [100, 600]}}, 'cups'),
+])
+def test_invalid_requests_are_400(path, body, message):
+    status, payload = post(path, body)
+    assert status == 400
+    assert message in payload['error']
+
+
+def test_batch_size_is_limited():
+    status, payload = post('/v1/batch', {'columns': {'cups': [100] * (api.MAX_BATCH + 1)}})
+    assert status == 400 and 'At most' in payload['error']
+
+
+def test_unknown_route_and_method():
+    assert asyncio.run(api.dispatch('GET', '/v1/nothing', b''))[0] == 404
+    assert asyncio.run(api.dispatch('GET', '/v1/scenario', b''))[0] == 405
+
+
+def test_valid_scenario_is_200():
+    status, payload = post('/v1/scenario', {'inputs': {'cups': 150}})
+    assert status == 200 and 'metrics' in payload
+
+
+def test_malformed_request_line_is_400():
+    async def exchange():
+        ready = asyncio.Event()
+        port = []
+
+        def started(server):
+            port.append(server.sockets[0].getsockname()[1])
+            ready.set()
+
+        task = asyncio.ensure_future(api.serve('127.0.0.1', 0, ready=started))
+        await ready.wait()
+        reader, writer = await asyncio.open_connection('127.0.0.1', port[0])
+        writer.write(b'NONSENSE\r\n\r\n')
+        await writer.drain()
+        status = await reader.readline()
+        writer.close()
+        task.cancel()
+        return status
+
+    assert asyncio.run(exchange()).startswith(b'HTTP/1.1 400')
@@ -0,0 +1,53 @@
+import numpy as np
+
+import cache
+
+
+def test_lru_evicts_the_least_recently_used():
+    results = cache.ResultCache(max_entries=2)
+    results.put('a', 1)
+    results.put('b', 2)
+    assert results.get('a') == 1
+    results.put('c', 3)
+    assert results.get('b') is None
+    assert (results.get('a'), results.get('c')) == (1, 3)
+    assert results.stats()['evictions'] == 1
+
+
+def test_byte_budget_evicts_and_skips_oversized_values():
+    value = np.zeros(1000)
+    results = cache.ResultCache(max_bytes=2.5 * cache.sizeof(value))
+    for key in 'abc':
+        results.put(key, value)
+    assert results.get('a') is None and results.get('c') is value
+    assert results.bytes <= results.max_bytes
+    results.put('big', np.zeros(10_000))
+    assert results.get('big') is None and results.get('c') is value
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache.time, 'monotonic', lambda: now[0])
+    results = cache.ResultCache(ttl=10)
+    results.put('a', 1)
+    now[0] += 9
+    assert results.get('a') == 1
+    now[0] += 2
+    assert results.get('a') is None
+    stats = results.stats()
+    assert (stats['entries'], stats['bytes'], stats['expirations']) == (0, 0, 1)
+
+
+def test_get_or_compute_counts_hits_and_misses():
+    results = cache.ResultCache()
+    calls = []
+    for _ in range(3):
+        assert results.get_or_compute('k', lambda: calls.append(1) or 'v') == 'v'
+    stats = results.stats()
+    assert (len(calls), stats['hits'], stats['misses']) == (1, 2, 1)
+
+
+def test_cache_key_rounds_floats_and_folds_negative_zero():
+    assert cache.cache_key({'x': 0.1 + 0.2, 'y': [1, 2]}) == cache.cache_key({'y': [1, 2], 'x': 0.3})
+    assert cache.cache_key(np.array([-0.0, 1.0])) == cache.cache_key(np.array([0.0, 1.0]))
+    assert cache.cache_key(1) != cache.cache_key(1.0) != cache.cache_key('1')
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+import model
+from graph import CycleError, Graph
+
+NODES = {
+    'sum': (('a', 'b'), lambda a, b: a + b),
+    'double_b': (('b',), lambda b: 2 * b),
+    'total': (('sum', 'double_b'), lambda s, d: s + d),
+}
+
+
+def test_update_recomputes_only_downstream_nodes():
+    ev = Graph(NODES).evaluation()
+    ev.update(a=1, b=2)
+    assert ev['total'] == 7 and ev.recomputed == 3
+    assert ev.update(a=1, b=2) == []
+    assert ev['total'] == 7 and ev.recomputed == 0
+    assert ev.update(a=5, b=2) == ['a']
+    assert ev['total'] == 11 and ev.recomputed == 2
+    assert 'double_b' in ev.held()
+
+
+def test_nodes_are_computed_only_when_read():
+    ev = Graph(NODES).evaluation()
+    ev.update(a=1, b=2)
+    assert ev['double_b'] == 4 and ev.recomputed == 1
+    assert 'total' not in ev.held()
+
+
+def test_equal_arrays_do_not_invalidate():
+    ev = Graph(NODES).evaluation()
+    ev.update(a=np.arange(3), b=1)
+    ev['total']
+    assert ev.update(a=np.arange(3), b=1) == []
+    assert ev.update(a=np.arange(3) + 1) == ['a']
+
+
+def test_missing_input_and_cycle_are_errors():
+    with pytest.raises(KeyError):
+        Graph(NODES).evaluation()['sum']
+    with pytest.raises(CycleError):
+        Graph({'x': (('y',), abs), 'y': (('x',), abs)})
+
+
+def test_incremental_model_matches_the_batch_path():
+    plan = model.resolve_inputs({})
+    ev = model.GRAPH.evaluation()
+    ev.update(**plan)
+    ev.get(model.METRICS)
+    ev.update(cups=200)
+    assert ev.recomputed == 0
+    assert ev['profit'] == pytest.approx(model.evaluate(**{**plan, 'cups': 200})['profit'])
+    assert 'rent_t' in ev.held() and ev.recomputed < len(model.NODES)
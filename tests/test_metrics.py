@@ -0,0 +1,47 @@
+import time
+
+import pytest
+
+import metrics
+
+
+def test_counter_and_histogram_render():
+    registry = metrics.Registry()
+    reruns = registry.counter('app_reruns_total', "Script reruns.", ('page',))
+    reruns.inc(page='dashboard')
+    reruns.inc(2, page='dashboard')
+    latency = registry.histogram('app_rerun_seconds', "Rerun latency.", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        latency.observe(value)
+    lines = registry.render().splitlines()
+    assert '# TYPE app_reruns_total counter' in lines
+    assert 'app_reruns_total{page="dashboard"} 3' in lines
+    assert 'app_rerun_seconds_bucket{le="0.1"} 1' in lines
+    assert 'app_rerun_seconds_bucket{le="1.0"} 2' in lines
+    assert 'app_rerun_seconds_bucket{le="+Inf"} 3' in lines
+    assert 'app_rerun_seconds_sum 5.55' in lines
+    assert 'app_rerun_seconds_count 3' in lines
+
+
+def test_labels_are_escaped_and_checked():
+    counter = metrics.Registry().counter('c', "C.", ('path',))
+    counter.inc(path='a"b\\c')
+    assert counter.render()[-1] == 'c{path="a\\"b\\\\c"} 1'
+    with pytest.raises(ValueError):
+        counter.inc(page='x')
+
+
+def test_failing_callback_does_not_break_the_scrape():
+    registry = metrics.Registry()
+    registry.gauge('broken', "Fails.", lambda: 1 / 0)
+    registry.gauge('fine', "Works.", lambda: 2)
+    lines = registry.render().splitlines()
+    assert '# broken unavailable: ZeroDivisionError' in lines
+    assert 'fine 2' in lines
+
+
+def test_process_start_time_is_recent():
+    started = metrics.start_time()
+    if started is None:
+        pytest.skip("no /proc and no psutil")
+    assert time.time() - 3600 < started <= time.time()
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+import financing
+import model
+import optimize
+
+LOAN = dict(principal=250000, rate=0.105, term=120, io=0)
+
+
+def inputs(**overrides):
+    plan = model.resolve_inputs({})
+    return {**plan, 'rent': plan['rent'] * 0.6, **overrides}
+
+
+def test_loans_cover_a_capex_shortfall():
+    short = inputs(cap=200000)
+    assert optimize.optimize(short)['best'] is None
+    best = optimize.optimize(short, loans=[LOAN])['best']
+    assert best is not None and best['cash'] < 0
+
+
+def test_debt_service_is_a_fixed_cost():
+    plain = optimize.optimize(inputs())['best']
+    levered = optimize.optimize(inputs(), loans=[LOAN])['best']
+    service = financing.summary([LOAN], 60)['debt_month']
+    assert plain['net_profit'] == plain['profit']
+    assert levered['net_profit'] == pytest.approx(levered['profit'] - service)
+    assert levered['be_cups_day'] > plain['be_cups_day']
+
+
+def test_payback_counts_only_the_owners_share_of_the_capex():
+    plain = optimize.optimize(inputs(), 'payback')['best']
+    levered = optimize.optimize(inputs(), 'payback', loans=[LOAN])['best']
+    assert 0 < levered['payback'] < plain['payback'] < np.inf
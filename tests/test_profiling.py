@@ -0,0 +1,33 @@
+import pytest
+
+import profiling
+
+
+def test_sections_and_spans_add_up(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(profiling.time, 'perf_counter', lambda: now[0])
+    timer = profiling.RerunTimer()
+    timer.section('A')
+    now[0] += 1
+    with timer.span('hot'):
+        now[0] += 2
+    timer.section('B')
+    now[0] += 4
+    timer.section('A')
+    now[0] += 8
+    record = timer.finish()
+    assert record['total'] == 15
+    assert record['sections'] == {'A': 11, 'B': 4}
+    assert record['spans'] == {'A › hot': 2}
+
+
+def test_log_keeps_the_last_runs_and_summarizes_them():
+    log = profiling.RerunLog(maxlen=3)
+    for total in (9.0, 1.0, 2.0, 3.0):
+        log.add({'total': total, 'sections': {'X': total / 2}, 'spans': {}})
+    assert [r['total'] for r in log.runs()] == [1.0, 2.0, 3.0]
+    rows = {r['section']: r for r in log.summary()}
+    assert rows['TOTAL']['mean_ms'] == pytest.approx(2000)
+    assert rows['TOTAL']['max_ms'] == pytest.approx(3000)
+    assert rows['X']['runs'] == 3
+    assert [r['section'] for r in log.summary()] == ['TOTAL', 'X']
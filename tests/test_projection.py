@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+import model
+import projection
+
+# No ramp-up, seasonality or escalation: every month is the steady-state model
+FLAT = dict(ramp_months=0, seasonality=None, rent_escalation=0, wage_growth=0, cogs_inflation=0)
+
+
+def inputs(**overrides):
+    return {**model.resolve_inputs({}), **overrides}
+
+
+def test_crossing_interpolated_within_the_month():
+    assert projection.crossing_time(np.array([5.0, 3.0, 1.0, -1.0])) == pytest.approx(2.5)
+
+
+def test_negative_opening_balance_is_zero():
+    assert projection.crossing_time(np.array([-1.0, 2.0, 3.0])) == 0
+
+
+def test_never_falling_is_infinite():
+    assert projection.crossing_time(np.array([5.0, 6.0, 7.0])) == np.inf
+    assert projection.crossing_time(np.array([5.0, 5.0, 5.0])) == np.inf
+
+
+def test_touching_zero_and_recovering_is_infinite():
+    balance = np.concatenate([[2.0, 1.0, 0.0], np.arange(1.0, 14.0)])
+    assert projection.crossing_time(balance) == np.inf
+
+
+def test_falling_balance_extrapolated_past_the_end():
+    # Falls 1/month and ends at 2: crosses 2 months after month 3
+    assert projection.crossing_time(np.array([5.0, 4.0, 3.0, 2.0])) == pytest.approx(5.0)
+
+
+def test_broadcasts_over_leading_axes():
+    balance = np.array([[5.0, 3.0, 1.0, -1.0], [5.0, 6.0, 7.0, 8.0], [-1.0, 0.0, 0.0, 0.0]])
+    np.testing.assert_allclose(projection.crossing_time(balance), [2.5, np.inf, 0.0])
+
+
+def test_loss_making_plan_outlasting_the_horizon_has_finite_runway():
+    scenario = inputs(cups=130)
+    base = model.evaluate(**scenario)
+    assert base['profit'] < 0
+    expected = base['cash'] / -base['profit']            # ~88 months
+    for months in (36, 120):
+        runway = projection.project(scenario, months, **FLAT)['runway']
+        assert runway == pytest.approx(expected, rel=1e-6)
+
+
+def test_seasonal_dip_at_the_horizon_does_not_end_a_profitable_plan():
+    scenario = inputs(cups=300)
+    assert model.evaluate(**scenario)['profit'] > 0
+    for months in range(24, 37):
+        assert projection.project(scenario, months, rent_escalation=0, wage_growth=0,
+                                  cogs_inflation=0)['runway'] == np.inf
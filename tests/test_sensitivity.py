@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+import financing
+import model
+import projection
+import sensitivity
+
+LOAN = dict(principal=250000, rate=0.105, term=120, io=0)
+
+
+def test_runway_is_the_projected_runway():
+    plan = {**model.resolve_inputs({}), 'cups': 120}
+    base = sensitivity.sensitivity(plan, months=36)['runway']['base']
+    assert base == pytest.approx(projection.project(plan, 36)['runway'])
+
+
+def test_loans_lever_runway_and_break_even():
+    plan = {**model.resolve_inputs({}), 'cups': 120, 'cap': 200000}
+    plain = sensitivity.sensitivity(plan, months=36)
+    levered = sensitivity.sensitivity(plan, months=36, loans=[LOAN])
+    debt = financing.summary([LOAN], 36)
+    assert plain['runway']['base'] == 0
+    assert levered['runway']['base'] == pytest.approx(financing.levered_project(plan, 36, debt)['runway'])
+    m = model.evaluate(**plan)
+    assert levered['be_cups_day']['base'] == pytest.approx(
+        (m['fixed'] + debt['debt_month']) / (plan['price'] - m['unit']) / plan['days'])
+    assert np.array_equal(levered['profit']['base'], plain['profit']['base'])
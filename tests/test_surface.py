@@ -0,0 +1,17 @@
+import pytest
+
+import financing
+import model
+import surface
+
+LOAN = dict(principal=250000, rate=0.105, term=120, io=0)
+
+
+@pytest.mark.parametrize('loans', [(), [LOAN]])
+def test_runway_cells_match_the_dashboard(loans):
+    plan = model.resolve_inputs({})
+    grid = surface.price_volume_grid(plan, n_price=8, n_cups=60, months=36, loans=loans)
+    debt = financing.summary(loans, 36)
+    for i, j in [(0, 0), (30, 3), (59, 7)]:
+        cell = {**plan, 'price': grid['price'][j], 'cups': grid['cups'][i]}
+        assert grid['runway'][i, j] == pytest.approx(financing.levered_project(cell, 36, debt)['runway'])
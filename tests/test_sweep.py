@@ -0,0 +1,25 @@
+import math
+
+import numpy as np
+import pytest
+
+import sweep
+
+
+def test_parse_where():
+    assert sweep.parse_where("margin >= 15 and runway == inf") == [('margin', '>=', 15.0), ('runway', '==', math.inf)]
+    assert sweep.parse_where("") == []
+    with pytest.raises(ValueError):
+        sweep.parse_where("margin >=15")
+    with pytest.raises(ValueError):
+        sweep.parse_where("margin ~ 15")
+
+
+def test_parse_axis():
+    name, values = sweep.parse_axis('cups=60:100:20')
+    assert name == 'cups' and values.tolist() == [60, 80, 100] and values.dtype == np.int64
+    name, values = sweep.parse_axis('price=4.5,5.25')
+    assert name == 'price' and values.tolist() == [4.5, 5.25]
+    for bad in ('cups', 'nothing=1,2'):
+        with pytest.raises(ValueError):
+            sweep.parse_axis(bad)
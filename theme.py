@@ -0,0 +1,365 @@
+"""
+Dashboard theme: palette and page CSS.
+
+The stylesheets are formatted and minified once, when the module is first
+imported, and reused by every rerun of every session. Text uses Inter where
+it is installed and the system UI font stack otherwise. No web font is
+fetched or served, so the first paint never waits on the network.
+"""
+
+import re
+
+COLORS = {
+    'primary': '#1A3C40',
+    'accent': '#C38D56',
+    'teal': '#4A9B9B',
+    'navy': '#2C3E50',
+    'terracotta': '#C97B63',
+    'gold': '#D4A855',
+    'sage': '#87A889',
+    'background': '#F9F9F7',
+    'sidebar': '#F8F9FA',
+    'card': '#FFFFFF',
+    'text': '#1A3C40',
+    'muted': '#6C757D',
+    'border': '#DEE2E6',
+    'success': '#2D6A4F',
+    'warning': '#D4A855',
+    'error': '#C97B63'
+}
+
+def minify(css):
+    """Drop comments and collapse whitespace so the CSS delta is as small as possible."""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    return re.sub(r'\s*([{};:,>])\s*', r'\1', css).strip()
+
+
+def _style(css):
+    # One line, so Markdown never mistakes indented CSS for a code block
+    return '<style>' + minify(css.replace('<style>', '').replace('</style>', '')) + '</style>'
+
+
+# Main stylesheet
+CSS = _style(f"""<style>
+    .stApp {{
+        background-color: {COLORS['background']};
+        font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif;
+    }}
+    
+    .block-container {{
+        padding: 1.5rem 1rem !important;
+        max-width: 900px !important;
+    }}
+    
+    /* SIDEBAR */
+    section[data-testid="stSidebar"] {{
+        background: {COLORS['sidebar']} !important;
+        border-right: 1px solid {COLORS['border']};
+    }}
+    
+    section[data-testid="stSidebar"] .stMarkdown p,
+    section[data-testid="stSidebar"] .stMarkdown li,
+    section[data-testid="stSidebar"] h1, h2, h3 {{
+        color: {COLORS['text']} !important;
+        font-weight: 600 !important;
+    }}
+    
+    section[data-testid="stSidebar"] label {{
+        color: {COLORS['text']} !important;
+        font-weight: 600 !important;
+        font-size: 0.9rem !important;
+    }}
+    
+    /* Radio button labels styling for visibility */
+    section[data-testid="stSidebar"] .stRadio label {{
+        color: {COLORS['primary']} !important;
+        font-weight: 700 !important;
+        font-size: 0.9rem !important;
+    }}
+    
+    section[data-testid="stSidebar"] .stRadio div[role="radiogroup"] label {{
+        background: {COLORS['card']} !important;
+        border: 2px solid {COLORS['primary']} !important;
+        border-radius: 8px !important;
+        padding: 8px 16px !important;
+        margin: 2px !important;
+        color: {COLORS['primary']} !important;
+        font-weight: 700 !important;
+    }}
+    
+    section[data-testid="stSidebar"] .stRadio div[role="radiogroup"] label[data-checked="true"] {{
+        background: {COLORS['primary']} !important;
+        color: white !important;
+    }}
+    
+    section[data-testid="stSidebar"] .stNumberInput > div > div > input {{
+        background: {COLORS['card']} !important;
+        border: 2px solid {COLORS['border']} !important;
+        border-radius: 8px !important;
+        color: {COLORS['text']} !important;
+        font-weight: 600 !important;
+        font-size: 1rem !important;
+    }}
+    
+    section[data-testid="stSidebar"] .stNumberInput > div > div > input:focus {{
+        border-color: {COLORS['primary']} !important;
+        box-shadow: 0 0 0 3px rgba(26, 60, 64, 0.15) !important;
+    }}
+    
+    section[data-testid="stSidebar"] .stExpander {{
+        background: {COLORS['card']} !important;
+        border: 2px solid {COLORS['border']} !important;
+        border-radius: 10px !important;
+        margin-bottom: 0.5rem !important;
+    }}
+    
+    /* Main expander header (collapsed state) - improved visibility */
+    section[data-testid="stSidebar"] .stExpander > details > summary {{
+        background: linear-gradient(135deg, {COLORS['primary']} 0%, #2D5A5A 100%) !important;
+        border-radius: 8px !important;
+        padding: 0.75rem 1rem !important;
+    }}
+    
+    section[data-testid="stSidebar"] .stExpander > details > summary p {{
+        color: white !important;
+        font-weight: 700 !important;
+        font-size: 0.95rem !important;
+    }}
+    
+    section[data-testid="stSidebar"] .stExpander > details > summary svg {{
+        color: white !important;
+    }}
+    
+    /* When expanded - lighter background */
+    section[data-testid="stSidebar"] .stExpander > details[open] > summary {{
+        background: {COLORS['primary']} !important;
+        border-radius: 8px 8px 0 0 !important;
+    }}
+    
+    /* Enhanced visibility for nested expanders */
+    section[data-testid="stSidebar"] .stExpander .stExpander {{
+        background: #E8F4F4 !important;
+        border: 2px solid {COLORS['primary']} !important;
+    }}
+    
+    section[data-testid="stSidebar"] .stExpander .stExpander > details > summary {{
+        background: #E8F4F4 !important;
+    }}
+    
+    section[data-testid="stSidebar"] .stExpander .stExpander > details > summary p {{
+        color: {COLORS['primary']} !important;
+        font-weight: 700 !important;
+        font-size: 0.9rem !important;
+    }}
+    
+    section[data-testid="stSidebar"] .stExpander .stExpander > details > summary svg {{
+        color: {COLORS['primary']} !important;
+    }}
+    
+    /* Nested expander styling */
+    .breakdown-expander {{
+        background: rgba(26, 60, 64, 0.03);
+        border-radius: 8px;
+        padding: 0.5rem;
+        margin-top: 0.5rem;
+        font-size: 0.85rem;
+    }}
+    
+    /* HEADER */
+    .header-container {{
+        display: flex;
+        justify-content: space-between;
+        align-items: center;
+        background: linear-gradient(135deg, {COLORS['primary']} 0%, #2D5A5A 100%);
+        padding: 1.25rem 1.5rem;
+        border-radius: 16px;
+        margin-bottom: 1.5rem;
+        box-shadow: 0 4px 20px rgba(26, 60, 64, 0.15);
+        flex-wrap: wrap;
+        gap: 1rem;
+    }}
+    
+    .header-text h1 {{
+        color: white;
+        font-size: 1.4rem;
+        font-weight: 700;
+        margin: 0;
+    }}
+    
+    .header-text p {{
+        color: rgba(255,255,255,0.8);
+        font-size: 0.85rem;
+        margin: 0.25rem 0 0 0;
+    }}
+    
+    /* METRIC CARDS */
+    .metric-card {{
+        background: {COLORS['card']};
+        border-radius: 12px;
+        padding: 1.25rem;
+        box-shadow: 0 2px 12px rgba(0,0,0,0.05);
+        border: 1px solid {COLORS['border']};
+        margin-bottom: 0.75rem;
+    }}
+    
+    .metric-label {{
+        color: {COLORS['muted']};
+        font-size: 0.75rem;
+        font-weight: 600;
+        text-transform: uppercase;
+        letter-spacing: 0.08em;
+        margin-bottom: 0.5rem;
+    }}
+    
+    .metric-value {{
+        color: {COLORS['primary']};
+        font-size: 1.75rem;
+        font-weight: 700;
+        line-height: 1.2;
+    }}
+    
+    .metric-value.gold {{ color: {COLORS['accent']}; }}
+    .metric-value.success {{ color: {COLORS['success']}; }}
+    .metric-value.error {{ color: {COLORS['error']}; }}
+    
+    .metric-delta {{ font-size: 0.8rem; margin-top: 0.35rem; font-weight: 500; }}
+    .metric-delta.positive {{ color: {COLORS['success']}; }}
+    .metric-delta.negative {{ color: {COLORS['error']}; }}
+    
+    .ai-insight {{
+        font-size: 0.85rem;
+        padding: 0.5rem 0.75rem;
+        border-radius: 8px;
+        margin-top: 0.5rem;
+        display: inline-block;
+        font-weight: 600;
+    }}
+    
+    .ai-insight.excellent {{ background: rgba(45,106,79,0.15); color: #1B5E3F; border: 1px solid #2D6A4F; }}
+    .ai-insight.good {{ background: rgba(74,155,155,0.15); color: #2B7A78; border: 1px solid #4A9B9B; }}
+    .ai-insight.warning {{ background: rgba(212,168,85,0.2); color: #8B6914; border: 1px solid #D4A855; }}
+    .ai-insight.danger {{ background: rgba(201,123,99,0.15); color: #A84832; border: 1px solid #C97B63; }}
+    
+    .section-header {{
+        color: {COLORS['primary']};
+        font-size: 1.1rem;
+        font-weight: 700;
+        margin: 1.75rem 0 1rem 0;
+        padding-bottom: 0.5rem;
+        border-bottom: 3px solid {COLORS['accent']};
+        display: inline-block;
+    }}
+    
+    .alert {{
+        padding: 1rem 1.25rem;
+        border-radius: 10px;
+        margin: 0.75rem 0;
+    }}
+    
+    .alert-success {{
+        background: linear-gradient(135deg, rgba(45,106,79,0.12) 0%, rgba(45,106,79,0.05) 100%);
+        border-left: 5px solid {COLORS['success']};
+    }}
+    
+    .alert-warning {{
+        background: linear-gradient(135deg, rgba(212,168,85,0.15) 0%, rgba(212,168,85,0.05) 100%);
+        border-left: 5px solid {COLORS['warning']};
+    }}
+    
+    .alert-error {{
+        background: linear-gradient(135deg, rgba(201,123,99,0.12) 0%, rgba(201,123,99,0.05) 100%);
+        border-left: 5px solid {COLORS['error']};
+    }}
+    
+    .alert-title {{ font-weight: 700; font-size: 1rem; margin-bottom: 0.4rem; color: {COLORS['primary']}; }}
+    .alert-text {{ font-size: 0.9rem; color: {COLORS['text']}; line-height: 1.5; }}
+    
+    #MainMenu {{visibility: hidden;}}
+    footer {{visibility: hidden;}}
+    
+    /* Hide Streamlit branding and GitHub link */
+    .viewerBadge_container__r5tak {{display: none !important;}}
+    .stDeployButton {{display: none !important;}}
+    #stDecoration {{display: none !important;}}
+    a[href="https://streamlit.io/cloud"] {{display: none !important;}}
+    [data-testid="manage-app-button"] {{display: none !important;}}
+    ._profileContainer_gzau3_53 {{display: none !important;}}
+    .st-emotion-cache-czk5ss {{display: none !important;}}
+    [data-testid="stStatusWidget"] {{display: none !important;}}
+    
+    hr {{ border: none; height: 1px; background: {COLORS['border']}; margin: 1.5rem 0; }}
+    
+    @media (max-width: 768px) {{
+        .header-container {{ flex-direction: column; text-align: center; }}
+        .metric-value {{ font-size: 1.5rem; }}
+        .block-container {{ padding: 1rem 0.5rem !important; }}
+        .ai-insight {{ font-size: 0.8rem; padding: 0.4rem 0.6rem; }}
+        .alert-title {{ font-size: 0.95rem; }}
+        .alert-text {{ font-size: 0.85rem; }}
+    }}
+</style>
+""")
+
+# Floating indicator pointing to the sidebar toggle
+SIDEBAR_HINT = _style("""<style>
+    /* Floating indicator near sidebar toggle */
+    .sidebar-hint {
+        position: fixed;
+        top: 10px;
+        left: 48px;
+        z-index: 999999;
+        background: linear-gradient(135deg, #1A3C40 0%, #2D5A5A 100%);
+        color: white;
+        padding: 6px 12px;
+        border-radius: 15px;
+        font-size: 0.75rem;
+        font-weight: 600;
+        box-shadow: 0 2px 10px rgba(26, 60, 64, 0.3);
+        animation: bounceHint 1.5s ease-in-out infinite;
+        font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
+        white-space: nowrap;
+        pointer-events: none;
+    }
+    
+    @keyframes bounceHint {
+        0%, 100% { 
+            transform: translateX(0);
+            opacity: 1;
+        }
+        50% { 
+            transform: translateX(5px);
+            opacity: 0.7;
+        }
+    }
+    
+    /* Mobile adjustments */
+    @media (max-width: 768px) {
+        .sidebar-hint {
+            top: 6px;
+            left: 42px;
+            padding: 5px 10px;
+            font-size: 0.7rem;
+        }
+    }
+    
+    /* Style the REAL sidebar toggle button for visibility */
+    [data-testid="collapsedControl"],
+    [data-testid="stSidebarCollapseButton"] button,
+    section[data-testid="stSidebar"] button[kind="header"] {
+        background: linear-gradient(135deg, #1A3C40 0%, #2D5A5A 100%) !important;
+        border: 2px solid #C38D56 !important;
+        border-radius: 8px !important;
+        padding: 6px !important;
+        box-shadow: 0 2px 8px rgba(26, 60, 64, 0.4) !important;
+    }
+    
+    [data-testid="collapsedControl"] svg,
+    [data-testid="stSidebarCollapseButton"] svg,
+    section[data-testid="stSidebar"] button[kind="header"] svg {
+        color: white !important;
+        width: 20px !important;
+        height: 20px !important;
+    }
+</style>""") + \
+    '<div class="sidebar-hint">← Your Scenario</div>'